@@ -0,0 +1,25 @@
+# Adds the columns and secondary indexes declared on the models to an existing
+# database.
+from app import create_app
+from database.migrations import ensure_columns, ensure_indexes
+
+
+def add_indexes():
+    """Adds missing columns and indexes without locking the tables (MySQL)."""
+    app = create_app(config_name="development")
+
+    with app.app_context():
+        print("Checking columns...")
+        for name in ensure_columns():
+            print(f"  + {name}")
+        print("Checking secondary indexes...")
+        created = ensure_indexes()
+        if created:
+            for name in created:
+                print(f"  + {name}")
+            print(f"✅ Created {len(created)} index(es).")
+        else:
+            print("✅ All indexes already exist.")
+
+
+add_indexes()
@@ -1,11 +1,19 @@
+import os
+import click
 from flask import Flask, render_template
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy.pool import QueuePool
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import config
 from database.db import init_db, login_manager, db
+from routes.assets import asset_url, assets_bp
 from routes.auth_routes import auth_bp
 from routes.menu_routes import menu_bp
 from routes.order_routes import order_bp
 from routes.status_routes import status_bp
-from models.user import User
+from controllers.identity_cache import IdentityCache
+from controllers.menu_catalog import MenuCatalog
+from controllers.prep_time_stats import PrepTimeStats
 from datetime import datetime
 
 
@@ -18,18 +26,35 @@ def create_app(config_name="development"):
     app.config.from_object(config[config_name])
 
     init_db(app)
-    app.config["TEMPLATES_AUTO_RELOAD"] = True
-    app.jinja_env.auto_reload = True
-    app.jinja_env.cache = {}
+
+    # Templates are only re-checked on disk when TEMPLATES_AUTO_RELOAD or
+    # DEBUG is set, i.e. in development. Compiled templates are kept in
+    # JINJA_BYTECODE_CACHE_DIR, when set, so a restarted worker skips parsing.
+    cache_dir = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_options = {
+            **app.jinja_options,
+            "bytecode_cache": FileSystemBytecodeCache(cache_dir),
+        }
+
+    # Behind TRUSTED_PROXY_HOPS proxies, request.remote_addr and the scheme
+    # come from their X-Forwarded-* headers rather than the proxy's socket.
+    hops = app.config.get("TRUSTED_PROXY_HOPS", 0)
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
 
     @login_manager.user_loader
     def load_user(user_id):
-        return db.session.get(User, int(user_id))
+        # Served from a short-TTL cache so most requests never query users.
+        return IdentityCache.get(user_id)
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(menu_bp, url_prefix="/menu")
     app.register_blueprint(order_bp, url_prefix="/orders")
     app.register_blueprint(status_bp, url_prefix="/status")
+    app.register_blueprint(assets_bp, url_prefix="/assets")
+    app.add_template_global(asset_url)
 
     @app.context_processor
     def inject_current_year():
@@ -43,9 +68,68 @@ def create_app(config_name="development"):
     def menu():
         return render_template("menu.html")
 
+    @app.cli.command("precompile-templates")
+    def precompile_templates_command():
+        """Compile every template into JINJA_BYTECODE_CACHE_DIR."""
+        compiled = precompile_templates(app)
+        target = app.config.get("JINJA_BYTECODE_CACHE_DIR") or "memory only"
+        click.echo(f"Compiled {compiled} templates ({target}).")
+
     return app
 
 
+def precompile_templates(app):
+    """
+    Compiles every template into the app's Jinja cache, and into the bytecode
+    cache when JINJA_BYTECODE_CACHE_DIR is set.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    names = app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def warm_up(app):
+    """
+    Does the one-time work of a worker's first requests ahead of time.
+
+    Compiles every template, loads the menu catalog and reads the prep-time
+    stats window, then closes the database connections it used so that a
+    preforking server does not share sockets between workers. Call once in
+    the server master before forking.
+
+    Returns:
+        int: The number of templates compiled.
+    """
+    with app.app_context():
+        compiled = precompile_templates(app)
+        MenuCatalog.get()
+        PrepTimeStats.refresh()
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    return compiled
+
+
+def warm_pool(app):
+    """
+    Opens this worker's pooled connections before it takes requests.
+
+    Call in each worker after the fork.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            # Drop, without closing, anything inherited from the master.
+            engine.dispose(close=False)
+            size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+            connections = [engine.connect() for _ in range(size)]
+            for connection in connections:
+                connection.close()
+
+
 if __name__ == "__main__":
     app = create_app("development")
     with app.app_context():
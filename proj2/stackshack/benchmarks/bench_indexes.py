@@ -0,0 +1,206 @@
+"""
+Query-plan benchmark for the secondary indexes on orders, order_items and
+menu_items.
+
+Builds a synthetic database (1M orders by default), runs the application's
+real query shapes without the indexes, adds them with ensure_indexes() and
+runs the same queries again, printing the plan and median latency of each.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_indexes
+    python -m benchmarks.bench_indexes --orders 200000
+    python -m benchmarks.bench_indexes --url mysql+pymysql://user:pw@host/bench
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from database.db import db
+from database.migrations import ensure_indexes
+from models.menu_item import MenuItem
+from models.order import Order, OrderItem
+from models.user import User
+
+TABLES = [User.__table__, MenuItem.__table__, Order.__table__, OrderItem.__table__]
+CATEGORIES = ["bun", "patty", "cheese", "topping", "sauce"]
+USERS = 5000
+MENU_ITEMS = 60
+BATCH = 20000
+
+QUERIES = {
+    "history": (
+        "SELECT * FROM orders WHERE user_id = :user_id ORDER BY ordered_at DESC",
+        {"user_id": 42},
+    ),
+    # get_staff_orders_page: one LIMITed range per status, merged in Python.
+    "staff board": (
+        " UNION ALL ".join(
+            "SELECT * FROM (SELECT id, ordered_at FROM orders WHERE status = "
+            f"'{status}' ORDER BY ordered_at DESC, id DESC LIMIT 51)"
+            for status in ("Pending", "Preparing", "Ready for Pickup")
+        ),
+        {},
+    ),
+    "board, all": (
+        "SELECT * FROM orders ORDER BY ordered_at DESC, id DESC LIMIT 51",
+        {},
+    ),
+    "board by date": (
+        "SELECT * FROM orders WHERE ordered_at >= :since AND ordered_at < :until "
+        "ORDER BY ordered_at DESC, id DESC LIMIT 51",
+        {"since": "2024-03-01", "until": "2024-03-02"},
+    ),
+    "order lines": (
+        "SELECT * FROM order_items WHERE order_id IN (10, 500, 9000, 77777)",
+        {},
+    ),
+    "menu item usage": (
+        "SELECT COUNT(*) FROM order_items WHERE menu_item_id = :menu_item_id",
+        {"menu_item_id": 7},
+    ),
+    "browse": (
+        "SELECT * FROM menu_items WHERE is_available = 1 ORDER BY category, name",
+        {},
+    ),
+}
+
+
+def build_schema(engine, orders):
+    """Creates the tables without secondary indexes and fills them."""
+    db.metadata.drop_all(engine, tables=list(reversed(TABLES)))
+    db.metadata.create_all(engine, tables=TABLES)
+    with engine.begin() as conn:
+        for table in TABLES:
+            for index in table.indexes:
+                index.drop(conn)
+
+    rng = random.Random(510)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            User.__table__.insert(),
+            [
+                {"id": i, "username": f"user{i}", "password": "x", "role": "customer"}
+                for i in range(1, USERS + 1)
+            ],
+        )
+        conn.execute(
+            MenuItem.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "name": f"item {i}",
+                    "category": CATEGORIES[i % len(CATEGORIES)],
+                    "price": 1.5,
+                    "is_available": i % 10 != 0,
+                    "is_healthy_choice": i % 4 == 0,
+                }
+                for i in range(1, MENU_ITEMS + 1)
+            ],
+        )
+
+    item_id = 1
+    for offset in range(0, orders, BATCH):
+        order_rows, item_rows = [], []
+        for order_id in range(offset + 1, min(offset + BATCH, orders) + 1):
+            # The last ~0.5% of orders are still in the kitchen.
+            if order_id > orders * 0.995:
+                status = rng.choice(["Pending", "Preparing", "Ready for Pickup"])
+            else:
+                status = "Delivered" if rng.random() > 0.03 else "Cancelled"
+            order_rows.append(
+                {
+                    "id": order_id,
+                    "user_id": rng.randint(1, USERS),
+                    "total_price": 9.5,
+                    "status": status,
+                    "ordered_at": start + timedelta(seconds=order_id * 30),
+                }
+            )
+            for _ in range(2):
+                item_rows.append(
+                    {
+                        "id": item_id,
+                        "order_id": order_id,
+                        "menu_item_id": rng.randint(1, MENU_ITEMS),
+                        "name": "item",
+                        "price": 1.5,
+                        "quantity": 1,
+                    }
+                )
+                item_id += 1
+        with engine.begin() as conn:
+            conn.execute(Order.__table__.insert(), order_rows)
+            conn.execute(OrderItem.__table__.insert(), item_rows)
+
+
+def explain(conn, sql, params):
+    """Returns the database's plan for ``sql`` as printable lines."""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    rows = conn.execute(text(prefix + sql), params).fetchall()
+    return [" | ".join(str(value) for value in row) for row in rows]
+
+
+def time_query(conn, sql, params, repeat):
+    """Median wall time of ``sql`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def report(engine, label, repeat):
+    print(f"\n=== {label} ===")
+    results = {}
+    with engine.connect() as conn:
+        for name, (sql, params) in QUERIES.items():
+            results[name] = time_query(conn, sql, params, repeat)
+            print(f"\n[{name}] median {results[name]:.2f} ms")
+            for line in explain(conn, sql, params):
+                print(f"    {line}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", help="SQLAlchemy URL of a scratch database")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(
+        tempfile.gettempdir(), "stackshack_bench_indexes.db"
+    )
+    engine = create_engine(url)
+    print(f"Building {args.orders:,} orders on {engine.url.render_as_string()}")
+    started = time.perf_counter()
+    build_schema(engine, args.orders)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    before = report(engine, "without secondary indexes", args.repeat)
+    started = time.perf_counter()
+    created = ensure_indexes(engine)
+    print(
+        f"\nensure_indexes() created {created} in {time.perf_counter() - started:.1f}s"
+    )
+    after = report(engine, "with secondary indexes", args.repeat)
+
+    print("\n=== summary (median ms) ===")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(
+            f"{name:>16}: {before[name]:9.2f} -> {after[name]:8.2f}  ({speedup:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
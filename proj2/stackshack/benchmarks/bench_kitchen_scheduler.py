@@ -0,0 +1,138 @@
+"""
+Latency benchmark for KitchenScheduler on synthetic rush-hour queues.
+
+Seeds a queue of Pending/Preparing orders (1-3 patty lines each plus
+toppings), then times the cold load, planning the batches, and the
+incremental refresh + plan after each wave of new and advanced orders.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_kitchen_scheduler
+    python -m benchmarks.bench_kitchen_scheduler --queue 20000 --wave 50
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from controllers.kitchen_scheduler import KitchenScheduler
+from controllers.order_controller import OrderController
+from controllers.status_controller import StatusController
+from database.db import db
+from models.menu_item import MenuItem
+from models.order import Order, OrderItem
+from models.user import User
+
+PATTIES = ["Beef Patty", "Chicken Patty", "Veggie Patty", "Turkey Patty"]
+TOPPINGS = ["Lettuce", "Tomato", "Onion", "Pickles"]
+
+
+def seed(queue, rng):
+    items = [MenuItem(name=n, category="patty", price=3) for n in PATTIES] + [
+        MenuItem(name=n, category="topping", price=0.5) for n in TOPPINGS
+    ]
+    user = User(username="rush", role="customer")
+    user.set_password("rush-hour")
+    db.session.add_all(items + [user])
+    db.session.commit()
+    patties = [i.id for i in items if i.category == "patty"]
+    toppings = [i.id for i in items if i.category == "topping"]
+
+    start = datetime.utcnow() - timedelta(minutes=20)
+    db.session.execute(
+        Order.__table__.insert(),
+        [
+            {
+                "id": n,
+                "user_id": user.id,
+                "total_price": 10,
+                "status": "Pending" if n % 3 else "Preparing",
+                "ordered_at": start + timedelta(seconds=n * 1200 / queue),
+                "changed_at": start + timedelta(seconds=n * 1200 / queue),
+            }
+            for n in range(1, queue + 1)
+        ],
+    )
+    lines = []
+    for n in range(1, queue + 1):
+        for item_id in rng.sample(patties, rng.randint(1, 3)):
+            lines.append(
+                {
+                    "order_id": n,
+                    "menu_item_id": item_id,
+                    "name": "patty",
+                    "price": 3,
+                    "quantity": rng.randint(1, 2),
+                }
+            )
+        lines.append(
+            {
+                "order_id": n,
+                "menu_item_id": rng.choice(toppings),
+                "name": "topping",
+                "price": 0.5,
+                "quantity": 1,
+            }
+        )
+    db.session.execute(OrderItem.__table__.insert(), lines)
+    db.session.commit()
+    return user.id, patties
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queue", type=int, default=5000)
+    parser.add_argument("--wave", type=int, default=20)
+    parser.add_argument("--waves", type=int, default=25)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    app.config["MENU_VERSION_CHECK_INTERVAL"] = 2.0
+    with app.app_context():
+        db.create_all()
+        rng = random.Random(16)
+        user_id, patties = seed(args.queue, rng)
+
+        started = time.perf_counter()
+        KitchenScheduler.refresh()
+        cold = time.perf_counter() - started
+
+        started = time.perf_counter()
+        _, _, batches = KitchenScheduler.propose_batches()
+        plan = time.perf_counter() - started
+
+        print(f"queue: {args.queue} orders -> {len(batches)} batches")
+        print(f"cold load        {ms(cold)}")
+        print(f"propose (warm)   {ms(plan)}")
+
+        next_to_advance = 1
+        timings = []
+        for _ in range(args.waves):
+            for _ in range(args.wave):
+                OrderController.create_new_order(
+                    user_id,
+                    [(rng.choice(patties), "3.00", rng.randint(1, 2), "patty")],
+                )
+            ids = list(range(next_to_advance, next_to_advance + args.wave))
+            next_to_advance += args.wave
+            StatusController.bulk_update_status(ids, "advance")
+
+            started = time.perf_counter()
+            success, msg, batches = KitchenScheduler.propose_batches()
+            timings.append(time.perf_counter() - started)
+            assert success, msg
+
+        print(
+            f"per wave of {args.wave} new + {args.wave} advanced orders: "
+            f"median {ms(statistics.median(timings))}, max {ms(max(timings))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
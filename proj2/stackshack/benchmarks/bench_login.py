@@ -0,0 +1,113 @@
+"""
+Login throughput vs. concurrency, with hashing inline and on the pool.
+
+Runs AuthController.login_user_account from N threads at once against a
+temporary SQLite file and prints logins per second, turned-away logins and
+the p50/p95 latency of a cheap request served alongside the burst, for
+hashing inline and on a PASSWORD_HASH_WORKERS process pool.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --workers 4 --queue 8 --logins 200
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from app import create_app
+from controllers.auth_controller import AuthController
+from controllers.password_hasher import PasswordHasher
+from database.db import db
+from models.user import User
+
+CONCURRENCY = [1, 2, 4, 8, 16, 32]
+
+
+def burst(app, threads, logins):
+    """Runs ``logins`` logins over ``threads`` threads; returns stats."""
+    remaining = iter(range(logins))
+    lock = threading.Lock()
+    ok, busy = [0], [0]
+
+    def run():
+        with app.test_request_context():
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                success, msg, _ = AuthController.login_user_account(
+                    "bench", "bench-password"
+                )
+                with lock:
+                    if success:
+                        ok[0] += 1
+                    elif msg == AuthController.BUSY_MESSAGE:
+                        busy[0] += 1
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+
+    # A cheap request served alongside the burst.
+    client = app.test_client()
+    latencies = []
+    while any(thread.is_alive() for thread in pool):
+        t0 = time.perf_counter()
+        client.get("/status/flow")
+        latencies.append(time.perf_counter() - t0)
+        time.sleep(0.005)
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return ok[0] / elapsed, busy[0], statistics.median(latencies or [0]), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--queue", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_login.db")
+    app = create_app("testing")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        PASSWORD_HASH_METHOD=args.method,
+        PASSWORD_HASH_QUEUE=args.queue,
+    )
+    with app.app_context():
+        db.create_all()
+        user = User(username="bench", role="customer")
+        user.set_password("bench-password")
+        db.session.add(user)
+        db.session.commit()
+
+    print(
+        f"{'mode':>8} {'threads':>7} {'logins/s':>9} {'busy':>5} "
+        f"{'p50 ms':>7} {'p95 ms':>7}"
+    )
+    for mode, workers in (("inline", 0), ("pool", args.workers)):
+        app.config["PASSWORD_HASH_WORKERS"] = workers
+        if workers:
+            with app.app_context():
+                PasswordHasher.verify(PasswordHasher.hash("warm"), "warm")
+        for threads in CONCURRENCY:
+            rate, busy, p50, p95 = burst(app, threads, args.logins)
+            print(
+                f"{mode:>8} {threads:>7} {rate:>9.1f} {busy:>5} "
+                f"{p50 * 1000:>7.1f} {p95 * 1000:>7.1f}"
+            )
+    PasswordHasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Sign-in throttle overhead with many distinct usernames and addresses.
+
+Calls LoginThrottle.check for N distinct username/IP pairs, then again for
+the same pairs, and prints the microseconds per check and the memory held
+by the buckets, for the in-process store and the shared SQLite store.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_login_throttle
+    python -m benchmarks.bench_login_throttle --keys 50000 --max-keys 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app import create_app
+from controllers.login_throttle import LoginThrottle
+
+
+def run(app, keys):
+    """Checks every pair twice; returns (first µs, repeat µs, bytes held)."""
+    pairs = [
+        (f"user{i}", f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+        for i in range(keys)
+    ]
+    results = []
+    with app.app_context():
+        app.extensions.pop("login_throttle", None)
+        for _ in range(2):
+            started = time.perf_counter()
+            for username, ip in pairs:
+                LoginThrottle.check(username, ip)
+            results.append((time.perf_counter() - started) / keys * 1e6)
+
+        # Fill a fresh store again, traced, to see what the buckets hold.
+        app.extensions.pop("login_throttle", None)
+        tracemalloc.start()
+        for username, ip in pairs:
+            LoginThrottle.check(username, ip)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return results[0], results[1], held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--max-keys", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    app.config.update(
+        LOGIN_THROTTLE_ENABLED=True, LOGIN_THROTTLE_MAX_KEYS=args.max_keys
+    )
+
+    print(f"{'store':>7} {'keys':>7} {'first µs':>9} {'repeat µs':>10} {'MiB':>6}")
+    path = os.path.join(tempfile.mkdtemp(), "bench_throttle.db")
+    for store, store_path in (("local", None), ("sqlite", path)):
+        app.config["LOGIN_THROTTLE_STORE_PATH"] = store_path
+        first, repeat, held = run(app, args.keys)
+        print(
+            f"{store:>7} {args.keys:>7} {first:>9.1f} {repeat:>10.1f} "
+            f"{held / 2**20:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
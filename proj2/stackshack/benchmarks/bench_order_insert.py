@@ -0,0 +1,102 @@
+"""
+Microbenchmark for OrderController.create_new_order's two write paths.
+
+Places the same orders through the per-object unit-of-work path
+(bulk=False) and the executemany path (bulk=True) and prints orders per
+second and statements per order for a range of line counts.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_order_insert
+    python -m benchmarks.bench_order_insert --url mysql+pymysql://user:pw@host/bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy import event
+
+from config import TestingConfig
+from controllers.order_controller import OrderController
+from database.db import db
+from models.menu_item import MenuItem
+from models.order import Order, OrderItem
+from models.user import User
+
+TABLES = [User.__table__, MenuItem.__table__, Order.__table__, OrderItem.__table__]
+LINE_COUNTS = [1, 5, 10, 25, 50]
+
+
+def make_app(url):
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    app.config["SQLALCHEMY_DATABASE_URI"] = url
+    db.init_app(app)
+    return app
+
+
+def reset(item_count):
+    db.metadata.drop_all(db.engine, tables=list(reversed(TABLES)))
+    db.metadata.create_all(db.engine, tables=TABLES)
+    db.session.add(User(username="bench", password="x", role="customer"))
+    db.session.execute(
+        MenuItem.__table__.insert(),
+        [
+            {"name": f"item {i}", "category": "bun", "price": 1.25}
+            for i in range(1, item_count + 1)
+        ],
+    )
+    db.session.commit()
+    return db.session.execute(db.select(User.id)).scalar()
+
+
+def run(user_id, item_data, orders, bulk):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    started = time.perf_counter()
+    try:
+        for _ in range(orders):
+            success, msg, _ = OrderController.create_new_order(
+                user_id, item_data, bulk=bulk
+            )
+            assert success, msg
+    finally:
+        elapsed = time.perf_counter() - started
+        event.remove(db.engine, "before_cursor_execute", record)
+    return orders / elapsed, len(statements) / orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--url", help="SQLAlchemy URL of a scratch database")
+    args = parser.parse_args()
+
+    url = args.url or "sqlite:///" + os.path.join(
+        tempfile.gettempdir(), "stackshack_bench_order_insert.db"
+    )
+    app = make_app(url)
+    with app.app_context():
+        target = db.engine.url.render_as_string()
+        print(f"Placing {args.orders} orders per run on {target}")
+        print(f"{'lines':>5} {'unit of work/s':>15} {'stmts':>6}", end=" ")
+        print(f"{'bulk/s':>10} {'stmts':>6}")
+        for lines in LINE_COUNTS:
+            user_id = reset(max(LINE_COUNTS))
+            item_data = [(i, "1.25", 2, f"item {i}") for i in range(1, lines + 1)]
+            slow, slow_stmts = run(user_id, item_data, args.orders, bulk=False)
+            fast, fast_stmts = run(user_id, item_data, args.orders, bulk=True)
+            print(
+                f"{lines:>5} {slow:>15,.0f} {slow_stmts:>6.1f} "
+                f"{fast:>10,.0f} {fast_stmts:>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+HTML bytes per page for the order pages, and the static bundles they load.
+
+Seeds a customer with N orders (mixed statuses, three lines each), then
+fetches the customer history, the staff board showing the same N orders
+and the burger builder, printing raw and gzip bytes of each HTML response
+and of every /assets/ bundle it references (downloaded once, then served
+from the browser cache).
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_page_weight
+    python -m benchmarks.bench_page_weight --orders 500
+"""
+
+import argparse
+import gzip
+import re
+
+from app import create_app
+from database.db import db
+from models.menu_item import MenuItem
+from models.order import Order, OrderItem
+from models.user import User
+
+STATUSES = ["Pending", "Preparing", "Ready for Pickup", "Delivered", "Cancelled"]
+ASSET = re.compile(rb'(?:href|src)="(/assets/[^"]+)"')
+
+
+def seed(orders):
+    db.session.add(MenuItem(name="Beef Patty", category="patty", price=3))
+    customer = User(username="weight", role="customer")
+    customer.set_password("weight-pass")
+    staff = User(username="weight_staff", role="staff")
+    staff.set_password("weight-pass")
+    db.session.add_all([customer, staff])
+    db.session.commit()
+    db.session.execute(
+        Order.__table__.insert(),
+        [
+            {
+                "id": n,
+                "user_id": customer.id,
+                "total_price": 9.5,
+                "status": STATUSES[n % len(STATUSES)],
+            }
+            for n in range(1, orders + 1)
+        ],
+    )
+    db.session.execute(
+        OrderItem.__table__.insert(),
+        [
+            {"order_id": n, "name": name, "price": price, "quantity": 1}
+            for n in range(1, orders + 1)
+            for name, price in (("Bun", 1.5), ("Beef Patty", 3.5), ("Cheddar", 1))
+        ],
+    )
+    db.session.commit()
+
+
+def sizes(body):
+    return len(body), len(gzip.compress(body))
+
+
+def report(client, label, url, seen):
+    body = client.get(url).data
+    raw, packed = sizes(body)
+    print(f"{label:<22} {raw:>9,} {packed:>9,}")
+    for asset in ASSET.findall(body):
+        if asset in seen:
+            continue
+        seen.add(asset)
+        raw, packed = sizes(client.get(asset.decode()).data)
+        print(f"  {asset.decode():<64} {raw:>9,} {packed:>9,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        seed(args.orders)
+
+    seen = set()
+    print(f"{'page':<22} {'bytes':>9} {'gzip':>9}")
+    customer = app.test_client()
+    customer.post("/auth/login", data={"username": "weight", "password": "weight-pass"})
+    report(customer, f"history ({args.orders} orders)", "/orders/history", seen)
+    report(customer, "builder", "/orders/new", seen)
+
+    staff = app.test_client()
+    staff.post(
+        "/auth/login", data={"username": "weight_staff", "password": "weight-pass"}
+    )
+    report(
+        staff,
+        f"manage ({args.orders} orders)",
+        f"/status/manage?status=all&limit={args.orders}",
+        seen,
+    )
+
+
+if __name__ == "__main__":
+    main()
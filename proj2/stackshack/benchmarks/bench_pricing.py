@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for PricingEngine.price_cart.
+
+Prices random carts of 1 to 50 lines against a seeded menu, once through the
+single IN (...) query and once through the MenuCatalog snapshot, and prints
+carts per second for each cart size.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_pricing
+    python -m benchmarks.bench_pricing --menu 500 --carts 2000
+"""
+
+import argparse
+import random
+import time
+
+from app import create_app
+from controllers.menu_catalog import MenuCatalog
+from controllers.pricing_engine import PricingEngine
+from database.db import db
+from models.menu_item import MenuItem
+
+CATEGORIES = ["bun", "patty", "cheese", "topping", "sauce"]
+CART_SIZES = [1, 5, 10, 25, 50]
+
+
+def seed_menu(count):
+    db.session.execute(
+        MenuItem.__table__.insert(),
+        [
+            {
+                "name": f"item {i}",
+                "category": CATEGORIES[i % len(CATEGORIES)],
+                "price": round(0.25 + (i % 40) * 0.25, 2),
+                "is_available": True,
+                "is_healthy_choice": False,
+            }
+            for i in range(1, count + 1)
+        ],
+    )
+    db.session.commit()
+    return list(db.session.execute(db.select(MenuItem.id)).scalars())
+
+
+def carts_per_second(carts, use_catalog):
+    started = time.perf_counter()
+    for cart in carts:
+        success, msg, _ = PricingEngine.price_cart(cart, use_catalog=use_catalog)
+        assert success, msg
+    return len(carts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--menu", type=int, default=200)
+    parser.add_argument("--carts", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    # Production-like check interval so the catalog path is not re-validated
+    # against the version row on every cart.
+    app.config["MENU_VERSION_CHECK_INTERVAL"] = 2.0
+    with app.app_context():
+        db.create_all()
+        ids = seed_menu(max(args.menu, max(CART_SIZES)))
+        MenuCatalog.get()
+        rng = random.Random(510)
+
+        print(f"{'lines':>5} {'IN query/s':>12} {'catalog/s':>12}")
+        for size in CART_SIZES:
+            carts = [
+                {item_id: rng.randint(1, 3) for item_id in rng.sample(ids, size)}
+                for _ in range(args.carts)
+            ]
+            query_rate = carts_per_second(carts, use_catalog=False)
+            catalog_rate = carts_per_second(carts, use_catalog=True)
+            print(f"{size:>5} {query_rate:>12,.0f} {catalog_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
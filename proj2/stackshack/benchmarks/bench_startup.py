@@ -0,0 +1,137 @@
+"""
+Worker startup time and first-request latency, cold vs. warmed up.
+
+Each measurement runs in a fresh interpreter against a seeded SQLite file:
+the time to import and build the app (plus warm_up/warm_pool when warm),
+then the latency of the first and the tenth request to a few pages. The
+"bytecode" modes load templates from a JINJA_BYTECODE_CACHE_DIR filled
+beforehand by `flask precompile-templates`, as after a deploy. A last pass
+compares steady-state page latency with template auto-reload on (what every
+profile used to get) and off.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+
+PAGES = ["/", "/auth/login", "/auth/register", "/orders/ingredients"]
+
+
+def child(path, warm, auto_reload, bytecode):
+    """Runs in the subprocess; prints one JSON result line."""
+    started = time.perf_counter()
+    import config
+
+    config.TestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    config.TestingConfig.TEMPLATES_AUTO_RELOAD = auto_reload
+    config.TestingConfig.JINJA_BYTECODE_CACHE_DIR = bytecode
+    from app import create_app, warm_pool, warm_up
+
+    app = create_app("testing")
+    if warm:
+        warm_up(app)
+        warm_pool(app)
+    startup = time.perf_counter() - started
+
+    client = app.test_client()
+    first, tenth = {}, {}
+    for page in PAGES:
+        for n in range(10):
+            t0 = time.perf_counter()
+            client.get(page)
+            elapsed = time.perf_counter() - t0
+            if n == 0:
+                first[page] = elapsed
+        tenth[page] = elapsed
+    print(json.dumps({"startup": startup, "first": first, "tenth": tenth}))
+
+
+def seed(path, bytecode):
+    """Seeds the menu and fills the bytecode cache, as a deploy would."""
+    import config
+
+    config.TestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    config.TestingConfig.JINJA_BYTECODE_CACHE_DIR = bytecode
+    from app import create_app, precompile_templates
+    from database.db import db
+    from models.menu_item import MenuItem
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            MenuItem(name=f"item {n}", category=category, price=1, is_available=True)
+            for category in ("bun", "patty", "cheese", "topping", "sauce")
+            for n in range(10)
+        )
+        db.session.commit()
+    precompile_templates(app)
+
+
+def run(path, warm, auto_reload, bytecode=None):
+    output = subprocess.run(  # nosec B603
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", path]
+        + (["--warm"] if warm else [])
+        + (["--auto-reload"] if auto_reload else [])
+        + (["--bytecode", bytecode] if bytecode else []),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--auto-reload", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--bytecode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.warm, args.auto_reload, args.bytecode)
+        return
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "bench_startup.db")
+    bytecode = os.path.join(workdir, "jinja")
+    seed(path, bytecode)
+
+    print(f"{'mode':>15} {'startup ms':>10}  first request ms per page")
+    modes = (
+        ("cold", False, None),
+        ("cold+bytecode", False, bytecode),
+        ("warm", True, None),
+        ("warm+bytecode", True, bytecode),
+    )
+    for mode, warm, cache_dir in modes:
+        results = [run(path, warm, False, cache_dir) for _ in range(args.runs)]
+        startup = statistics.median(r["startup"] for r in results) * 1000
+        firsts = "  ".join(
+            f"{page} {statistics.median(r['first'][page] for r in results) * 1000:.1f}"
+            for page in PAGES
+        )
+        print(f"{mode:>15} {startup:>10.1f}  {firsts}")
+
+    print(f"\n{'reload':>15}  steady-state (10th request) ms per page")
+    for label, auto_reload in (("on", True), ("off", False)):
+        results = [run(path, True, auto_reload) for _ in range(args.runs)]
+        tenths = "  ".join(
+            f"{page} {statistics.median(r['tenth'][page] for r in results) * 1000:.2f}"
+            for page in PAGES
+        )
+        print(f"{label:>15}  {tenths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Load test for the /status/stream Server-Sent Events endpoint.
+
+Serves the app from a threaded WSGI server, opens N idle staff subscriptions
+(1,000 by default) over real sockets, then commits one status change and
+measures how long each subscriber takes to receive it. Reports connect time,
+server threads and resident memory while idle, and fan-out latency.
+
+Usage (from proj2/stackshack):
+    python -m benchmarks.bench_status_stream
+    python -m benchmarks.bench_status_stream --subscribers 2000 --idle 10
+"""
+
+import argparse
+import logging
+import os
+import resource
+import selectors
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from config import TestingConfig, config
+from controllers.status_controller import StatusController
+from database.db import db
+from models.order import Order
+from models.user import User
+
+
+def make_app(path):
+    config["bench"] = type(
+        "BenchConfig",
+        (TestingConfig,),
+        {"SQLALCHEMY_DATABASE_URI": "sqlite:///" + path},
+    )
+    app = create_app("bench")
+    app.config["STATUS_STREAM_MAX_AGE"] = 3600
+    # Measures the broker itself, so lift the per-worker stream cap.
+    app.config["STATUS_STREAM_MAX_PER_WORKER"] = 0
+    # The raw sockets below reuse the test client's cookie without its
+    # User-Agent, which "strong" session protection would reject.
+    app.config["SESSION_PROTECTION"] = None
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        staff = User(username="bench-staff", role="staff")
+        staff.set_password("bench-password")
+        db.session.add(staff)
+        db.session.flush()
+        order = Order(user_id=staff.id, total_price=1, status="Pending")
+        db.session.add(order)
+        db.session.commit()
+        order_id = order.id
+
+    client = app.test_client()
+    client.post(
+        "/auth/login", data={"username": "bench-staff", "password": "bench-password"}
+    )
+    cookie = client.get_cookie("session").value
+    return app, order_id, cookie
+
+
+def open_subscriber(port, cookie):
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.sendall(
+        (
+            "GET /status/stream?scope=all HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            f"Cookie: session={cookie}\r\n"
+            "Accept: text/event-stream\r\n\r\n"
+        ).encode()
+    )
+    received = b""
+    while b"retry:" not in received:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise RuntimeError(f"Subscription refused: {received[:80]!r}")
+        received += chunk
+    sock.setblocking(False)
+    return sock
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--idle", type=float, default=5.0)
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, args.subscribers * 2 + 256)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    path = os.path.join(tempfile.gettempdir(), "stackshack_bench_stream.db")
+    app, order_id, cookie = make_app(path)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    baseline_rss = rss_mb()
+    started = time.perf_counter()
+    sockets = [
+        open_subscriber(server.server_port, cookie) for _ in range(args.subscribers)
+    ]
+    connect_s = time.perf_counter() - started
+    print(f"Opened {len(sockets):,} subscriptions in {connect_s:.1f}s")
+
+    time.sleep(args.idle)
+    print(
+        f"Idle for {args.idle:.0f}s: {threading.active_count()} threads, "
+        f"RSS {rss_mb():.0f} MB (+{rss_mb() - baseline_rss:.0f} MB)"
+    )
+
+    selector = selectors.DefaultSelector()
+    for sock in sockets:
+        selector.register(sock, selectors.EVENT_READ, bytearray())
+    with app.app_context():
+        published = time.perf_counter()
+        StatusController.update_order_status(order_id, "Preparing")
+
+    latencies = []
+    pending = len(sockets)
+    deadline = published + 30
+    while pending and time.perf_counter() < deadline:
+        for key, _ in selector.select(timeout=1):
+            buffer = key.data
+            buffer += key.fileobj.recv(4096)
+            if b"event: status" in buffer:
+                latencies.append((time.perf_counter() - published) * 1000)
+                selector.unregister(key.fileobj)
+                pending -= 1
+
+    latencies.sort()
+    print(f"Delivered to {len(latencies):,}/{len(sockets):,} subscribers")
+    if latencies:
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"Fan-out latency ms: p50 {statistics.median(latencies):.1f}  "
+            f"p99 {p99:.1f}  max {latencies[-1]:.1f}"
+        )
+
+    for sock in sockets:
+        sock.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,132 @@
 import os
 import secrets
 from dotenv import load_dotenv
+from database.pool import MeteredQueuePool
 
 load_dotenv()
 
 
+def pymysql_connect_args(uri):
+    """
+    Driver timeouts for a ``mysql+pymysql`` URL; empty for any other driver,
+    which would reject PyMySQL's keyword arguments.
+    """
+    if not uri.startswith("mysql+pymysql://"):
+        return {}
+    return {
+        "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", "5")),
+        "read_timeout": int(os.environ.get("DB_READ_TIMEOUT", "30")),
+        "write_timeout": int(os.environ.get("DB_WRITE_TIMEOUT", "30")),
+        # Server-side cap on SELECT run time, in milliseconds
+        "init_command": "SET SESSION max_execution_time="
+        + os.environ.get("DB_STATEMENT_TIMEOUT_MS", "10000"),
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "stackshack_secret_key")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SESSION_PROTECTION = "strong"
+    # Seconds between checks of the shared menu version (see MenuCatalog)
+    MENU_VERSION_CHECK_INTERVAL = float(
+        os.environ.get("MENU_VERSION_CHECK_INTERVAL", "2.0")
+    )
+    # Seconds an order idempotency key is remembered (see IdempotencyKey)
+    IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", "86400"))
+    # Shared spool file that fans status events out across worker processes;
+    # unset keeps events inside one process (see SpoolStatusBroker)
+    STATUS_EVENTS_SPOOL = os.environ.get("STATUS_EVENTS_SPOOL")
+    # Seconds between SSE keepalives, and before a stream is recycled
+    STATUS_STREAM_HEARTBEAT = 15
+    STATUS_STREAM_MAX_AGE = 300
+    # Open /status/stream connections per worker process. Each one holds a
+    # gthread thread, so keep this below GUNICORN_THREADS; 0 means no limit
+    STATUS_STREAM_MAX_PER_WORKER = int(
+        os.environ.get("STATUS_STREAM_MAX_PER_WORKER", "2")
+    )
+    # Seconds before a /status/changes cursor that are read again on every
+    # poll, for changes that committed after a later one was already served
+    ORDER_CHANGES_OVERLAP = int(os.environ.get("ORDER_CHANGES_OVERLAP", "5"))
+    # Hours of prep-time percentiles kept per worker (see PrepTimeStats)
+    PREP_STATS_WINDOW_HOURS = int(os.environ.get("PREP_STATS_WINDOW_HOURS", "48"))
+    # Seconds an order_status_events row must age before it is folded in,
+    # so one that commits after a higher id is not skipped
+    PREP_STATS_SETTLE_SECONDS = int(os.environ.get("PREP_STATS_SETTLE_SECONDS", "5"))
+    # Read that window on a background thread when a worker was not warmed
+    # (see warm_up); off, estimates use defaults until something refreshes it
+    PREP_STATS_BACKGROUND_WARM = True
+    # Order ETA inputs (see WaitTimeEstimator): orders the kitchen prepares at
+    # once, the prep time assumed before there is history, and seconds between
+    # re-reads of the queue depth
+    KITCHEN_CAPACITY = int(os.environ.get("KITCHEN_CAPACITY", "4"))
+    ETA_DEFAULT_PREP_SECONDS = 600
+    ETA_CHECK_INTERVAL = 2.0
+    # Kitchen batching (see KitchenScheduler): station for each batched menu
+    # category, units per batch, and seconds a partial batch may be held
+    KITCHEN_BATCH_STATIONS = {"patty": "Grill"}
+    KITCHEN_BATCH_SIZE = int(os.environ.get("KITCHEN_BATCH_SIZE", "12"))
+    KITCHEN_BATCH_MAX_WAIT = int(os.environ.get("KITCHEN_BATCH_MAX_WAIT", "300"))
+    # Order admission control (see AdmissionController); 0 disables a limit.
+    # ADMISSION_MAX_PENDING is the most Pending orders the queue may hold, so
+    # a new order is refused once the queue is already at it.
+    # The in-flight count is per worker unless ADMISSION_COUNTER_PATH names a
+    # file shared by all workers on the host.
+    ADMISSION_MAX_PENDING = int(os.environ.get("ADMISSION_MAX_PENDING", "0"))
+    ADMISSION_MAX_CONCURRENT_ORDERS = int(
+        os.environ.get("ADMISSION_MAX_CONCURRENT_ORDERS", "0")
+    )
+    ADMISSION_COUNTER_PATH = os.environ.get("ADMISSION_COUNTER_PATH")
+    # Seconds a worker trusts its cached user identity (see IdentityCache)
+    IDENTITY_CACHE_TTL = int(os.environ.get("IDENTITY_CACHE_TTL", "30"))
+    # Password hashing (see PasswordHasher): werkzeug method string with its
+    # cost, hashing processes per worker (0 = inline) and extra hashes allowed
+    # to wait for one before sign-ins are turned away. Each gunicorn worker
+    # starts its own hashing processes, so keep PASSWORD_HASH_WORKERS times
+    # GUNICORN_WORKERS (2 x CPUs + 1 by default) near the CPU count
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "1"))
+    PASSWORD_HASH_QUEUE = int(os.environ.get("PASSWORD_HASH_QUEUE", "8"))
+    # Sign-in throttling (see LoginThrottle): token buckets per username and
+    # per client IP, as burst size and attempts refilled per minute. Buckets
+    # are per worker, capped at LOGIN_THROTTLE_MAX_KEYS, unless
+    # LOGIN_THROTTLE_STORE_PATH names a SQLite file shared by all workers.
+    # Per-worker buckets let a client make the limit times GUNICORN_WORKERS
+    # attempts, so production defaults to the shared file.
+    LOGIN_THROTTLE_ENABLED = True
+    LOGIN_THROTTLE_USER_BURST = int(os.environ.get("LOGIN_THROTTLE_USER_BURST", "5"))
+    LOGIN_THROTTLE_USER_PER_MINUTE = int(
+        os.environ.get("LOGIN_THROTTLE_USER_PER_MINUTE", "5")
+    )
+    LOGIN_THROTTLE_IP_BURST = int(os.environ.get("LOGIN_THROTTLE_IP_BURST", "20"))
+    LOGIN_THROTTLE_IP_PER_MINUTE = int(
+        os.environ.get("LOGIN_THROTTLE_IP_PER_MINUTE", "30")
+    )
+    LOGIN_THROTTLE_MAX_KEYS = int(os.environ.get("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+    LOGIN_THROTTLE_STORE_PATH = os.environ.get("LOGIN_THROTTLE_STORE_PATH")
+    # Reverse proxies in front of the app that append to X-Forwarded-For and
+    # set X-Forwarded-Proto. The client address (used for per-IP limits) is
+    # read that many hops back; 0 trusts no headers and uses the socket peer
+    TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+    # Read replica for @read_only controller reads; unset reads the primary.
+    # A client that wrote keeps reading the primary for REPLICA_STICKY_SECONDS
+    # so replication lag never hides its own changes (see RoutingSession)
+    SQLALCHEMY_BINDS = (
+        {"replica": os.environ["DATABASE_REPLICA_URL"]}
+        if os.environ.get("DATABASE_REPLICA_URL")
+        else {}
+    )
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "5"))
+    # Directory for compiled Jinja templates, shared by workers and kept
+    # across restarts; fill it at deploy time with `flask precompile-templates`
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get("JINJA_BYTECODE_CACHE_DIR")
+    # Bearer token that lets monitoring read /status/pool without a staff
+    # login; unset means staff only
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    TEMPLATES_AUTO_RELOAD = True  # Pick up template edits without a restart
 
     # Build database URI from environment variables
     DB_USER = os.environ.get("DB_USER")
@@ -29,8 +143,42 @@ class DevelopmentConfig(Config):
 
 
 class ProductionConfig(Config):
-    # ... (your production config) ...
-    pass
+    DB_USER = os.environ.get("DB_USER")
+    DB_PASSWORD = os.environ.get("DB_PASSWORD")
+    DB_HOST = os.environ.get("DB_HOST")
+    DB_NAME = os.environ.get("DB_NAME")
+
+    SQLALCHEMY_DATABASE_URI = (
+        os.environ.get("DATABASE_URL")
+        or f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:3306/{DB_NAME}"
+    )
+
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get(
+        "JINJA_BYTECODE_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "jinja"),
+    )
+    LOGIN_THROTTLE_STORE_PATH = os.environ.get(
+        "LOGIN_THROTTLE_STORE_PATH",
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "instance",
+            "login_throttle.sqlite3",
+        ),
+    )
+
+    # Connection pool per worker process. Connections are recycled before
+    # MySQL's wait_timeout closes them and pinged on checkout, so idle
+    # periods do not surface as "MySQL server has gone away". Waits for a
+    # connection are timed by MeteredQueuePool and reported at /status/pool.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "5")),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "280")),
+        "pool_pre_ping": True,
+        "connect_args": pymysql_connect_args(SQLALCHEMY_DATABASE_URI),
+    }
 
 
 class TestingConfig(Config):
@@ -38,6 +186,12 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"  # Use in-memory SQLite DB
     WTF_CSRF_ENABLED = False  # Disable forms CSRF for tests
     SECRET_KEY = "test-secret-key"  # Use a simple key for tests
+    MENU_VERSION_CHECK_INTERVAL = 0  # Always see the latest menu in tests
+    PASSWORD_HASH_WORKERS = 0  # Hash inline; no worker processes in tests
+    LOGIN_THROTTLE_ENABLED = False  # Fixtures sign in many times from one IP
+    SQLALCHEMY_BINDS = {}  # Tests add a replica explicitly
+    PREP_STATS_BACKGROUND_WARM = False  # Tests refresh prep stats explicitly
+    PREP_STATS_SETTLE_SECONDS = 0  # Fold events as soon as they are written
 
 
 config = {
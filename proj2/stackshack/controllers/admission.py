@@ -0,0 +1,139 @@
+import fcntl
+import json
+import math
+import os
+import threading
+from flask import current_app
+from controllers.wait_time import WaitTimeEstimator
+
+
+class LocalCounter:
+    """In-flight order requests in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+
+    def add(self, delta):
+        """Adds ``delta`` and returns the new total."""
+        with self._lock:
+            self._value += delta
+            return self._value
+
+
+class FileCounter:
+    """
+    In-flight order requests across every worker on the host.
+
+    Each process keeps its own count in one small JSON file, updated under an
+    exclusive flock. Counts of processes that no longer exist are dropped on
+    the next update, so a worker killed mid-request cannot leak slots.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def add(self, delta):
+        """Adds ``delta`` to this process's count and returns the total."""
+        pid = os.getpid()
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 65536)
+                try:
+                    counts = {int(k): v for k, v in json.loads(raw or b"{}").items()}
+                except ValueError:
+                    counts = {}
+                counts = {p: n for p, n in counts.items() if self._alive(p)}
+                counts[pid] = max(0, counts.get(pid, 0) + delta)
+                if not counts[pid]:
+                    del counts[pid]
+                data = json.dumps(counts).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+                os.ftruncate(fd, len(data))
+                return sum(counts.values())
+            finally:
+                os.close(fd)
+
+
+class AdmissionController:
+    """
+    Admission control for order placement.
+
+    Two limits are checked before an order touches the database: the Pending
+    queue (WaitTimeEstimator's cached count, refreshed every
+    ETA_CHECK_INTERVAL), which may hold at most ADMISSION_MAX_PENDING orders
+    counting the new one, so a queue already at the limit sheds; and in-flight
+    order requests against ADMISSION_MAX_CONCURRENT_ORDERS. The in-flight count is
+    per process unless ADMISSION_COUNTER_PATH names a file shared by the
+    workers. A limit of 0 disables that check.
+    """
+
+    @staticmethod
+    def counter():
+        counter = current_app.extensions.get("admission_counter")
+        if counter is None:
+            path = current_app.config.get("ADMISSION_COUNTER_PATH")
+            counter = current_app.extensions.setdefault(
+                "admission_counter", FileCounter(path) if path else LocalCounter()
+            )
+        return counter
+
+    @staticmethod
+    def _busy(retry_after):
+        minutes = max(1, math.ceil(retry_after / 60))
+        unit = "minute" if minutes == 1 else "minutes"
+        return (
+            False,
+            f"We're very busy right now. Please try again in {minutes} {unit}.",
+            retry_after,
+        )
+
+    @staticmethod
+    def admit_order():
+        """
+        Reserves an order slot, or explains why the order is shed.
+
+        A successful admission must be paired with release().
+
+        Returns:
+            tuple: (admitted, message, retry_after) where retry_after is the
+                suggested wait in seconds when the order is refused.
+        """
+        config = current_app.config
+        max_pending = config.get("ADMISSION_MAX_PENDING", 0)
+        if max_pending:
+            estimate = WaitTimeEstimator.estimate()
+            excess = estimate["queue"].get("Pending", 0) - max_pending + 1
+            if excess > 0:
+                # Time for the kitchen to work the queue back under the limit.
+                capacity = max(1, config.get("KITCHEN_CAPACITY", 4))
+                retry_after = math.ceil(excess / capacity) * estimate["prep_seconds"]
+                return AdmissionController._busy(int(retry_after))
+
+        max_concurrent = config.get("ADMISSION_MAX_CONCURRENT_ORDERS", 0)
+        if max_concurrent:
+            counter = AdmissionController.counter()
+            if counter.add(1) > max_concurrent:
+                counter.add(-1)
+                return AdmissionController._busy(60)
+        return True, "Order admitted.", 0
+
+    @staticmethod
+    def release():
+        """Frees the slot reserved by a successful admit_order()."""
+        if current_app.config.get("ADMISSION_MAX_CONCURRENT_ORDERS", 0):
+            AdmissionController.counter().add(-1)
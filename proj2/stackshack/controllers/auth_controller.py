@@ -1,6 +1,9 @@
 from models.user import User
 from database.db import db
 from flask_login import login_user, logout_user, current_user
+from controllers.identity_cache import IdentityCache
+from controllers.password_hasher import PasswordHasher, PasswordHasherBusy
+from database.routing import read_only
 
 
 class AuthController:
@@ -9,6 +12,8 @@ class AuthController:
     including registration, login, logout, and CRUD operations for users and roles.
     """
 
+    BUSY_MESSAGE = "Too many sign-ins right now. Please try again in a moment."
+
     @staticmethod
     def register_user(username, password, role="customer"):
         """
@@ -41,6 +46,9 @@ class AuthController:
         try:
             user = User(username=username, role=role)
             user.set_password(password)
+        except PasswordHasherBusy:
+            return False, AuthController.BUSY_MESSAGE, None
+        try:
             db.session.add(user)
             db.session.commit()
             return True, f"{user.role.capitalize()} user created successfully.", user
@@ -61,10 +69,18 @@ class AuthController:
             tuple: (success (bool), message (str), user (User or None))
         """
         user = User.get_by_username(username)
-        if not user or not user.check_password(password):
-            return False, "Incorrect username or password.", None
+        try:
+            if not user or not user.check_password(password):
+                return False, "Incorrect username or password.", None
+            if PasswordHasher.needs_rehash(user.password):
+                # Hash settings changed since this password was stored.
+                user.set_password(password)
+                db.session.commit()
+        except PasswordHasherBusy:
+            return False, AuthController.BUSY_MESSAGE, None
 
         login_user(user)
+        IdentityCache.remember(user)
 
         return True, "Login successful", user
 
@@ -80,6 +96,7 @@ class AuthController:
         return True, "Logged out successfully."
 
     @staticmethod
+    @read_only
     def get_all_users():
         """
         Retrieves all users from the database.
@@ -99,6 +116,7 @@ class AuthController:
             return False, "User not found"
         user.role = new_role
         db.session.commit()
+        IdentityCache.invalidate(user.id)
         return True, "Role updated successfully"
 
     @staticmethod
@@ -109,6 +127,8 @@ class AuthController:
         user = db.session.get(User, int(user_id))
         if not user:
             return False, "User not found"
+        user_id = user.id
         db.session.delete(user)
         db.session.commit()
+        IdentityCache.invalidate(user_id)
         return True, "User deleted successfully"
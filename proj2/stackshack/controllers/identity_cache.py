@@ -0,0 +1,85 @@
+import threading
+import time
+from flask import current_app
+from flask_login import UserMixin
+from database.db import db
+from models.user import User
+
+STAFF_ROLES = ("staff", "admin")
+
+
+class Identity(UserMixin):
+    """Detached snapshot of the User fields that requests need."""
+
+    def __init__(self, user_id, username, role):
+        self.id = user_id
+        self.username = username
+        self.role = role
+
+
+def has_role(user, *roles):
+    """True if ``user`` (e.g. current_user) is logged in with one of ``roles``.
+
+    Reads the already-loaded identity only; never queries the database.
+    """
+    return bool(user.is_authenticated and user.role in roles)
+
+
+class IdentityCache:
+    """
+    Per-process cache of user identities for the login manager.
+
+    Entries live for IDENTITY_CACHE_TTL seconds. Role changes and deletions
+    through AuthController invalidate the entry at once in the worker that
+    made them; other workers pick them up when their entry expires.
+    """
+
+    class _State:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.entries = {}  # user_id -> (Identity, expires_at)
+
+    @staticmethod
+    def _state():
+        state = current_app.extensions.get("identity_cache")
+        if state is None:
+            state = current_app.extensions.setdefault(
+                "identity_cache", IdentityCache._State()
+            )
+        return state
+
+    @staticmethod
+    def _store(state, user_id, identity):
+        ttl = current_app.config.get("IDENTITY_CACHE_TTL", 30)
+        with state.lock:
+            state.entries[user_id] = (identity, time.monotonic() + ttl)
+
+    @staticmethod
+    def remember(user):
+        """Caches ``user`` (a User row), e.g. right after login."""
+        identity = Identity(user.id, user.username, user.role)
+        IdentityCache._store(IdentityCache._state(), user.id, identity)
+        return identity
+
+    @staticmethod
+    def get(user_id):
+        """Returns the Identity for ``user_id``, or None if there is no such user."""
+        user_id = int(user_id)
+        state = IdentityCache._state()
+        entry = state.entries.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        row = db.session.execute(
+            db.select(User.id, User.username, User.role).where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        identity = Identity(*row)
+        IdentityCache._store(state, user_id, identity)
+        return identity
+
+    @staticmethod
+    def invalidate(user_id):
+        state = IdentityCache._state()
+        with state.lock:
+            state.entries.pop(int(user_id), None)
@@ -0,0 +1,216 @@
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.orm import selectinload
+from controllers.menu_catalog import MenuCatalog
+from controllers.status_controller import StatusController
+from models.order import Order
+
+PrepBatch = namedtuple(
+    "PrepBatch",
+    [
+        "station",
+        "menu_item_id",
+        "name",
+        "quantity",
+        "order_ids",
+        "oldest_at",
+        "due_at",
+        "cook_now",
+    ],
+)
+
+
+def plan_batches(demand, items, batch_size, max_wait, now):
+    """
+    Splits queued demand into prep batches.
+
+    Args:
+        demand: {menu_item_id: {order_id: (ordered_at, quantity)}}.
+        items: {menu_item_id: (station, name)}.
+        batch_size (int): Units one station cooks at once.
+        max_wait (timedelta): Longest an order may wait for its batch to fill.
+        now (datetime): Current time (UTC).
+
+    Each item's orders are taken oldest first and packed into batches of up to
+    ``batch_size`` units (a large order may span two). Full batches should be
+    cooked now; a partial batch is held for more orders until its oldest order
+    has waited ``max_wait``.
+
+    Returns:
+        list: PrepBatch tuples, batches to cook now first, then by due time.
+    """
+    batches = []
+    for item_id, queued in demand.items():
+        station, name = items[item_id]
+        entries = sorted(queued.items(), key=lambda e: (e[1][0], e[0]))
+        quantity, order_ids, oldest_at = 0, [], None
+        for order_id, (ordered_at, units) in entries:
+            while units:
+                if oldest_at is None:
+                    oldest_at = ordered_at
+                taken = min(units, batch_size - quantity)
+                quantity += taken
+                units -= taken
+                order_ids.append(order_id)
+                if quantity == batch_size:
+                    batches.append(
+                        PrepBatch(
+                            station,
+                            item_id,
+                            name,
+                            quantity,
+                            order_ids,
+                            oldest_at,
+                            oldest_at + max_wait,
+                            True,
+                        )
+                    )
+                    quantity, order_ids, oldest_at = 0, [], None
+        if quantity:
+            due_at = oldest_at + max_wait
+            batches.append(
+                PrepBatch(
+                    station,
+                    item_id,
+                    name,
+                    quantity,
+                    order_ids,
+                    oldest_at,
+                    due_at,
+                    due_at <= now,
+                )
+            )
+    batches.sort(key=lambda b: (not b.cook_now, b.due_at, b.menu_item_id))
+    return batches
+
+
+class KitchenScheduler:
+    """
+    Proposes batches (e.g. "Grill 7 x Beef Patty for orders #101, #103 ...")
+    for the Pending/Preparing queue.
+
+    Each worker keeps the queued units per batchable menu item in
+    app.extensions and catches up through the delta sync
+    (StatusController.get_order_changes), so a refresh only reads orders
+    placed or moved since the last one (plus the short overlap window it
+    re-reads; applying an order twice is harmless). Which categories are batched, and at
+    which station, comes from KITCHEN_BATCH_STATIONS.
+    """
+
+    QUEUE_STATUSES = ("Pending", "Preparing")
+
+    class _State:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.cursor = None
+            self.demand = {}  # menu_item_id -> {order_id: (ordered_at, qty)}
+            self.items = {}  # menu_item_id -> (station, name)
+            self.orders = {}  # order_id -> [menu_item_id, ...]
+
+    @staticmethod
+    def _state():
+        state = current_app.extensions.get("kitchen_scheduler")
+        if state is None:
+            state = current_app.extensions.setdefault(
+                "kitchen_scheduler", KitchenScheduler._State()
+            )
+        return state
+
+    @staticmethod
+    def _remove(state, order_id):
+        for item_id in state.orders.pop(order_id, ()):
+            queued = state.demand.get(item_id)
+            if queued is not None:
+                queued.pop(order_id, None)
+                if not queued:
+                    del state.demand[item_id]
+
+    @staticmethod
+    def _apply(state, order, stations):
+        """Adds an order's batchable lines, or drops it once it leaves the queue."""
+        if order.status not in KitchenScheduler.QUEUE_STATUSES:
+            KitchenScheduler._remove(state, order.id)
+            return
+        if order.id in state.orders:
+            return
+        menu = MenuCatalog.get().by_id
+        units = {}
+        for line in order.line_items:
+            item = menu.get(line.menu_item_id)
+            if item is None or item.category not in stations:
+                continue
+            state.items[item.id] = (stations[item.category], item.name)
+            units[item.id] = units.get(item.id, 0) + line.quantity
+        for item_id, quantity in units.items():
+            state.demand.setdefault(item_id, {})[order.id] = (
+                order.ordered_at,
+                quantity,
+            )
+        state.orders[order.id] = list(units)
+
+    @staticmethod
+    def refresh():
+        """Brings the queue up to date. Returns the number of orders read."""
+        state = KitchenScheduler._state()
+        stations = current_app.config.get("KITCHEN_BATCH_STATIONS", {})
+        with state.lock:
+            seen = 0
+            if state.cursor is None:
+                # Take the cursor first so changes made while loading are
+                # replayed by the next refresh; applying them twice is harmless.
+                success, msg, head = StatusController.get_order_changes()
+                if not success:
+                    raise ValueError(msg)
+                orders = (
+                    Order.query.filter(
+                        Order.status.in_(KitchenScheduler.QUEUE_STATUSES)
+                    )
+                    .options(selectinload(Order.line_items))
+                    .order_by(Order.ordered_at, Order.id)
+                    .all()
+                )
+                for order in orders:
+                    KitchenScheduler._apply(state, order, stations)
+                state.cursor = head["cursor"]
+                return len(orders)
+            while True:
+                success, msg, page = StatusController.get_order_changes(
+                    since=state.cursor,
+                    limit=StatusController.MAX_STAFF_PAGE_SIZE,
+                    with_items=True,
+                )
+                if not success:
+                    raise ValueError(msg)
+                for order in page["orders"]:
+                    KitchenScheduler._apply(state, order, stations)
+                seen += len(page["orders"])
+                state.cursor = page["cursor"]
+                if not page["has_more"]:
+                    return seen
+
+    @staticmethod
+    def propose_batches(now=None):
+        """
+        Returns the current batch proposal.
+
+        Returns:
+            tuple: (success, message, batches) with PrepBatch tuples as
+                described in plan_batches().
+        """
+        try:
+            KitchenScheduler.refresh()
+            state = KitchenScheduler._state()
+            config = current_app.config
+            with state.lock:
+                batches = plan_batches(
+                    state.demand,
+                    state.items,
+                    max(1, config.get("KITCHEN_BATCH_SIZE", 12)),
+                    timedelta(seconds=config.get("KITCHEN_BATCH_MAX_WAIT", 300)),
+                    now or datetime.utcnow(),
+                )
+            return True, "Prep batches proposed.", batches
+        except Exception as e:
+            return False, f"Error proposing prep batches: {str(e)}", None
@@ -0,0 +1,193 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class LocalBucketStore:
+    """
+    Token buckets in this process, bounded to ``max_keys`` entries.
+
+    A bucket that has been idle long enough to refill completely carries no
+    information, so idle buckets are dropped from the least recently used
+    end on every call; if the store is still over ``max_keys`` the least
+    recently used buckets are evicted outright.
+    """
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at, idle_after)
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, limits, now):
+        """
+        Takes one token from every bucket in ``limits``, or from none.
+
+        Args:
+            limits: [(key, burst, refill_per_second), ...].
+            now (float): Monotonic time in seconds.
+
+        Returns:
+            float: 0 if the tokens were taken, else seconds until they would be.
+        """
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key, burst, rate in limits:
+                tokens, updated_at, _ = self._buckets.get(key, (burst, now, 0))
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            for (key, burst, rate), tokens in zip(limits, levels):
+                if not wait:
+                    tokens -= 1
+                self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+                self._buckets.move_to_end(key)
+            self._prune(now)
+            return wait
+
+    def _prune(self, now):
+        buckets = self._buckets
+        while buckets:
+            key, (_, _, idle_after) = next(iter(buckets.items()))
+            if idle_after > now and len(buckets) <= self.max_keys:
+                break
+            del buckets[key]
+
+
+class SqliteBucketStore:
+    """
+    Token buckets shared by every worker on a host through one SQLite file.
+
+    A local stand-in for a shared cache such as Redis: each call is one short
+    IMMEDIATE transaction, so workers never take the same token twice. Rows of
+    fully refilled buckets are deleted periodically to bound the file.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, "
+                "tokens REAL NOT NULL, updated_at REAL NOT NULL, "
+                "idle_after REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, limits, now):
+        """Same contract as LocalBucketStore.take; ``now`` is wall-clock time."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            levels = []
+            wait = 0.0
+            for key, burst, rate in limits:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated_at = row or (burst, now)
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            for (key, burst, rate), tokens in zip(limits, levels):
+                if not wait:
+                    tokens -= 1
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    (key, tokens, now, now + (burst - tokens) / rate),
+                )
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM buckets WHERE idle_after <= ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+
+class LoginThrottle:
+    """
+    Per-username and per-client-IP token buckets for sign-in attempts.
+
+    Every attempt takes one token from the username's bucket and one from the
+    IP's bucket (both or neither); an empty bucket rejects the attempt before
+    the user is looked up or a password hashed. Buckets live in this worker
+    unless LOGIN_THROTTLE_STORE_PATH names a SQLite file shared by workers.
+    The client IP is ``request.remote_addr``, which only reflects the real
+    client behind a proxy when TRUSTED_PROXY_HOPS is set.
+    """
+
+    MESSAGE = "Too many sign-in attempts. Please try again in {seconds} seconds."
+
+    @staticmethod
+    def store():
+        store = current_app.extensions.get("login_throttle")
+        if store is None:
+            path = current_app.config.get("LOGIN_THROTTLE_STORE_PATH")
+            if path:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            store = current_app.extensions.setdefault(
+                "login_throttle",
+                (
+                    SqliteBucketStore(path)
+                    if path
+                    else LocalBucketStore(
+                        current_app.config.get("LOGIN_THROTTLE_MAX_KEYS", 100000)
+                    )
+                ),
+            )
+        return store
+
+    @staticmethod
+    def check(username, client_ip=None):
+        """
+        Spends one attempt for ``username`` and ``client_ip``.
+
+        Returns:
+            tuple: (allowed, message, retry_after) with retry_after in whole
+                seconds when the attempt is refused.
+        """
+        config = current_app.config
+        if not config.get("LOGIN_THROTTLE_ENABLED", True):
+            return True, "Attempt allowed.", 0
+        limits = [
+            (
+                "user:" + (username or "").strip().lower(),
+                config.get("LOGIN_THROTTLE_USER_BURST", 5),
+                config.get("LOGIN_THROTTLE_USER_PER_MINUTE", 5) / 60,
+            )
+        ]
+        if client_ip:
+            limits.append(
+                (
+                    "ip:" + client_ip,
+                    config.get("LOGIN_THROTTLE_IP_BURST", 20),
+                    config.get("LOGIN_THROTTLE_IP_PER_MINUTE", 30) / 60,
+                )
+            )
+        store = LoginThrottle.store()
+        now = time.time() if isinstance(store, SqliteBucketStore) else time.monotonic()
+        wait = store.take(limits, now)
+        if wait:
+            seconds = max(1, math.ceil(wait))
+            return False, LoginThrottle.MESSAGE.format(seconds=seconds), seconds
+        return True, "Attempt allowed.", 0
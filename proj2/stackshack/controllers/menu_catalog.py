@@ -0,0 +1,129 @@
+import threading
+import time
+from sqlalchemy import select
+from flask import current_app
+from models.cache_version import CacheVersion
+from models.menu_item import MenuItem
+from database.db import db
+
+
+class MenuSnapshot:
+    """Immutable, pre-sorted views of the menu at one version."""
+
+    def __init__(self, version, items):
+        self.version = version
+        # All items, ordered by category then name (matches get_all_items).
+        self.items = sorted(items, key=lambda item: (item.category, item.name))
+        self.available = [item for item in self.items if item.is_available]
+        self.healthy = sorted(
+            (item for item in self.available if item.is_healthy_choice),
+            key=lambda item: item.name,
+        )
+        self.by_id = {item.id: item for item in self.items}
+        self.by_category = {}
+        for item in self.items:
+            self.by_category.setdefault(item.category, []).append(item)
+        self.available_by_category = {}
+        for item in self.available:
+            self.available_by_category.setdefault(item.category, []).append(item)
+        # Case-insensitive exact lookup used by the ingredient endpoints.
+        self._folded_categories = {}
+        for category, items in self.by_category.items():
+            self._folded_categories.setdefault(category.lower(), []).extend(items)
+
+    def category(self, name):
+        """All items whose category equals ``name``, ignoring case."""
+        return self._folded_categories.get(name.lower(), [])
+
+
+class MenuCatalog:
+    """
+    Per-process cache of the menu, keyed by the shared ``menu`` CacheVersion.
+
+    Reads compare the local version with the database row at most once every
+    MENU_VERSION_CHECK_INTERVAL seconds (a single primary-key lookup) and
+    rebuild the snapshot only when it changed. Every MenuController mutation
+    calls bump_version() inside its transaction, so all gunicorn workers pick
+    up the change on their next check, and invalidate() after the commit so
+    the writing worker sees it at once.
+    """
+
+    VERSION_NAME = "menu"
+
+    class _State:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.snapshot = None
+            self.checked_at = None
+
+    @staticmethod
+    def _state():
+        state = current_app.extensions.get("menu_catalog")
+        if state is None:
+            state = current_app.extensions.setdefault(
+                "menu_catalog", MenuCatalog._State()
+            )
+        return state
+
+    @staticmethod
+    def _read_version():
+        version = db.session.execute(
+            select(CacheVersion.version).where(
+                CacheVersion.name == MenuCatalog.VERSION_NAME
+            )
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def _load_items():
+        # Read plain rows and build transient MenuItem objects so the cache
+        # never shares instances with (or gets expired by) a request session.
+        rows = db.session.execute(select(MenuItem.__table__)).mappings().all()
+        return [MenuItem(**row) for row in rows]
+
+    @staticmethod
+    def get():
+        """
+        Returns the current MenuSnapshot, rebuilding it if the version moved.
+
+        Returns:
+            MenuSnapshot: Shared, read-only views of the menu.
+        """
+        state = MenuCatalog._state()
+        interval = current_app.config.get("MENU_VERSION_CHECK_INTERVAL", 2.0)
+        now = time.monotonic()
+        snapshot = state.snapshot
+        if (
+            snapshot is not None
+            and state.checked_at is not None
+            and now - state.checked_at < interval
+        ):
+            return snapshot
+
+        with state.lock:
+            version = MenuCatalog._read_version()
+            if state.snapshot is None or state.snapshot.version != version:
+                state.snapshot = MenuSnapshot(version, MenuCatalog._load_items())
+            state.checked_at = now
+            return state.snapshot
+
+    @staticmethod
+    def bump_version():
+        """
+        Increments the shared menu version in the current transaction. Call
+        before commit, then invalidate() once the commit succeeded.
+        """
+        CacheVersion.bump(MenuCatalog.VERSION_NAME)
+
+    @staticmethod
+    def invalidate():
+        """
+        Drops this worker's snapshot so the next read reloads it.
+
+        Call after commit: dropping it earlier lets a concurrent read cache
+        the old rows again under the new version.
+        """
+        state = MenuCatalog._state()
+        with state.lock:
+            state.snapshot = None
+            state.checked_at = None
@@ -1,11 +1,14 @@
 from models.menu_item import MenuItem
 from database.db import db
 from flask_login import current_user
+from controllers.menu_catalog import MenuCatalog
+from database.routing import read_only
 
 
 class MenuController:
 
     @staticmethod
+    @read_only
     def get_all_items():
         """Get all menu items"""
         try:
@@ -15,6 +18,7 @@ class MenuController:
             return False, f"Error: {str(e)}", None
 
     @staticmethod
+    @read_only
     def get_item_by_id(item_id):
         """Get a specific menu item by ID"""
         try:
@@ -52,7 +56,9 @@ class MenuController:
                 image_url=image_url,
             )
             db.session.add(item)
+            MenuCatalog.bump_version()
             db.session.commit()
+            MenuCatalog.invalidate()
             return True, "Item created successfully", item
         except Exception as e:
             db.session.rollback()
@@ -98,7 +104,9 @@ class MenuController:
             if image_url is not None:
                 item.image_url = image_url
 
+            MenuCatalog.bump_version()
             db.session.commit()
+            MenuCatalog.invalidate()
             return True, "Item updated successfully", item
         except Exception as e:
             db.session.rollback()
@@ -117,7 +125,9 @@ class MenuController:
                 return False, "Item not found", None
 
             db.session.delete(item)
+            MenuCatalog.bump_version()
             db.session.commit()
+            MenuCatalog.invalidate()
             return True, "Item deleted successfully", None
         except Exception as e:
             db.session.rollback()
@@ -143,7 +153,9 @@ class MenuController:
                 return False, "Item not found", None
 
             item.is_available = not item.is_available
+            MenuCatalog.bump_version()
             db.session.commit()
+            MenuCatalog.invalidate()
             status = "available" if item.is_available else "unavailable"
             return True, f"Item marked as {status}", item
         except Exception as e:
@@ -170,7 +182,9 @@ class MenuController:
                 return False, "Item not found", None
 
             item.is_healthy_choice = not item.is_healthy_choice
+            MenuCatalog.bump_version()
             db.session.commit()
+            MenuCatalog.invalidate()
             status = (
                 "healthy choice" if item.is_healthy_choice else "not a healthy choice"
             )
@@ -180,40 +194,41 @@ class MenuController:
             return False, f"Error: {str(e)}", None
 
     @staticmethod
+    @read_only
     def get_items_by_category(category):
         """Get all items in a specific category"""
         try:
-            items = (
-                MenuItem.query.filter_by(category=category)
-                .order_by(MenuItem.name)
-                .all()
-            )
+            items = MenuCatalog.get().by_category.get(category, [])
             return True, "Items retrieved successfully", items
         except Exception as e:
             return False, f"Error: {str(e)}", None
 
     @staticmethod
+    @read_only
     def get_available_items():
         """Get only available menu items (for customer view)"""
         try:
-            items = (
-                MenuItem.query.filter_by(is_available=True)
-                .order_by(MenuItem.category, MenuItem.name)
-                .all()
-            )
+            items = MenuCatalog.get().available
             return True, "Available items retrieved successfully", items
         except Exception as e:
             return False, f"Error: {str(e)}", None
 
     @staticmethod
+    @read_only
+    def get_available_items_by_category():
+        """Get available items grouped by category, each group sorted by name"""
+        try:
+            grouped = MenuCatalog.get().available_by_category
+            return True, "Available items retrieved successfully", grouped
+        except Exception as e:
+            return False, f"Error: {str(e)}", None
+
+    @staticmethod
+    @read_only
     def get_healthy_choices():
         """Get items marked as healthy choices"""
         try:
-            items = (
-                MenuItem.query.filter_by(is_healthy_choice=True, is_available=True)
-                .order_by(MenuItem.name)
-                .all()
-            )
+            items = MenuCatalog.get().healthy
             return True, "Healthy choices retrieved successfully", items
         except Exception as e:
             return False, f"Error: {str(e)}", None
@@ -1,54 +1,204 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from controllers.pricing_engine import PricingEngine, from_cents, to_cents
+from controllers.status_events import StatusEvents
+from controllers.wait_time import WaitTimeEstimator
+from models.idempotency_key import IdempotencyKey
 from models.order import Order, OrderItem
 from database.db import db
+from database.routing import read_only
 
 
 class OrderController:
 
     @staticmethod
-    def get_user_orders(user_id):
-        """Retrieves all orders for a specific user."""
+    @read_only
+    def get_user_orders(user_id, with_items=False):
+        """Retrieves all orders for a specific user.
+
+        When ``with_items`` is True the order lines are preloaded into
+        ``Order.line_items`` with one extra query, so rendering the history
+        costs the same number of queries no matter how many orders there are.
+        """
         try:
-            orders = (
-                Order.query.filter_by(user_id=user_id)
-                .order_by(Order.ordered_at.desc())
-                .all()
-            )
+            query = Order.query.filter_by(user_id=user_id)
+            if with_items:
+                query = query.options(selectinload(Order.line_items))
+            orders = query.order_by(Order.ordered_at.desc()).all()
             return True, "Orders retrieved successfully", orders
         except Exception as e:
             return False, f"Error retrieving orders: {str(e)}", None
 
     @staticmethod
-    def create_new_order(user_id, item_data):
-        """Creates a new order for the specified user with the given items."""
+    def create_new_order(user_id, item_data, bulk=True, idempotency_key=None):
+        """Creates a new order for the specified user with the given items.
+
+        ``item_data`` is a list of already-priced (item_id, price, quantity,
+        name) lines; the total is summed in integer cents. Customer checkouts
+        should go through checkout() so prices come from the menu.
+
+        The total is known before the header is written, so an order costs one
+        INSERT for the header and, with ``bulk`` (the default), one
+        executemany INSERT for all of its lines. ``bulk=False`` keeps the
+        per-object unit-of-work path for comparison. The returned order carries
+        ``estimated_ready_at`` from WaitTimeEstimator.
+
+        With ``idempotency_key`` the key is claimed before anything else is
+        written; if another request already holds it, the original order's
+        result is returned instead of placing a second one.
+        """
         if not item_data:
             return False, "Order cannot be empty.", None
 
-        total_price = 0
-        new_order = Order(user_id=user_id, total_price=0, status="Pending")
-        db.session.add(new_order)
-        db.session.flush()  # Get the order ID before commit
-
         try:
+            lines = []
+            total_cents = 0
             for item_id, price, quantity, name in item_data:
-                price_float = float(price)
+                price_cents = to_cents(price)
                 quantity_int = int(quantity)
 
                 if quantity_int <= 0:
                     continue
 
-                order_item = OrderItem(
-                    order_id=new_order.id,
-                    menu_item_id=item_id if item_id else None,
-                    name=name,
-                    price=price_float,
-                    quantity=quantity_int,
+                lines.append(
+                    {
+                        "menu_item_id": item_id if item_id else None,
+                        "name": name,
+                        "price": from_cents(price_cents),
+                        "quantity": quantity_int,
+                    }
                 )
-                db.session.add(order_item)
-                total_price += price_float * quantity_int
+                total_cents += price_cents * quantity_int
+
+            claim = None
+            if idempotency_key:
+                claim = IdempotencyKey(user_id=user_id, key=idempotency_key)
+                db.session.add(claim)
+                try:
+                    db.session.flush()
+                except IntegrityError:
+                    # A concurrent duplicate got the key first (on MySQL this
+                    # waits for it to commit); answer with its result.
+                    db.session.rollback()
+                    return OrderController._replay(user_id, idempotency_key)
+
+            new_order = Order(
+                user_id=user_id,
+                total_price=from_cents(total_cents),
+                status="Pending",
+                changed_at=datetime.utcnow(),
+            )
+            db.session.add(new_order)
+            db.session.flush()  # Get the order ID for the line items
+            if claim is not None:
+                claim.order_id = new_order.id
+
+            for line in lines:
+                line["order_id"] = new_order.id
+            if bulk and lines:
+                db.session.execute(insert(OrderItem), lines)
+            else:
+                db.session.add_all(OrderItem(**line) for line in lines)
 
-            new_order.total_price = total_price
+            order_id = new_order.id  # read before commit expires it
             db.session.commit()
-            return True, f"Order #{new_order.id} placed successfully.", new_order
+            StatusEvents.publish(order_id, "Pending", user_id=user_id)
+            new_order.estimated_ready_at = OrderController._estimate_ready_at(order_id)
+            return True, f"Order #{order_id} placed successfully.", new_order
         except Exception as e:
             db.session.rollback()
             return False, f"Error placing order: {str(e)}", None
+
+    @staticmethod
+    def _estimate_ready_at(order_id):
+        """ETA for an order that was just committed; None if unavailable."""
+        try:
+            estimate = WaitTimeEstimator.estimate(placed_order_id=order_id)
+            return datetime.utcnow() + timedelta(seconds=estimate["wait_seconds"])
+        except Exception as e:
+            current_app.logger.warning("Could not estimate ready time: %s", e)
+            return None
+
+    @staticmethod
+    def checkout(user_id, cart, idempotency_key=None, key_checked=False):
+        """Prices ``cart`` ({item_id: quantity}) from the menu and places it.
+
+        Client-side prices and names are never trusted; unknown or unavailable
+        items reject the whole order. A repeated ``idempotency_key`` returns
+        the original order without writing to orders or order_items. Pass
+        ``key_checked`` when replay_existing() already found nothing for it.
+        """
+        if idempotency_key and not key_checked:
+            replayed = OrderController.replay_existing(user_id, idempotency_key)
+            if replayed is not None:
+                return replayed
+
+        success, msg, priced = PricingEngine.price_cart(cart)
+        if not success:
+            return False, msg, None
+        item_data = [
+            (item_id, from_cents(unit_cents), quantity, name)
+            for item_id, unit_cents, quantity, name in priced["lines"]
+        ]
+        return OrderController.create_new_order(
+            user_id, item_data, idempotency_key=idempotency_key
+        )
+
+    @staticmethod
+    def replay_existing(user_id, idempotency_key):
+        """
+        The result of the order already placed under ``idempotency_key``, or
+        None if the key has not been used (or has expired).
+        """
+        claim = OrderController._find_claim(user_id, idempotency_key)
+        if claim is None:
+            return None
+        return OrderController._replay(user_id, idempotency_key, claim)
+
+    @staticmethod
+    def _find_claim(user_id, idempotency_key):
+        """Returns the live claim for a key, dropping it if it has expired."""
+        claim = db.session.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == idempotency_key,
+            )
+        ).scalar_one_or_none()
+        if claim is not None and claim.created_at < OrderController._key_cutoff():
+            db.session.delete(claim)
+            db.session.commit()
+            return None
+        return claim
+
+    @staticmethod
+    def _replay(user_id, idempotency_key, claim=None):
+        """Returns the result of the order already placed under a key."""
+        if claim is None:
+            claim = OrderController._find_claim(user_id, idempotency_key)
+        order = db.session.get(Order, claim.order_id) if claim else None
+        if order is None:
+            return False, "This order has already been submitted.", None
+        return True, f"Order #{order.id} placed successfully.", order
+
+    @staticmethod
+    def _key_cutoff():
+        ttl = current_app.config.get("IDEMPOTENCY_KEY_TTL", 86400)
+        return datetime.utcnow() - timedelta(seconds=ttl)
+
+    @staticmethod
+    def purge_idempotency_keys():
+        """Deletes idempotency keys older than IDEMPOTENCY_KEY_TTL.
+
+        Returns:
+            int: Number of keys removed.
+        """
+        result = db.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.created_at < OrderController._key_cutoff()
+            )
+        )
+        db.session.commit()
+        return result.rowcount
@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"
+
+
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when every hashing slot is taken."""
+
+
+class PasswordHasher:
+    """
+    Password hashing on a bounded process pool.
+
+    scrypt is deliberately CPU-heavy, so with PASSWORD_HASH_WORKERS > 0 hashes
+    run in that many worker processes instead of on request threads. At most
+    PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE hashes may be running or
+    waiting per process; beyond that PasswordHasherBusy is raised at once.
+    With 0 workers (the test default) hashing stays inline. Every app worker
+    has its own pool, so the host runs PASSWORD_HASH_WORKERS times
+    GUNICORN_WORKERS hashing processes.
+
+    New hashes use PASSWORD_HASH_METHOD, a full werkzeug method string such as
+    ``scrypt:32768:8:1`` or ``pbkdf2:sha256:600000``; needs_rehash() tells the
+    login path when a stored hash was made with other parameters.
+    """
+
+    _lock = threading.Lock()
+    _pool = None
+    _pool_key = None  # (pid, workers, queue) the pool and slots were made for
+    _slots = None
+
+    @staticmethod
+    def _config(name, default):
+        if has_app_context():
+            return current_app.config.get(name, default)
+        return default
+
+    @staticmethod
+    def method():
+        return PasswordHasher._config("PASSWORD_HASH_METHOD", DEFAULT_METHOD)
+
+    @staticmethod
+    def _executor(workers):
+        queue = PasswordHasher._config("PASSWORD_HASH_QUEUE", 0)
+        key = (os.getpid(), workers, queue)
+        with PasswordHasher._lock:
+            if PasswordHasher._pool_key != key:
+                if PasswordHasher._pool_key and PasswordHasher._pool_key[0] == key[0]:
+                    PasswordHasher._pool.shutdown(wait=False)
+                # Spawned, not forked: request threads must not be cloned.
+                PasswordHasher._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                # Made with the pool, so hashes in flight keep releasing the
+                # semaphore they acquired.
+                PasswordHasher._slots = threading.BoundedSemaphore(workers + queue)
+                PasswordHasher._pool_key = key
+            return PasswordHasher._pool, PasswordHasher._slots
+
+    @staticmethod
+    def _run(fn, *args):
+        workers = PasswordHasher._config("PASSWORD_HASH_WORKERS", 0)
+        if not workers:
+            return fn(*args)
+        pool, slots = PasswordHasher._executor(workers)
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            return pool.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    @staticmethod
+    def hash(password):
+        """Hashes ``password`` with PASSWORD_HASH_METHOD."""
+        return PasswordHasher._run(
+            generate_password_hash, password, PasswordHasher.method()
+        )
+
+    @staticmethod
+    def verify(stored_hash, password):
+        """Checks ``password`` against a stored werkzeug hash."""
+        return PasswordHasher._run(check_password_hash, stored_hash, password)
+
+    @staticmethod
+    def needs_rehash(stored_hash):
+        """True if ``stored_hash`` was not made with PASSWORD_HASH_METHOD."""
+        return stored_hash.split("$", 1)[0] != PasswordHasher.method()
+
+    @staticmethod
+    def shutdown():
+        """Stops the worker processes (they are restarted on next use)."""
+        with PasswordHasher._lock:
+            if PasswordHasher._pool is not None:
+                PasswordHasher._pool.shutdown()
+            PasswordHasher._pool = PasswordHasher._pool_key = None
+            PasswordHasher._slots = None
@@ -0,0 +1,277 @@
+import math
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from models.order import Order
+from models.order_status_event import OrderStatusEvent
+from database.db import db
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmic buckets, so any quantile is returned
+    within ``relative_accuracy`` of the true value while memory grows with the
+    log of the value range (a few hundred buckets for seconds-to-days), not
+    with the number of samples. Adding a value is O(1).
+    """
+
+    MIN_VALUE = 1e-3
+
+    def __init__(self, relative_accuracy=0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        if value < self.MIN_VALUE:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+        self.count += 1
+
+    def merge(self, other):
+        """Adds every value counted by ``other`` (same accuracy) into this one."""
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1), or None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(key-1), gamma^key].
+                return 2 * self.gamma**key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class PrepTimeStats:
+    """
+    Per-hour p50/p90/p99 time-in-state, folded in from order_status_events.
+
+    Each worker keeps sketches keyed by (hour, state) in app.extensions and
+    catches up with ``refresh()``, which only reads events newer than the last
+    one it folded in. A request therefore touches the handful of new events,
+    never the history; a cold worker reads just the PREP_STATS_WINDOW_HOURS
+    window once, in warm_up() or on the thread warm_in_background() starts.
+
+    Event ids are allocated before commit, so a lower id can become visible
+    after a higher one. refresh() only folds events older than
+    PREP_STATS_SETTLE_SECONDS and stops at the first younger one, so the id
+    watermark never passes an event that may still be committing.
+    """
+
+    QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+    BATCH_SIZE = 5000
+
+    class _State:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.watermark = None  # id of the last event folded in
+            self.sketches = {}  # (hour, state) -> QuantileSketch
+            self.entered_at = {}  # order_id -> when it entered its status
+            self.typical = {}  # state -> median seconds over the window
+            self.warm = False  # the window has been read once
+            self.warming = False  # warm_in_background() thread running
+
+    @staticmethod
+    def _state():
+        state = current_app.extensions.get("prep_time_stats")
+        if state is None:
+            state = current_app.extensions.setdefault(
+                "prep_time_stats", PrepTimeStats._State()
+            )
+        return state
+
+    @staticmethod
+    def _window_start():
+        hours = current_app.config.get("PREP_STATS_WINDOW_HOURS", 48)
+        return (datetime.utcnow() - timedelta(hours=hours)).replace(
+            minute=0, second=0, microsecond=0
+        )
+
+    @staticmethod
+    def _entry_times(order_ids, before_event_id):
+        """When each order entered its current status, as of an event id."""
+        rows = db.session.execute(
+            select(OrderStatusEvent.order_id, func.max(OrderStatusEvent.changed_at))
+            .where(
+                OrderStatusEvent.order_id.in_(order_ids),
+                OrderStatusEvent.id <= before_event_id,
+            )
+            .group_by(OrderStatusEvent.order_id)
+        ).all()
+        entered = dict(rows)
+        missing = [order_id for order_id in order_ids if order_id not in entered]
+        if missing:
+            entered.update(
+                db.session.execute(
+                    select(Order.id, Order.ordered_at).where(Order.id.in_(missing))
+                ).all()
+            )
+        return entered
+
+    @staticmethod
+    def _fold(state, events):
+        unknown = {e.order_id for e in events} - state.entered_at.keys()
+        if unknown:
+            state.entered_at.update(
+                PrepTimeStats._entry_times(list(unknown), events[0].id - 1)
+            )
+        for event in events:
+            entered = state.entered_at.get(event.order_id)
+            if entered is not None:
+                hour = event.changed_at.replace(minute=0, second=0, microsecond=0)
+                key = (hour, event.from_status)
+                sketch = state.sketches.get(key)
+                if sketch is None:
+                    sketch = state.sketches[key] = QuantileSketch()
+                sketch.add((event.changed_at - entered).total_seconds())
+            if event.to_status in ("Delivered", "Cancelled"):
+                state.entered_at.pop(event.order_id, None)
+            else:
+                state.entered_at[event.order_id] = event.changed_at
+
+    @staticmethod
+    def refresh():
+        """Folds in events written since the last refresh. Returns the count."""
+        state = PrepTimeStats._state()
+        with state.lock:
+            window_start = PrepTimeStats._window_start()
+            settle = current_app.config.get("PREP_STATS_SETTLE_SECONDS", 5)
+            settled_before = datetime.utcnow() - timedelta(seconds=settle)
+            folded = 0
+            while True:
+                query = select(OrderStatusEvent).order_by(OrderStatusEvent.id)
+                if state.watermark is None:
+                    query = query.where(OrderStatusEvent.changed_at >= window_start)
+                else:
+                    query = query.where(OrderStatusEvent.id > state.watermark)
+                events = (
+                    db.session.execute(query.limit(PrepTimeStats.BATCH_SIZE))
+                    .scalars()
+                    .all()
+                )
+                young = next(
+                    (i for i, e in enumerate(events) if e.changed_at > settled_before),
+                    None,
+                )
+                settled = events if young is None else events[:young]
+                if settled:
+                    PrepTimeStats._fold(state, settled)
+                    state.watermark = settled[-1].id
+                    folded += len(settled)
+                if young is not None or not events:
+                    break
+            if state.watermark is None:
+                # Nothing settled in the window yet: start after what is older.
+                state.watermark = (
+                    db.session.execute(
+                        select(func.max(OrderStatusEvent.id)).where(
+                            OrderStatusEvent.changed_at < window_start
+                        )
+                    ).scalar()
+                    or 0
+                )
+            expired = [k for k in state.sketches if k[0] < window_start]
+            for key in expired:
+                del state.sketches[key]
+            if folded or expired:
+                PrepTimeStats._update_typical(state)
+            state.warm = True
+            return folded
+
+    @staticmethod
+    def is_warm():
+        """True once this worker has read the stats window."""
+        return PrepTimeStats._state().warm
+
+    @staticmethod
+    def warm_in_background():
+        """
+        Starts the cold read of the stats window on a daemon thread, once, so
+        the request that first needs the stats does not wait for it.
+        """
+        state = PrepTimeStats._state()
+        with state.lock:
+            if state.warm or state.warming:
+                return
+            state.warming = True
+        app = current_app._get_current_object()
+
+        def warm():
+            with app.app_context():
+                try:
+                    PrepTimeStats.refresh()
+                except Exception as e:
+                    app.logger.warning("Could not warm prep-time stats: %s", e)
+                finally:
+                    state.warming = False
+                    db.session.remove()
+
+        threading.Thread(target=warm, name="prep-stats-warm", daemon=True).start()
+
+    @staticmethod
+    def _update_typical(state):
+        merged = {}
+        for (_, status), sketch in state.sketches.items():
+            merged.setdefault(status, QuantileSketch()).merge(sketch)
+        state.typical = {
+            status: sketch.quantile(0.5) for status, sketch in merged.items()
+        }
+
+    @staticmethod
+    def typical_seconds(refresh=True):
+        """
+        Median seconds spent in each status over the stats window.
+
+        Kept up to date by refresh(), so reading it is a dict copy.
+        """
+        if refresh:
+            PrepTimeStats.refresh()
+        return dict(PrepTimeStats._state().typical)
+
+    @staticmethod
+    def get_hourly(hours=24):
+        """
+        Returns time-in-state percentiles for the last ``hours`` hours.
+
+        Returns:
+            tuple: (success, message, rows) where rows are dicts
+                {"hour": iso, "states": {state: {"count", "p50", "p90",
+                "p99"}}} with durations in seconds, newest hour first.
+        """
+        try:
+            PrepTimeStats.refresh()
+            state = PrepTimeStats._state()
+            since = datetime.utcnow().replace(
+                minute=0, second=0, microsecond=0
+            ) - timedelta(hours=hours - 1)
+            by_hour = {}
+            for (hour, status), sketch in state.sketches.items():
+                if hour < since:
+                    continue
+                summary = {"count": sketch.count}
+                for name, q in PrepTimeStats.QUANTILES.items():
+                    summary[name] = round(sketch.quantile(q), 1)
+                by_hour.setdefault(hour, {})[status] = summary
+            rows = [
+                {"hour": hour.isoformat(), "states": by_hour[hour]}
+                for hour in sorted(by_hour, reverse=True)
+            ]
+            return True, "Prep times retrieved.", rows
+        except Exception as e:
+            return False, f"Error computing prep times: {str(e)}", None
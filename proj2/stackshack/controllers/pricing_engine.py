@@ -0,0 +1,106 @@
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import select
+from controllers.menu_catalog import MenuCatalog
+from models.menu_item import MenuItem
+from database.db import db
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value):
+    """Converts a price (str, float or Decimal) to integer cents."""
+    return int(Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents):
+    """Converts integer cents back to a two-place Decimal."""
+    return (Decimal(cents) / 100).quantize(CENT)
+
+
+class PricingEngine:
+    """
+    Prices a cart from the menu, never from what the client submitted.
+
+    A cart is a mapping (or list of pairs) of menu item id -> quantity.
+    Prices, names and availability for every id are resolved at once, either
+    with a single ``IN (...)`` query or from the MenuCatalog snapshot, and
+    totals are summed in integer cents so they never pick up float error.
+    """
+
+    @staticmethod
+    def normalize_cart(cart):
+        """
+        Merges a cart into {item_id: quantity}, dropping non-positive lines.
+
+        Raises:
+            ValueError: If an id or quantity is not an integer.
+        """
+        pairs = cart.items() if isinstance(cart, dict) else cart
+        quantities = {}
+        for item_id, quantity in pairs:
+            item_id, quantity = int(item_id), int(quantity)
+            if quantity > 0:
+                quantities[item_id] = quantities.get(item_id, 0) + quantity
+        return quantities
+
+    @staticmethod
+    def _resolve_from_db(item_ids):
+        rows = db.session.execute(
+            select(
+                MenuItem.id, MenuItem.name, MenuItem.price, MenuItem.is_available
+            ).where(MenuItem.id.in_(item_ids))
+        ).all()
+        return {row.id: row for row in rows}
+
+    @staticmethod
+    def _resolve_from_catalog(item_ids):
+        by_id = MenuCatalog.get().by_id
+        return {item_id: by_id[item_id] for item_id in item_ids if item_id in by_id}
+
+    @staticmethod
+    def price_cart(cart, use_catalog=False):
+        """
+        Resolves and prices a cart.
+
+        Args:
+            cart: {item_id: quantity} or an iterable of (item_id, quantity).
+            use_catalog (bool): Read the cached MenuCatalog snapshot instead of
+                querying menu_items. Faster, but may lag a menu change by up to
+                MENU_VERSION_CHECK_INTERVAL seconds.
+
+        Returns:
+            tuple: (success, message, data) where data is
+                {"lines": [(item_id, unit_cents, quantity, name), ...],
+                 "total_cents": int}.
+        """
+        try:
+            quantities = PricingEngine.normalize_cart(cart)
+        except (TypeError, ValueError):
+            return False, "Invalid item or quantity in order.", None
+        if not quantities:
+            return False, "Order cannot be empty.", None
+
+        resolve = (
+            PricingEngine._resolve_from_catalog
+            if use_catalog
+            else PricingEngine._resolve_from_db
+        )
+        menu = resolve(list(quantities))
+
+        lines = []
+        total_cents = 0
+        for item_id, quantity in quantities.items():
+            item = menu.get(item_id)
+            if item is None:
+                return False, f"Item #{item_id} is no longer on the menu.", None
+            if not item.is_available:
+                return False, f"{item.name} is currently unavailable.", None
+            unit_cents = to_cents(item.price)
+            lines.append((item_id, unit_cents, quantity, item.name))
+            total_cents += unit_cents * quantity
+
+        return (
+            True,
+            "Cart priced successfully",
+            {"lines": lines, "total_cents": total_cents},
+        )
@@ -1,6 +1,17 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, case, insert, or_, select, union_all, update
+from sqlalchemy.orm import selectinload
+from controllers.identity_cache import STAFF_ROLES, IdentityCache
+from controllers.status_events import StatusEvents
 from models.order import Order
-from models.user import User
+from models.order_status_event import OrderStatusEvent
 from database.db import db
+from database.routing import read_only
+
+# Result of a successful transition; ``status`` is the new status.
+StatusChange = namedtuple("StatusChange", ["id", "previous_status", "status"])
 
 
 class StatusController:
@@ -11,6 +22,16 @@ class StatusController:
         "Delivered": None,
         "Cancelled": None,
     }
+    ACTIVE_STATUSES = ["Pending", "Preparing", "Ready for Pickup"]
+    # Failure reasons returned as ``data`` by update_order_status.
+    NOT_FOUND = "not_found"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+    BULK_ACTIONS = ("advance", "cancel")
+    MAX_BULK_ORDERS = 200
+    CHANGES_PAGE_SIZE = 100
+    STAFF_PAGE_SIZE = 50
+    MAX_STAFF_PAGE_SIZE = 200
 
     @staticmethod
     def get_status_flow():
@@ -53,60 +74,331 @@ class StatusController:
             },
         }
 
+    @staticmethod
+    def _log_transitions(transitions):
+        """Appends (order_id, from_status, to_status) rows to the event log."""
+        now = datetime.utcnow()
+        db.session.execute(
+            insert(OrderStatusEvent),
+            [
+                {
+                    "order_id": order_id,
+                    "from_status": from_status,
+                    "to_status": to_status,
+                    "changed_at": now,
+                }
+                for order_id, from_status, to_status in transitions
+            ],
+        )
+
+    @staticmethod
+    def previous_status(new_status):
+        """Returns the only status that may move to ``new_status``, or None."""
+        for status, next_status in StatusController.STATUS_FLOW.items():
+            if next_status is not None and next_status == new_status:
+                return status
+        return None
+
     @staticmethod
     def update_order_status(order_id, new_status):
-        """Updates the status of an order if the transition is valid."""
+        """
+        Moves an order to ``new_status`` with one compare-and-swap UPDATE.
+
+        The flow is linear, so the expected current status is implied by the
+        target; ``UPDATE ... WHERE id = ? AND status = ?`` either moves the row
+        or matches nothing, and two staff racing on the same order cannot both
+        win. Only a failed swap reads the row back, to explain why. The swap
+        also stamps ``changed_at`` for the /status/changes delta sync.
+
+        Returns:
+            tuple: (True, message, StatusChange) on success. The StatusChange
+                (id, previous_status, status) replaces the Order this used to
+                return; the row is not loaded, so load it if more is needed.
+                On failure (False, message, reason), where reason is NOT_FOUND,
+                CONFLICT (another request applied this transition first) or
+                INVALID, and None only for unexpected errors.
+        """
         try:
-            order = Order.query.filter_by(id=order_id).first()
-            if not order:
-                return False, "Order not found.", None
+            expected = StatusController.previous_status(new_status)
+            if expected is not None:
+                result = db.session.execute(
+                    update(Order)
+                    .where(Order.id == order_id, Order.status == expected)
+                    .values(status=new_status, changed_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    StatusController._log_transitions(
+                        [(order_id, expected, new_status)]
+                    )
+                db.session.commit()
+                if result.rowcount == 1:
+                    StatusEvents.publish(order_id, new_status, expected)
+                    return (
+                        True,
+                        f"Order status updated to {new_status}.",
+                        StatusChange(order_id, expected, new_status),
+                    )
+
+            current_status = db.session.execute(
+                select(Order.status).where(Order.id == order_id)
+            ).scalar()
+            return StatusController._explain_failed_update(
+                current_status, new_status, expected
+            )
+        except Exception as e:
+            db.session.rollback()
+            return False, f"Error updating order status: {str(e)}", None
+
+    @staticmethod
+    def _explain_failed_update(current_status, new_status, expected):
+        if current_status is None:
+            return False, "Order not found.", StatusController.NOT_FOUND
+        if current_status == "Cancelled":
+            return False, "Cannot update a cancelled order.", StatusController.INVALID
+        if current_status == "Delivered":
+            return False, "Cannot update a delivered order.", StatusController.INVALID
+        if expected is not None and current_status == new_status:
+            # Someone else applied the same transition first. A target with no
+            # predecessor (e.g. Pending -> Pending) is a plain invalid request.
+            return (
+                False,
+                f"Order is already {new_status}.",
+                StatusController.CONFLICT,
+            )
+        return (
+            False,
+            f"Invalid status transition from {current_status} to {new_status}.",
+            StatusController.INVALID,
+        )
 
-            current_status = order.status
+    @staticmethod
+    def _bulk_target(action, current_status):
+        """Status an order in ``current_status`` moves to, or None."""
+        if action == "cancel":
+            return (
+                "Cancelled"
+                if current_status in StatusController.ACTIVE_STATUSES
+                else None
+            )
+        return StatusController.STATUS_FLOW.get(current_status)
 
-            if current_status == "Cancelled":
-                return False, "Cannot update a cancelled order.", None
+    @staticmethod
+    def _apply_moves(moves):
+        """
+        Moves every order in ``moves`` ({id: (expected, target)}) with one
+        UPDATE and returns the ids it moved.
 
-            if current_status == "Delivered":
-                return False, "Cannot update a delivered order.", None
+        Both CASE expressions are keyed on the order id, so each row only
+        matches while it is still in the status it was read in; an order that
+        changed in between is left alone without affecting the others.
+        """
+        expected = {order_id: previous for order_id, (previous, _) in moves.items()}
+        targets = {order_id: target for order_id, (_, target) in moves.items()}
+        stmt = (
+            update(Order)
+            .where(
+                Order.id.in_(list(moves)),
+                Order.status == case(expected, value=Order.id),
+            )
+            .values(
+                status=case(targets, value=Order.id),
+                changed_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if db.session.get_bind().dialect.update_returning:
+            return set(db.session.execute(stmt.returning(Order.id)).scalars())
+        # No RETURNING (MySQL): the rows were read FOR UPDATE, so every one
+        # of them is still in its expected status.
+        db.session.execute(stmt)
+        return set(moves)
 
-            valid_next_status = StatusController.STATUS_FLOW.get(current_status)
-            if new_status != valid_next_status:
-                return (
-                    False,
-                    f"Invalid status transition from {current_status} to {new_status}.",
-                    None,
+    @staticmethod
+    def bulk_update_status(order_ids, action, expected_status=None):
+        """
+        Advances or cancels many orders in one transaction.
+
+        The orders are read once with a row lock, then every eligible order is
+        moved by a single set-based UPDATE (see _apply_moves). Like
+        update_order_status, each row only moves from the status it was read
+        in; one that changed in between is reported as CONFLICT.
+
+        Args:
+            order_ids (list): Order ids to change.
+            action (str): "advance" (one step along STATUS_FLOW) or "cancel".
+            expected_status (str, optional): Only touch orders currently in
+                this status; others are reported as CONFLICT.
+
+        Returns:
+            tuple: (success, message, outcomes) where outcomes has one dict per
+                id: {"id", "success", "status", "message", "reason"}.
+        """
+        if action not in StatusController.BULK_ACTIONS:
+            return False, f"Unknown bulk action: {action}.", None
+        try:
+            ids = list(dict.fromkeys(int(order_id) for order_id in order_ids))
+        except (TypeError, ValueError):
+            return False, "Order ids must be integers.", None
+        if not ids:
+            return False, "No orders selected.", None
+        if len(ids) > StatusController.MAX_BULK_ORDERS:
+            return (
+                False,
+                f"At most {StatusController.MAX_BULK_ORDERS} orders per request.",
+                None,
+            )
+
+        try:
+            current = dict(
+                db.session.execute(
+                    select(Order.id, Order.status)
+                    .where(Order.id.in_(ids))
+                    .with_for_update()
+                ).all()
+            )
+
+            outcomes = []
+            moves = {}
+            for order_id in ids:
+                status = current.get(order_id)
+                target = StatusController._bulk_target(action, status)
+                if status is None:
+                    msg, reason = "Order not found.", StatusController.NOT_FOUND
+                elif expected_status and status != expected_status:
+                    msg, reason = f"Order is now {status}.", StatusController.CONFLICT
+                elif target is None:
+                    msg = f"Cannot {action} an order that is {status.lower()}."
+                    reason = StatusController.INVALID
+                else:
+                    moves[order_id] = (status, target)
+                    status = target
+                    msg, reason = f"Order status updated to {target}.", None
+                outcomes.append(
+                    {
+                        "id": order_id,
+                        "success": reason is None,
+                        "status": status,
+                        "message": msg,
+                        "reason": reason,
+                    }
                 )
 
-            order.status = new_status
+            if moves:
+                moved = StatusController._apply_moves(moves)
+                lost = [order_id for order_id in moves if order_id not in moved]
+                if lost:
+                    # Changed by another request after the read; fail only those.
+                    latest = dict(
+                        db.session.execute(
+                            select(Order.id, Order.status).where(Order.id.in_(lost))
+                        ).all()
+                    )
+                    for outcome in outcomes:
+                        if outcome["id"] in latest:
+                            status = latest[outcome["id"]]
+                            del moves[outcome["id"]]
+                            outcome.update(
+                                success=False,
+                                status=status,
+                                message=f"Order is now {status}.",
+                                reason=StatusController.CONFLICT,
+                            )
+                if moves:
+                    StatusController._log_transitions(
+                        (order_id, previous, target)
+                        for order_id, (previous, target) in moves.items()
+                    )
             db.session.commit()
-            return True, f"Order status updated to {new_status}.", order
+            for order_id, (previous, target) in moves.items():
+                StatusEvents.publish(order_id, target, previous)
+            return (
+                True,
+                f"Updated {len(moves)} of {len(ids)} orders.",
+                outcomes,
+            )
         except Exception as e:
             db.session.rollback()
-            return False, f"Error updating order status: {str(e)}", None
+            return False, f"Error updating orders: {str(e)}", None
+
+    @staticmethod
+    def _owned_status(order_id, user_id):
+        """Current status of the user's order, or None if it is not theirs."""
+        return db.session.execute(
+            select(Order.status).where(Order.id == order_id, Order.user_id == user_id)
+        ).scalar()
 
     @staticmethod
     def cancel_order(order_id, user_id):
-        """Cancels an order if it hasn't been delivered yet."""
+        """
+        Cancels an order if it hasn't been delivered yet.
+
+        Like update_order_status this is a compare-and-swap: ``UPDATE ... WHERE
+        id = ? AND user_id = ? AND status = ?`` with the cancellable status just
+        read, decided by ``rowcount``. If the kitchen moved the order in
+        between, the swap matches nothing and is retried from the new status,
+        so a delivered order is never cancelled and the logged transition is
+        the real one. The flow is linear, so a few retries always settle it.
+
+        Returns:
+            tuple: (True, message, StatusChange) on success, else
+                (False, message, None).
+        """
         try:
-            order = Order.query.filter_by(id=order_id, user_id=user_id).first()
-            if not order:
-                return False, "Order not found.", None
+            for _ in range(len(StatusController.ACTIVE_STATUSES) + 1):
+                previous = StatusController._owned_status(order_id, user_id)
+                if previous is None:
+                    return False, "Order not found.", None
+                if previous not in StatusController.ACTIVE_STATUSES:
+                    return (
+                        False,
+                        f"Cannot cancel an order that is {previous.lower()}.",
+                        None,
+                    )
 
-            if order.status in ["Delivered", "Cancelled"]:
-                return (
-                    False,
-                    f"Cannot cancel an order that is {order.status.lower()}.",
-                    None,
+                result = db.session.execute(
+                    update(Order)
+                    .where(
+                        Order.id == order_id,
+                        Order.user_id == user_id,
+                        Order.status == previous,
+                    )
+                    .values(status="Cancelled", changed_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
                 )
-
-            order.status = "Cancelled"
-            db.session.commit()
-            return True, "Order cancelled successfully.", order
+                if result.rowcount == 1:
+                    StatusController._log_transitions(
+                        [(order_id, previous, "Cancelled")]
+                    )
+                    db.session.commit()
+                    StatusEvents.publish(order_id, "Cancelled", previous)
+                    return (
+                        True,
+                        "Order cancelled successfully.",
+                        StatusChange(order_id, previous, "Cancelled"),
+                    )
+                # End the transaction so the next read sees the new status.
+                db.session.rollback()
+            return False, "Order is changing too quickly; try again.", None
         except Exception as e:
             db.session.rollback()
             return False, f"Error cancelling order: {str(e)}", None
 
     @staticmethod
+    @read_only
+    def get_active_order_ids(user_id):
+        """Ids of the user's orders that can still change status."""
+        return list(
+            db.session.execute(
+                select(Order.id).where(
+                    Order.user_id == user_id,
+                    Order.status.in_(StatusController.ACTIVE_STATUSES),
+                )
+            ).scalars()
+        )
+
+    @staticmethod
+    @read_only
     def get_order_by_id(order_id, user_id):
         """Retrieves an order by ID, checking ownership."""
         try:
@@ -118,21 +410,242 @@ class StatusController:
             return False, f"Error retrieving order: {str(e)}", None
 
     @staticmethod
-    def get_all_orders_for_staff():
-        """Retrieves all orders for staff/admin management."""
+    @read_only
+    def get_all_orders_for_staff(with_items=False):
+        """Retrieves all orders for staff/admin management.
+
+        ``with_items`` preloads ``Order.line_items`` in a single extra query.
+        """
         try:
-            orders = Order.query.order_by(Order.ordered_at.desc()).all()
+            query = Order.query
+            if with_items:
+                query = query.options(selectinload(Order.line_items))
+            orders = query.order_by(Order.ordered_at.desc()).all()
             return True, "All orders retrieved successfully.", orders
         except Exception as e:
             return False, f"Error retrieving orders: {str(e)}", None
 
+    @staticmethod
+    def encode_cursor(order):
+        """Builds the opaque keyset cursor pointing just after ``order``."""
+        return f"{order.ordered_at.isoformat()}_{order.id}"
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Parses a cursor from encode_cursor into (timestamp, id)."""
+        at, _, order_id = cursor.rpartition("_")
+        return datetime.fromisoformat(at), int(order_id)
+
+    @staticmethod
+    def _change_cursor(position):
+        changed_at, order_id = position
+        return f"{changed_at.isoformat()}_{order_id}"
+
+    @staticmethod
+    def get_order_changes(since=None, user_id=None, limit=None, with_items=False):
+        """Orders created or changed after ``since``, oldest change first.
+
+        ``since`` is the ``cursor`` returned by the previous call, in the form
+        "<changed_at>_<id>"; each poll is a range scan of ix_orders_changed_at.
+        ``changed_at`` is stamped before commit, so a change can become visible
+        after a later one was already served. Each poll therefore also returns
+        the orders changed up to ORDER_CHANGES_OVERLAP seconds before the
+        cursor again; clients must treat a repeated order as an update. Once a
+        window is older than the overlap, cursors move past it.
+
+        Without ``since`` no orders are returned, only the current head cursor
+        to start polling from. ``user_id`` limits results to one customer.
+        Reads the primary: the overlap only covers commit order, not replica
+        lag, and a cursor served from a lagging replica would skip changes.
+
+        Returns:
+            tuple: (success, message, data) where data is a dict with
+            ``orders``, ``cursor`` (pass back as ``since``) and ``has_more``.
+        """
+        if limit is None:
+            limit = StatusController.CHANGES_PAGE_SIZE
+        limit = max(1, min(int(limit), StatusController.MAX_STAFF_PAGE_SIZE))
+        overlap = timedelta(seconds=current_app.config.get("ORDER_CHANGES_OVERLAP", 5))
+        # Anything stamped before this has committed (and been served) by now.
+        settled = (datetime.utcnow() - overlap, 0)
+
+        try:
+            query = Order.query.filter(Order.changed_at.isnot(None))
+            if user_id is not None:
+                query = query.filter(Order.user_id == user_id)
+            ordering = (Order.changed_at, Order.id)
+
+            if since is None:
+                head = query.order_by(Order.changed_at.desc(), Order.id.desc()).first()
+                position = max((head.changed_at, head.id) if head else settled, settled)
+                return (
+                    True,
+                    "Change cursor retrieved.",
+                    {
+                        "orders": [],
+                        "cursor": StatusController._change_cursor(position),
+                        "has_more": False,
+                    },
+                )
+
+            try:
+                position = StatusController.decode_cursor(since)
+            except ValueError:
+                return False, "Invalid change cursor.", None
+            since_at, since_id = position
+
+            if with_items:
+                query = query.options(selectinload(Order.line_items))
+            after_cursor = or_(
+                Order.changed_at > since_at,
+                and_(Order.changed_at == since_at, Order.id > since_id),
+            )
+            again = []
+            if overlap:
+                again = (
+                    query.filter(
+                        Order.changed_at >= since_at - overlap,
+                        Order.changed_at <= since_at,
+                        ~after_cursor,
+                    )
+                    .order_by(*ordering)
+                    .all()
+                )
+            rows = query.filter(after_cursor).order_by(*ordering).limit(limit + 1).all()
+            orders = rows[:limit]
+            has_more = len(rows) > limit
+            if orders:
+                position = (orders[-1].changed_at, orders[-1].id)
+            if not has_more:
+                position = max(position, settled)
+            return (
+                True,
+                "Changes retrieved.",
+                {
+                    "orders": again + orders,
+                    "cursor": StatusController._change_cursor(position),
+                    "has_more": has_more,
+                },
+            )
+        except Exception as e:
+            return False, f"Error retrieving changes: {str(e)}", None
+
+    @staticmethod
+    @read_only
+    def get_staff_orders_page(
+        statuses=None,
+        since=None,
+        until=None,
+        cursor=None,
+        limit=None,
+        with_items=False,
+    ):
+        """Retrieves one page of the staff order board, newest first.
+
+        Pages are keyset-paginated on (ordered_at, id): ``cursor`` is the
+        ``next_cursor`` of the previous page, so each page is a bounded range
+        read no matter how many orders came before it. ``statuses`` defaults to
+        the active queue, ``since`` is inclusive and ``until`` exclusive.
+
+        Every filter shape reads at most ``limit`` + 1 rows per status from an
+        index already in board order: ix_orders_ordered_at_id without a status
+        filter, ix_orders_status_ordered_at_id for one status, and one range
+        of it per status, merged here, for several (see _newest_ids).
+
+        Returns:
+            tuple: (success, message, page) where page is a dict with
+            ``orders`` and ``next_cursor`` (None on the last page).
+        """
+        if statuses is None:
+            statuses = StatusController.ACTIVE_STATUSES
+        statuses = list(dict.fromkeys(statuses))
+        if limit is None:
+            limit = StatusController.STAFF_PAGE_SIZE
+        limit = max(1, min(int(limit), StatusController.MAX_STAFF_PAGE_SIZE))
+
+        try:
+            filters = []
+            if since is not None:
+                filters.append(Order.ordered_at >= since)
+            if until is not None:
+                filters.append(Order.ordered_at < until)
+            if cursor:
+                try:
+                    cursor_at, cursor_id = StatusController.decode_cursor(cursor)
+                except ValueError:
+                    return False, "Invalid page cursor.", None
+                # The plain bound lets the index seek to the cursor; the OR
+                # alone would make it walk every newer row first.
+                filters.append(Order.ordered_at <= cursor_at)
+                filters.append(
+                    or_(
+                        Order.ordered_at < cursor_at,
+                        and_(Order.ordered_at == cursor_at, Order.id < cursor_id),
+                    )
+                )
+
+            # Fetch one extra row to learn whether another page exists.
+            if len(statuses) > 1:
+                ids = StatusController._newest_ids(statuses, filters, limit + 1)
+                query = Order.query.filter(Order.id.in_(ids))
+            else:
+                query = Order.query.filter(*filters)
+                if statuses:
+                    query = query.filter(Order.status == statuses[0])
+                query = query.order_by(*StatusController._BOARD_ORDER).limit(limit + 1)
+            if with_items:
+                query = query.options(selectinload(Order.line_items))
+            rows = query.all()
+            rows.sort(key=lambda order: (order.ordered_at, order.id), reverse=True)
+
+            orders = rows[:limit]
+            next_cursor = (
+                StatusController.encode_cursor(orders[-1])
+                if len(rows) > limit
+                else None
+            )
+            return (
+                True,
+                "Orders retrieved successfully.",
+                {"orders": orders, "next_cursor": next_cursor},
+            )
+        except Exception as e:
+            return False, f"Error retrieving orders: {str(e)}", None
+
+    _BOARD_ORDER = (Order.ordered_at.desc(), Order.id.desc())
+
+    @staticmethod
+    def _newest_ids(statuses, filters, count):
+        """
+        Ids of the ``count`` newest orders across ``statuses``.
+
+        One LIMITed range of ix_orders_status_ordered_at_id per status, sent
+        as a single UNION ALL and merged here: ``status IN (...)`` ordered by
+        time would have to read and sort every matching order instead.
+        """
+        parts = []
+        for status in statuses:
+            newest = (
+                select(Order.id, Order.ordered_at)
+                .where(Order.status == status, *filters)
+                .order_by(*StatusController._BOARD_ORDER)
+                .limit(count)
+                .subquery()
+            )
+            parts.append(select(newest.c.id, newest.c.ordered_at))
+        rows = db.session.execute(union_all(*parts)).all()
+        rows.sort(key=lambda row: (row.ordered_at, row.id), reverse=True)
+        return [row.id for row in rows[:count]]
+
     @staticmethod
     def is_staff(user_id):
-        """Checks if the user is staff or admin."""
+        """Checks if the user is staff or admin.
+
+        Routes with a logged-in user should prefer has_role(current_user,
+        *STAFF_ROLES), which needs no lookup at all.
+        """
         try:
-            user = User.query.filter_by(id=user_id).first()
-            if not user:
-                return False
-            return user.role in ["staff", "admin"]
+            identity = IdentityCache.get(user_id)
+            return identity is not None and identity.role in STAFF_ROLES
         except Exception:
             return False
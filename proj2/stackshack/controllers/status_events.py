@@ -0,0 +1,244 @@
+import fcntl
+import json
+import os
+import queue
+import threading
+import time
+from flask import current_app
+
+
+class Subscription:
+    """
+    One listener's queue of status events, optionally limited to orders.
+
+    With ``user_id`` the listener also picks up orders that user places after
+    subscribing: the placement event carries the owner's id and adds the new
+    order to ``order_ids``.
+    """
+
+    MAX_PENDING = 100
+
+    def __init__(self, broker, order_ids=None, user_id=None):
+        self.broker = broker
+        # None means every order (staff); otherwise only these ids.
+        self.order_ids = None if order_ids is None else set(order_ids)
+        self.user_id = user_id
+        self.events = queue.Queue(maxsize=self.MAX_PENDING)
+        # Set when events were dropped because the listener fell behind; the
+        # page should then reload instead of trusting its rows.
+        self.overflowed = False
+
+    def wants(self, event):
+        if self.order_ids is None or event["order_id"] in self.order_ids:
+            return True
+        if self.user_id is not None and event.get("user_id") == self.user_id:
+            self.order_ids.add(event["order_id"])
+            return True
+        return False
+
+    def offer(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Next event, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class StatusBroker:
+    """
+    In-process fan-out of order status events.
+
+    Publishing walks the subscriber list once; an idle subscriber costs one
+    blocked thread and an empty queue, never a database connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self, order_ids=None, user_id=None, limit=None):
+        """
+        A new Subscription, or None when ``limit`` subscribers are already
+        open in this process.
+        """
+        subscription = Subscription(self, order_ids, user_id)
+        with self._lock:
+            if limit and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, event):
+        self.dispatch(event)
+
+    def dispatch(self, event):
+        """Delivers ``event`` to every local subscriber that wants it."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.wants(event):
+                subscription.offer(event)
+
+
+class SpoolStatusBroker(StatusBroker):
+    """
+    Cross-process stand-in for a pub/sub server (e.g. Redis).
+
+    Every worker appends events as JSON lines to one shared spool file and
+    runs a single tail thread that feeds its local subscribers, so a status
+    change made in one gunicorn worker reaches streams held by all of them.
+
+    Once the spool passes MAX_BYTES the writer renames it to ``<path>.1``
+    (replacing the previous one) and the next event starts a fresh file.
+    Tailing workers keep the old file open, finish reading it, then follow
+    the new one from its start, so the spool never holds more than two files.
+    """
+
+    POLL_INTERVAL = 0.2
+    MAX_BYTES = 1024 * 1024
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._tail_thread = None
+        self._spool = None
+        self._poll_lock = threading.Lock()
+
+    def publish(self, event):
+        line = (json.dumps(event) + "\n").encode()
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # Writers hold the lock so a rotation never splits an append.
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if not self._is_current(fd):
+                    continue  # rotated while we waited; open the new file
+                os.write(fd, line)
+                if os.fstat(fd).st_size >= self.MAX_BYTES:
+                    os.replace(self.path, self.path + ".1")
+                return
+            finally:
+                os.close(fd)
+
+    def _is_current(self, fd):
+        """True while ``fd`` is still the file at ``self.path``."""
+        try:
+            return os.stat(self.path).st_ino == os.fstat(fd).st_ino
+        except FileNotFoundError:
+            return False
+
+    def subscribe(self, order_ids=None, user_id=None, limit=None):
+        self._ensure_tailing()
+        return super().subscribe(order_ids, user_id, limit)
+
+    def _ensure_tailing(self):
+        with self._lock:
+            if self._tail_thread is not None:
+                return
+            with self._poll_lock:
+                # Only events published from now on are of interest.
+                self._open(from_end=True)
+            self._tail_thread = threading.Thread(
+                target=self._tail, name="status-spool-tail", daemon=True
+            )
+            self._tail_thread.start()
+
+    def _open(self, from_end):
+        try:
+            self._spool = open(self.path, "rb")
+        except FileNotFoundError:
+            self._spool = None
+            return False
+        if from_end:
+            self._spool.seek(0, os.SEEK_END)
+        return True
+
+    def poll(self):
+        """Dispatches lines appended since the last poll. Returns the count."""
+        with self._poll_lock:
+            if self._spool is None and not self._open(from_end=False):
+                return 0
+            count = self._drain()
+            if not self._is_current(self._spool.fileno()) and os.path.exists(self.path):
+                # Rotated: anything written before the rename was read above.
+                count += self._drain()
+                self._spool.close()
+                if self._open(from_end=False):
+                    count += self._drain()
+            return count
+
+    def _drain(self):
+        if os.fstat(self._spool.fileno()).st_size < self._spool.tell():
+            self._spool.seek(0)  # truncated in place
+        chunk = self._spool.read()
+        # Leave a partially written last line for the next poll.
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        self._spool.seek(len(complete) - len(chunk), os.SEEK_CUR)
+        lines = complete.splitlines()
+        for line in lines:
+            self.dispatch(json.loads(line))
+        return len(lines)
+
+    def _tail(self):
+        while True:
+            try:
+                self.poll()
+            except (OSError, ValueError):
+                pass
+            time.sleep(self.POLL_INTERVAL)
+
+
+class StatusEvents:
+    """Per-app access to the status event broker."""
+
+    @staticmethod
+    def broker():
+        broker = current_app.extensions.get("status_broker")
+        if broker is None:
+            spool = current_app.config.get("STATUS_EVENTS_SPOOL")
+            broker = current_app.extensions.setdefault(
+                "status_broker", SpoolStatusBroker(spool) if spool else StatusBroker()
+            )
+        return broker
+
+    @staticmethod
+    def publish(order_id, status, previous_status=None, user_id=None):
+        """
+        Announces a committed status change. Never raises.
+
+        Pass the owner's ``user_id`` for a newly placed order so that user's
+        open streams start following it.
+        """
+        event = {
+            "order_id": order_id,
+            "status": status,
+            "previous_status": previous_status,
+            "at": time.time(),
+        }
+        if user_id is not None:
+            event["user_id"] = user_id
+        try:
+            StatusEvents.broker().publish(event)
+        except Exception as e:
+            current_app.logger.warning("Could not publish status event: %s", e)
+
+    @staticmethod
+    def subscribe(order_ids=None, user_id=None, limit=None):
+        return StatusEvents.broker().subscribe(order_ids, user_id, limit)
@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, select
+from controllers.prep_time_stats import PrepTimeStats
+from models.order import Order
+from database.db import db
+
+
+class WaitTimeEstimator:
+    """
+    Estimates when a newly placed order will be ready.
+
+    Each worker caches the kitchen queue (Pending/Preparing counts from one
+    GROUP BY over ix_orders_status_ordered_at_id) and the median time spent in
+    each status (from PrepTimeStats) for ETA_CHECK_INTERVAL seconds, so an
+    estimate is arithmetic on cached numbers. Orders placed by this worker in
+    between are added to the cached queue as they happen. Prep times are only
+    caught up incrementally here; the cold read of their window happens in
+    warm_up() or in the background (PREP_STATS_BACKGROUND_WARM).
+    """
+
+    ACTIVE_STATES = ("Pending", "Preparing")
+
+    class _State:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.queue = {}
+            self.typical = {}
+            self.checked_at = None
+
+    @staticmethod
+    def _state():
+        state = current_app.extensions.get("wait_time")
+        if state is None:
+            state = current_app.extensions.setdefault(
+                "wait_time", WaitTimeEstimator._State()
+            )
+        return state
+
+    @staticmethod
+    def _read_queue(exclude_order_id=None):
+        query = select(Order.status, func.count()).where(
+            Order.status.in_(WaitTimeEstimator.ACTIVE_STATES)
+        )
+        if exclude_order_id is not None:
+            query = query.where(Order.id != exclude_order_id)
+        rows = db.session.execute(query.group_by(Order.status)).all()
+        queue = dict.fromkeys(WaitTimeEstimator.ACTIVE_STATES, 0)
+        queue.update(rows)
+        return queue
+
+    @staticmethod
+    def _typical():
+        if PrepTimeStats.is_warm():
+            return PrepTimeStats.typical_seconds()
+        if current_app.config.get("PREP_STATS_BACKGROUND_WARM", True):
+            PrepTimeStats.warm_in_background()
+        return {}
+
+    @staticmethod
+    def _refresh(state, placed_order_id=None):
+        """
+        Re-reads the queue once ETA_CHECK_INTERVAL has passed and returns the
+        queue ahead of a new order.
+
+        ``placed_order_id`` is an order this worker just committed: it is
+        never counted as ahead of itself, and is counted exactly once for
+        later estimates, whether or not this call re-read the queue.
+        """
+        interval = current_app.config.get("ETA_CHECK_INTERVAL", 2.0)
+        now = time.monotonic()
+        with state.lock:
+            if state.checked_at is None or now - state.checked_at >= interval:
+                state.queue = WaitTimeEstimator._read_queue(placed_order_id)
+                state.typical = WaitTimeEstimator._typical()
+                state.checked_at = now
+            ahead = dict(state.queue)
+            if placed_order_id is not None:
+                state.queue["Pending"] = state.queue.get("Pending", 0) + 1
+            return ahead
+
+    @staticmethod
+    def estimate(placed_order_id=None):
+        """
+        Estimated wait for an order placed now, or for ``placed_order_id``
+        when it was just committed by this worker.
+
+        The kitchen works on KITCHEN_CAPACITY orders at a time, each taking the
+        recent median Preparing time (ETA_DEFAULT_PREP_SECONDS until there is
+        history). An order waits for the batches ahead of it, but never less
+        than the recent median Pending time, and is then prepared.
+
+        Returns:
+            dict: {"queue": {status: count} ahead of the order,
+                "wait_seconds": int, "ready_at": iso timestamp (UTC),
+                "prep_seconds": median (or default) Preparing time,
+                "from_history": bool}
+        """
+        state = WaitTimeEstimator._state()
+        queue = WaitTimeEstimator._refresh(state, placed_order_id)
+        config = current_app.config
+        prep = state.typical.get("Preparing")
+        from_history = prep is not None
+        if prep is None:
+            prep = config.get("ETA_DEFAULT_PREP_SECONDS", 600)
+        capacity = max(1, config.get("KITCHEN_CAPACITY", 4))
+        ahead = sum(queue.values())
+        queued = max((ahead // capacity) * prep, state.typical.get("Pending") or 0)
+        wait_seconds = int(round(queued + prep))
+        return {
+            "queue": queue,
+            "wait_seconds": wait_seconds,
+            "ready_at": (
+                datetime.utcnow() + timedelta(seconds=wait_seconds)
+            ).isoformat(),
+            "prep_seconds": prep,
+            "from_history": from_history,
+        }
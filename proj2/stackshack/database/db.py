@@ -1,7 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from database.routing import RoutingSession
 
-db = SQLAlchemy()
+# Reads marked @read_only go to the "replica" bind when one is configured.
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 login_manager = LoginManager()
 
 
@@ -0,0 +1,155 @@
+from sqlalchemy import inspect, text
+from database.db import db
+
+# Indexes replaced by a model-declared one; dropped once it exists.
+RETIRED_INDEXES = {
+    "orders": ("ix_orders_status_ordered_at",),
+}
+
+
+def _indexed_tables():
+    """Tables whose columns and indexes are managed by this module."""
+    # Imported here so the models are registered on db.metadata.
+    from models.menu_item import MenuItem
+    from models.order import Order, OrderItem
+
+    return [Order.__table__, OrderItem.__table__, MenuItem.__table__]
+
+
+def missing_indexes(connection):
+    """
+    Lists the model-declared indexes that do not exist in the live database.
+
+    Args:
+        connection (Connection): An open SQLAlchemy connection.
+
+    Returns:
+        list: sqlalchemy.Index objects that still need to be created.
+    """
+    inspector = inspect(connection)
+    missing = []
+    for table in _indexed_tables():
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in table.indexes if index.name not in existing)
+    return missing
+
+
+def missing_columns(connection):
+    """
+    Lists model columns that do not exist yet in the live database.
+
+    Args:
+        connection (Connection): An open SQLAlchemy connection.
+
+    Returns:
+        list: sqlalchemy.Column objects that still need to be added.
+    """
+    inspector = inspect(connection)
+    missing = []
+    for table in _indexed_tables():
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(c for c in table.columns if c.name not in existing)
+    return missing
+
+
+def ensure_columns(engine=None):
+    """
+    Adds missing nullable model columns to existing tables.
+
+    On MySQL the column is appended with ALGORITHM=INSTANT, a metadata-only
+    change that does not rebuild or lock the table. Run before ensure_indexes
+    so indexes on new columns can be built. Safe to run repeatedly.
+
+    Args:
+        engine (Engine, optional): Target engine. Defaults to db.engine.
+
+    Returns:
+        list: "table.column" names that were added.
+    """
+    engine = engine if engine is not None else db.engine
+    added = []
+    with engine.connect() as connection:
+        for column in missing_columns(connection):
+            if not column.nullable:
+                raise ValueError(
+                    f"{column.table.name}.{column.name} is NOT NULL; "
+                    "add it with a manual migration."
+                )
+            column_type = column.type.compile(dialect=connection.dialect)
+            if connection.dialect.name == "mysql":
+                ddl = (
+                    f"ALTER TABLE `{column.table.name}` ADD COLUMN "
+                    f"`{column.name}` {column_type} NULL, ALGORITHM=INSTANT"
+                )
+            else:
+                ddl = (
+                    f"ALTER TABLE {column.table.name} ADD COLUMN "
+                    f"{column.name} {column_type}"
+                )
+            connection.execute(text(ddl))
+            connection.commit()
+            added.append(f"{column.table.name}.{column.name}")
+    return added
+
+
+def _online_index_ddl(index):
+    """MySQL DDL that builds the index in place without blocking writes."""
+    columns = ", ".join(f"`{column.name}`" for column in index.columns)
+    return (
+        f"ALTER TABLE `{index.table.name}` ADD INDEX `{index.name}` ({columns}), "
+        "ALGORITHM=INPLACE, LOCK=NONE"
+    )
+
+
+def ensure_indexes(engine=None):
+    """
+    Adds any missing model-declared indexes to existing tables, then drops
+    the RETIRED_INDEXES they replace.
+
+    On MySQL each index is built with ALGORITHM=INPLACE, LOCK=NONE so the
+    table keeps serving reads and writes while the index is created. Other
+    dialects fall back to a plain CREATE INDEX. Safe to run repeatedly.
+
+    Args:
+        engine (Engine, optional): Target engine. Defaults to db.engine.
+
+    Returns:
+        list: Names of the indexes that were created.
+    """
+    engine = engine if engine is not None else db.engine
+    created = []
+    with engine.connect() as connection:
+        for index in missing_indexes(connection):
+            if connection.dialect.name == "mysql":
+                connection.execute(text(_online_index_ddl(index)))
+            else:
+                index.create(connection)
+            connection.commit()
+            created.append(index.name)
+        _drop_retired_indexes(connection)
+    return created
+
+
+def _drop_retired_indexes(connection):
+    inspector = inspect(connection)
+    for table, names in RETIRED_INDEXES.items():
+        if not inspector.has_table(table):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        for name in names:
+            if name not in existing:
+                continue
+            if connection.dialect.name == "mysql":
+                connection.execute(
+                    text(
+                        f"ALTER TABLE `{table}` DROP INDEX `{name}`, "
+                        "ALGORITHM=INPLACE, LOCK=NONE"
+                    )
+                )
+            else:
+                connection.execute(text(f"DROP INDEX {name}"))
+            connection.commit()
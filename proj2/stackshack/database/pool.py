@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolWaitStats:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_total, 6),
+                "wait_seconds_max": round(self.wait_max, 6),
+                "wait_seconds_avg": round(
+                    self.wait_total / self.checkouts if self.checkouts else 0, 6
+                ),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout.
+
+    The time covers waiting for a free connection and, when the pool grows,
+    opening a new one. The totals survive engine.dispose(), which recreates
+    the pool.
+    """
+
+    def __init__(self, creator, pool_size=5, max_overflow=10, **kwargs):
+        super().__init__(
+            creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs
+        )
+        # QueuePool keeps this private; kept here for pool_metrics().
+        self.max_overflow = max_overflow
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def pool_metrics(engine):
+    """
+    Reports the state of ``engine``'s connection pool in this process.
+
+    Args:
+        engine (Engine): A SQLAlchemy engine.
+
+    Returns:
+        dict: Pool class, pid, size and in-use counts (QueuePool only), and
+            max_overflow and checkout wait totals (MeteredQueuePool only).
+    """
+    pool = engine.pool
+    metrics = {"pool": type(pool).__name__, "pid": os.getpid()}
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, MeteredQueuePool):
+        metrics["max_overflow"] = pool.max_overflow
+        metrics.update(pool.wait_stats.snapshot())
+    return metrics
@@ -0,0 +1,75 @@
+import functools
+import time
+from contextvars import ContextVar
+from flask import current_app, g, has_app_context, has_request_context, session
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+
+_read_only = ContextVar("read_only", default=False)
+
+
+def read_only(fn):
+    """
+    Lets the SELECTs ``fn`` issues be served by the read replica.
+
+    Apply below ``@staticmethod`` on controller methods that never write.
+    Without a ``replica`` bind this changes nothing.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+def _note_write():
+    """Pins this request, and the client's next few, to the primary."""
+    if not has_app_context():
+        return
+    g.db_wrote = True
+    if has_request_context():
+        session["db_primary_until"] = time.time() + current_app.config.get(
+            "REPLICA_STICKY_SECONDS", 5
+        )
+
+
+def _wants_primary():
+    if not has_app_context():
+        return False
+    if g.get("db_wrote"):
+        return True
+    return has_request_context() and session.get("db_primary_until", 0) > time.time()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends read-only SELECTs to the ``replica`` bind.
+
+    A statement goes to the replica only inside a @read_only call, when it is
+    a plain SELECT (not FOR UPDATE) and the session is not flushing. Any
+    flush or DML statement marks the request as having written: its later
+    reads, and the same client's reads for REPLICA_STICKY_SECONDS, stay on
+    the primary so they see their own writes (e.g. the order history shown
+    after placing an order).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or getattr(clause, "is_dml", False):
+                _note_write()
+            elif (
+                _read_only.get()
+                and getattr(clause, "is_select", False)
+                and getattr(clause, "_for_update_arg", None) is None
+                and not _wants_primary()
+            ):
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for production; every value can be overridden from the
+environment.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")  # nosec B104
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Threaded workers, so a long-lived /status/stream does not block a process.
+# Every open stream still holds one of a worker's threads; the app caps them at
+# STATUS_STREAM_MAX_PER_WORKER and the page polls once a worker is full. Set
+# GUNICORN_WORKER_CLASS=gevent (and raise that cap) to hold many streams.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then to cap slow memory growth.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+# Import and warm the app once in the master; workers fork from it.
+preload_app = True
+reload = False
+
+
+def post_fork(server, worker):
+    """Give each worker its own, already open, database connections."""
+    from app import warm_pool
+    from wsgi import app
+
+    warm_pool(app)
@@ -0,0 +1,41 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from database.db import db
+
+
+class CacheVersion(db.Model):
+    """
+    Shared version counter for an in-process cache.
+
+    Every worker process keeps its own copy of cached data and compares its
+    version against this row; writers bump the row in the same transaction as
+    the data change so all workers notice on their next check.
+    """
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def bump(name):
+        """
+        Increments the named counter in the current transaction, creating it
+        at 1 if missing. The row stays locked until commit.
+        """
+        result = db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == name)
+            .values(version=CacheVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(CacheVersion(name=name, version=1))
+            except IntegrityError:
+                # Another worker created the row first; bump that one.
+                db.session.execute(
+                    update(CacheVersion)
+                    .where(CacheVersion.name == name)
+                    .values(version=CacheVersion.version + 1)
+                )
@@ -0,0 +1,29 @@
+from database.db import db
+from datetime import datetime
+
+
+class IdempotencyKey(db.Model):
+    """
+    Client-supplied key that makes order placement safe to retry.
+
+    The row is inserted before the order in the same transaction; the unique
+    (user_id, key) index makes a concurrent duplicate fail (or, on MySQL, wait
+    and then fail) on that insert, so only one order is ever written per key.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+        # TTL purge: DELETE ... WHERE created_at < ?
+        db.Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    MAX_LENGTH = 64
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    key = db.Column(db.String(MAX_LENGTH), nullable=False)
+    order_id = db.Column(
+        db.Integer, db.ForeignKey("orders.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -3,6 +3,12 @@ from database.db import db
 
 class MenuItem(db.Model):
     __tablename__ = "menu_items"
+    __table_args__ = (
+        # Browse/order pages: WHERE is_available ORDER BY category, name
+        db.Index(
+            "ix_menu_items_available_category_name", "is_available", "category", "name"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
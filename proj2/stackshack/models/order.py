@@ -4,17 +4,38 @@ from datetime import datetime
 
 class Order(db.Model):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Customer history: WHERE user_id = ? ORDER BY ordered_at DESC
+        db.Index("ix_orders_user_id_ordered_at", "user_id", "ordered_at"),
+        # Staff board, one range per status: WHERE status = ?
+        # ORDER BY ordered_at DESC, id DESC (see get_staff_orders_page)
+        db.Index("ix_orders_status_ordered_at_id", "status", "ordered_at", "id"),
+        # Staff board without a status filter, optionally by date range
+        db.Index("ix_orders_ordered_at_id", "ordered_at", "id"),
+        # Delta sync: WHERE (changed_at, id) > (?, ?) ORDER BY changed_at, id
+        db.Index("ix_orders_changed_at", "changed_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     total_price = db.Column(db.Numeric(10, 2), nullable=False)
     status = db.Column(db.String(50), nullable=False, default="Pending")
     ordered_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Time of the order's latest change (creation or status update), the
+    # watermark of StatusController.get_order_changes.
+    changed_at = db.Column(db.DateTime, nullable=True)
 
     items = db.relationship(
         "OrderItem", backref="order", lazy="dynamic", cascade="all, delete-orphan"
     )
+    # Read-only list view of the same rows. Unlike the dynamic ``items`` query it
+    # can be eager-loaded (selectinload) so history pages avoid one query per order.
+    line_items = db.relationship(
+        "OrderItem", lazy="select", viewonly=True, order_by="OrderItem.id"
+    )
     user = db.relationship("User", backref=db.backref("orders", lazy="dynamic"))
+    # Not stored: set on newly placed orders by OrderController (UTC).
+    estimated_ready_at = None
 
     def to_dict(self):
         return {
@@ -23,12 +44,16 @@ class Order(db.Model):
             "total_price": float(self.total_price),
             "status": self.status,
             "ordered_at": self.ordered_at.isoformat() if self.ordered_at else None,
-            "items": [item.to_dict() for item in self.items.all()],
+            "items": [item.to_dict() for item in self.line_items],
         }
 
 
 class OrderItem(db.Model):
     __tablename__ = "order_items"
+    __table_args__ = (
+        db.Index("ix_order_items_order_id", "order_id"),
+        db.Index("ix_order_items_menu_item_id", "menu_item_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
@@ -0,0 +1,27 @@
+from database.db import db
+from datetime import datetime
+
+
+class OrderStatusEvent(db.Model):
+    """
+    Append-only log of order status transitions.
+
+    StatusController writes one row per transition in the same transaction as
+    the status change; rows are never updated. Time spent in ``from_status``
+    is this row's ``changed_at`` minus the order's previous event (or its
+    ``ordered_at`` for the first transition out of Pending).
+    """
+
+    __tablename__ = "order_status_events"
+    __table_args__ = (
+        # Previous transition of an order: WHERE order_id = ? AND id < ?
+        db.Index("ix_order_status_events_order_id_id", "order_id", "id"),
+        # Cold start of the aggregator: WHERE changed_at >= ?
+        db.Index("ix_order_status_events_changed_at", "changed_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
+    from_status = db.Column(db.String(50), nullable=False)
+    to_status = db.Column(db.String(50), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,6 +1,6 @@
 from database.db import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from controllers.password_hasher import PasswordHasher
 
 
 class User(UserMixin, db.Model):
@@ -19,11 +19,15 @@ class User(UserMixin, db.Model):
     def set_password(self, password):
         """
         Hashes the plaintext password and stores it in the password column.
+        Runs on the PasswordHasher pool when one is configured.
 
         Args:
             password (str): The plaintext password.
+
+        Raises:
+            PasswordHasherBusy: If every hashing slot is taken.
         """
-        self.password = generate_password_hash(password)
+        self.password = PasswordHasher.hash(password)
 
     def check_password(self, password):
         """
@@ -34,8 +38,11 @@ class User(UserMixin, db.Model):
 
         Returns:
             bool: True if the password matches the hash, False otherwise.
+
+        Raises:
+            PasswordHasherBusy: If every hashing slot is taken.
         """
-        return check_password_hash(self.password, password)
+        return PasswordHasher.verify(self.password, password)
 
     @staticmethod
     def get_by_username(username):
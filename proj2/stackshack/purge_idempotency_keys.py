@@ -0,0 +1,15 @@
+# Removes order idempotency keys older than IDEMPOTENCY_KEY_TTL (run from cron).
+from app import create_app
+from controllers.order_controller import OrderController
+
+
+def purge_idempotency_keys():
+    """Deletes expired idempotency keys."""
+    app = create_app(config_name="development")
+
+    with app.app_context():
+        removed = OrderController.purge_idempotency_keys()
+        print(f"✅ Removed {removed} expired idempotency key(s).")
+
+
+purge_idempotency_keys()
@@ -0,0 +1,59 @@
+import hashlib
+import os
+from flask import Blueprint, abort, current_app, send_from_directory, url_for
+from routes.http_cache import IMMUTABLE_MAX_AGE
+
+assets_bp = Blueprint("assets", __name__)
+
+HASH_LENGTH = 12
+
+
+def _fingerprint(filename):
+    """Returns the content hash of a file under the static folder."""
+    path = os.path.join(current_app.static_folder, filename)
+    state = current_app.extensions.setdefault("asset_hashes", {})
+    if current_app.debug:
+        key = (filename, os.stat(path).st_mtime_ns)
+    else:
+        key = filename
+    digest = state.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+        state[key] = digest
+    return digest
+
+
+def asset_url(filename):
+    """
+    URL of a static bundle with its content hash in the file name, e.g.
+    ``css/orders-history.css`` -> ``/assets/css/orders-history.<hash>.css``.
+
+    The URL changes whenever the file does, so it is served as immutable.
+    Available in templates as ``asset_url``.
+    """
+    stem, ext = os.path.splitext(filename)
+    return url_for("assets.bundle", filename=f"{stem}.{_fingerprint(filename)}{ext}")
+
+
+@assets_bp.route("/<path:filename>")
+def bundle(filename):
+    """
+    Serves a fingerprinted static bundle.
+
+    A current hash is cached for a year as immutable; an outdated one (a page
+    rendered before a deploy) still gets the current file, but uncached.
+    """
+    stem, ext = os.path.splitext(filename)
+    stem, _, digest = stem.rpartition(".")
+    source = stem + ext
+    if not stem or not os.path.isfile(os.path.join(current_app.static_folder, source)):
+        abort(404)
+    response = send_from_directory(current_app.static_folder, source)
+    if digest == _fingerprint(source):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
@@ -1,6 +1,15 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import (
+    Blueprint,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    make_response,
+)
 from flask_login import login_required, current_user
 from controllers.auth_controller import AuthController
+from controllers.login_throttle import LoginThrottle
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -42,6 +51,15 @@ def login():
     if request.method == "POST":
         username = request.form.get("username")
         password = request.form.get("password")
+
+        # Refuse over-limit attempts before the user lookup or password hash.
+        allowed, msg, retry_after = LoginThrottle.check(username, request.remote_addr)
+        if not allowed:
+            flash(msg, "error")
+            response = make_response(render_template("login.html"), 429)
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+
         success, msg, _ = AuthController.login_user_account(username, password)
         flash(msg, "success" if success else "error")
 
@@ -0,0 +1,93 @@
+import hashlib
+from datetime import timezone
+from flask import make_response, request, session
+
+# Shared menu data: browsers and a reverse proxy may reuse it for a minute.
+PUBLIC_MAX_AGE = 60
+# Data that only changes on deploy (e.g. the status flow).
+STATIC_MAX_AGE = 3600
+# Versioned URLs whose content can never change.
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def make_etag(*parts):
+    """Builds a strong ETag value from the given parts."""
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def newest_update(items):
+    """Returns the latest updated_at among ``items`` (None if unknown)."""
+    return max((item.updated_at for item in items if item.updated_at), default=None)
+
+
+def menu_etag(scope, items):
+    """
+    ETag for a list of menu items: row count, ids and newest updated_at.
+
+    Args:
+        scope (str): What the list represents, e.g. "ingredients:bun".
+        items (list): MenuItem objects included in the response.
+    """
+    newest = newest_update(items)
+    return make_etag(
+        scope,
+        len(items),
+        ",".join(str(item.id) for item in items),
+        newest.isoformat() if newest else "",
+    )
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have second resolution.
+        stamp = last_modified.replace(microsecond=0)
+        if stamp.tzinfo is None:
+            stamp = stamp.replace(tzinfo=timezone.utc)
+        return stamp <= request.if_modified_since
+    return False
+
+
+def conditional_response(
+    etag, build, max_age=PUBLIC_MAX_AGE, last_modified=None, public=True
+):
+    """
+    Answers 304 Not Modified when the client's validators match, otherwise
+    calls ``build()`` to produce the body. Either way the response carries
+    the ETag, Last-Modified and Cache-Control headers.
+
+    Args:
+        etag (str): Strong ETag of the current representation.
+        build (callable): Returns the response body (or a Response).
+        max_age (int): Cache-Control max-age in seconds.
+        last_modified (datetime, optional): Last-Modified value.
+        public (bool): Whether shared caches may store the response. Pages
+            that differ per user must pass False.
+
+    Returns:
+        Response: The 200 or 304 response.
+    """
+    if not public and "_flashes" in session:
+        # The page will include one-time flash messages; never cache it.
+        response = make_response(build())
+        response.cache_control.no_store = True
+        return response
+
+    if _not_modified(etag, last_modified):
+        response = make_response("", 304)
+    else:
+        response = make_response(build())
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.max_age = max_age
+    if public:
+        response.cache_control.public = True
+    else:
+        response.cache_control.private = True
+        response.cache_control.must_revalidate = True
+        response.vary.add("Cookie")
+    return response
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from controllers.menu_controller import MenuController
+from routes.http_cache import conditional_response, menu_etag, newest_update
 
 menu_bp = Blueprint("menu", __name__)
 
@@ -175,7 +176,14 @@ def browse_menu():
         flash(msg, "error")
         items = []
 
-    return render_template("menu/browse.html", items=items)
+    # The page header differs for logged-in users, so validate per user.
+    return conditional_response(
+        menu_etag(f"browse:{current_user.get_id()}", items),
+        lambda: render_template("menu/browse.html", items=items),
+        max_age=0,
+        last_modified=newest_update(items),
+        public=False,
+    )
 
 
 # View healthy choices
@@ -188,25 +196,24 @@ def healthy_choices():
         flash(msg, "error")
         items = []
 
-    return render_template("menu/healthy.html", items=items)
+    return conditional_response(
+        menu_etag(f"healthy:{current_user.get_id()}", items),
+        lambda: render_template("menu/healthy.html", items=items),
+        max_age=0,
+        last_modified=newest_update(items),
+        public=False,
+    )
 
 
 # Public view - Browse all available ingredients
 @menu_bp.route("/browse-ingredients", methods=["GET"])
 def browse_ingredients():
     """Public view of all available menu items/ingredients"""
-    success, msg, items = MenuController.get_available_items()
+    success, msg, categorized_items = MenuController.get_available_items_by_category()
 
     if not success:
         flash(msg, "error")
-        items = []
-
-    # Group items by category for better display
-    categorized_items = {}
-    for item in items:
-        if item.category not in categorized_items:
-            categorized_items[item.category] = []
-        categorized_items[item.category].append(item)
+        categorized_items = {}
 
     return render_template(
         "menu/browse_ingredients.html", categorized_items=categorized_items
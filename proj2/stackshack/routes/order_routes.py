@@ -1,8 +1,31 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+import json
+import uuid
+from datetime import datetime
+from flask import (
+    Blueprint,
+    current_app,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    jsonify,
+)
 from flask_login import login_required, current_user
+from controllers.admission import AdmissionController
 from controllers.order_controller import OrderController
 from controllers.menu_controller import MenuController
-from models.menu_item import MenuItem
+from controllers.menu_catalog import MenuCatalog
+from controllers.status_controller import StatusController
+from models.idempotency_key import IdempotencyKey
+from routes.http_cache import (
+    IMMUTABLE_MAX_AGE,
+    PUBLIC_MAX_AGE,
+    conditional_response,
+    make_etag,
+    menu_etag,
+    newest_update,
+)
 
 order_bp = Blueprint("order", __name__)
 
@@ -11,28 +34,80 @@ order_bp = Blueprint("order", __name__)
 @login_required
 def order_history():
     user_id = current_user.id
-    success, msg, orders = OrderController.get_user_orders(user_id)
+    # Read before the orders so live updates resume from this render.
+    _, _, changes = StatusController.get_order_changes(user_id=user_id)
+    success, msg, orders = OrderController.get_user_orders(user_id, with_items=True)
     if not success:
         flash(msg, "error")
         orders = []
-    return render_template("orders/history.html", orders=orders)
+    return render_template(
+        "orders/history.html",
+        orders=orders,
+        changes_cursor=changes["cursor"] if changes else "",
+    )
+
+
+def _ingredient_dict(item):
+    return {
+        "id": item.id,
+        "name": item.name,
+        "price": item.price,
+        "description": item.description,
+        "is_healthy": item.is_healthy_choice,
+        "image_url": item.image_url,
+    }
 
 
 @order_bp.route("/ingredients/<category>")
 def get_ingredients(category):
-    items = MenuItem.query.filter(MenuItem.category.ilike(f"%{category}%")).all()
-    data = [
-        {
-            "id": item.id,
-            "name": item.name,
-            "price": item.price,
-            "description": item.description,
-            "is_healthy": item.is_healthy_choice,
-            "image_url": item.image_url,
-        }
-        for item in items
-    ]
-    return jsonify(data)
+    items = MenuCatalog.get().category(category)
+    return conditional_response(
+        menu_etag(f"ingredients:{category.lower()}", items),
+        lambda: jsonify([_ingredient_dict(item) for item in items]),
+        last_modified=newest_update(items),
+    )
+
+
+def _catalog(snapshot):
+    """
+    The grouped catalog payload and a hash of its content, built once per
+    menu snapshot. Hashing the payload itself (not ids and timestamps) means
+    any change to what the builder receives changes the ``?v=`` URL.
+    """
+    cached = current_app.extensions.get("ingredient_catalog")
+    if cached is None or cached[0] is not snapshot:
+        categories = {}
+        for item in snapshot.available:
+            categories.setdefault(item.category.lower(), []).append(
+                _ingredient_dict(item)
+            )
+        body = json.dumps(categories, sort_keys=True, default=str)
+        cached = (snapshot, categories, make_etag("catalog", body))
+        current_app.extensions["ingredient_catalog"] = cached
+    return cached[1], cached[2]
+
+
+@order_bp.route("/ingredients", methods=["GET"])
+def get_ingredient_catalog():
+    """
+    Every available ingredient grouped by category, in one response.
+
+    The burger builder requests this as ``?v=<catalog ETag>``. The URL is then
+    content-addressed, so when ``v`` matches the current catalog the response
+    is served as immutable; any other request gets the normal short max-age.
+    """
+    snapshot = MenuCatalog.get()
+    categories, etag = _catalog(snapshot)
+    pinned = request.args.get("v") == etag
+    response = conditional_response(
+        etag,
+        lambda: jsonify({"version": etag, "categories": categories}),
+        max_age=IMMUTABLE_MAX_AGE if pinned else PUBLIC_MAX_AGE,
+        last_modified=newest_update(snapshot.available),
+    )
+    if pinned:
+        response.cache_control.immutable = True
+    return response
 
 
 @order_bp.route("/new", methods=["GET"])
@@ -42,27 +117,69 @@ def create_order_form():
     if not success:
         flash("Error loading menu items: " + msg, "error")
         items = []
-    return render_template("orders/create.html", items=items)
+    _, etag = _catalog(MenuCatalog.get())
+    catalog_url = url_for("order.get_ingredient_catalog", v=etag)
+    return render_template(
+        "orders/create.html",
+        items=items,
+        catalog_url=catalog_url,
+        idempotency_key=uuid.uuid4().hex,
+    )
 
 
 @order_bp.route("/place", methods=["POST"])
 @login_required
 def place_order():
     user_id = current_user.id
-    item_data = []
+    # Only ids and quantities are read; prices and names come from the menu.
+    cart = []
     for key, value in request.form.items():
         if key.startswith("quantity_"):
             try:
-                item_id = key.split("_")[1]
-                quantity = int(value)
-                if quantity > 0:
-                    price = request.form.get(f"price_{item_id}")
-                    name = request.form.get(f"name_{item_id}")
-                    if price and name:
-                        item_data.append((item_id, price, quantity, name))
+                cart.append((int(key.split("_")[1]), int(value)))
             except ValueError:
                 continue
-    success, msg, _ = OrderController.create_new_order(user_id, item_data)
+    # One key per rendered builder page (or per API request via the header),
+    # so double-clicks and retries replay the first order instead of duplicating.
+    key = (
+        request.headers.get("Idempotency-Key")
+        or request.form.get("idempotency_key")
+        or ""
+    ).strip()
+    if len(key) > IdempotencyKey.MAX_LENGTH:
+        flash("Invalid idempotency key.", "error")
+        return redirect(url_for("order.create_order_form"))
+
+    # A retry of an order that was already placed is answered from its key,
+    # without taking an admission slot or being shed.
+    replayed = OrderController.replay_existing(user_id, key) if key else None
+    if replayed is not None:
+        success, msg, order = replayed
+    else:
+        # Shed load before any write when the kitchen queue is full or too
+        # many orders are in flight, so reads stay fast during a surge.
+        admitted, msg, retry_after = AdmissionController.admit_order()
+        if not admitted:
+            if request.accept_mimetypes.best == "application/json":
+                response = jsonify({"success": False, "message": msg})
+                response.status_code = 503
+            else:
+                flash(msg, "error")
+                response = redirect(url_for("order.create_order_form"))
+            response.headers["Retry-After"] = str(retry_after)
+            return response
+        try:
+            success, msg, order = OrderController.checkout(
+                user_id, cart, idempotency_key=key or None, key_checked=True
+            )
+        finally:
+            AdmissionController.release()
+    if success and order.estimated_ready_at is not None:
+        minutes = max(
+            1,
+            round((order.estimated_ready_at - datetime.utcnow()).total_seconds() / 60),
+        )
+        msg += f" Estimated ready in about {minutes} min."
     flash(msg, "success" if success else "error")
     if success:
         return redirect(url_for("order.order_history"))
@@ -1,16 +1,47 @@
-from flask import Blueprint, request, jsonify, render_template, flash, redirect, url_for
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    request,
+    jsonify,
+    render_template,
+    flash,
+    redirect,
+    url_for,
+)
 from flask_login import login_required, current_user
+import hmac
+import json
+import time
+from datetime import datetime, timedelta
+from controllers.identity_cache import STAFF_ROLES, has_role
+from controllers.kitchen_scheduler import KitchenScheduler
+from controllers.prep_time_stats import PrepTimeStats
 from controllers.status_controller import StatusController
+from controllers.status_events import StatusEvents
+from controllers.wait_time import WaitTimeEstimator
+from database.db import db
+from database.pool import pool_metrics
+from routes.http_cache import STATIC_MAX_AGE, conditional_response, make_etag
 
 status_bp = Blueprint("status", __name__)
 
+UPDATE_FAILURE_CODES = {
+    StatusController.NOT_FOUND: 404,
+    StatusController.CONFLICT: 409,
+}
+# Seconds a client refused a stream (worker at its limit) should wait.
+STREAM_RETRY_AFTER = 30
+# pool_metrics() values that only ever grow; the rest are Prometheus gauges.
+POOL_COUNTERS = ("checkouts", "timeouts", "wait_seconds_total")
+
 
 @status_bp.route("/update", methods=["POST"])
 @login_required
 def update_status():
     """Update the status of an order (staff only)."""
     try:
-        if not StatusController.is_staff(current_user.id):
+        if not has_role(current_user, *STAFF_ROLES):
             return (
                 jsonify(
                     {"success": False, "message": "Only staff can update order status."}
@@ -30,24 +61,22 @@ def update_status():
 
         order_id = int(order_id)
 
-        from models.order import Order
-
-        order = Order.query.filter_by(id=order_id).first()
-        if not order:
-            return jsonify({"success": False, "message": "Order not found."}), 404
-
-        success, msg, updated_order = StatusController.update_order_status(
+        success, msg, change = StatusController.update_order_status(
             order_id, new_status
         )
         if not success:
-            return jsonify({"success": False, "message": msg}), 400
+            # ``change`` holds the failure reason.
+            return (
+                jsonify({"success": False, "message": msg}),
+                UPDATE_FAILURE_CODES.get(change, 400),
+            )
 
         return (
             jsonify(
                 {
                     "success": True,
                     "message": msg,
-                    "order": {"id": updated_order.id, "status": updated_order.status},
+                    "order": {"id": change.id, "status": change.status},
                 }
             ),
             200,
@@ -56,6 +85,173 @@ def update_status():
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
 
+@status_bp.route("/bulk", methods=["POST"])
+@login_required
+def bulk_update_status():
+    """Advance or cancel many orders in one request (staff only).
+
+    JSON body: ``order_ids`` (list), ``action`` ("advance" or "cancel") and
+    optional ``expected_status``. Responds with one outcome per order.
+    """
+    if not has_role(current_user, *STAFF_ROLES):
+        return (
+            jsonify(
+                {"success": False, "message": "Only staff can update order status."}
+            ),
+            403,
+        )
+
+    data = request.get_json(silent=True) or {}
+    order_ids = data.get("order_ids")
+    if not isinstance(order_ids, list):
+        return jsonify({"success": False, "message": "Missing order_ids list"}), 400
+
+    success, msg, outcomes = StatusController.bulk_update_status(
+        order_ids, data.get("action"), data.get("expected_status")
+    )
+    if not success:
+        return jsonify({"success": False, "message": msg}), 400
+    return jsonify({"success": True, "message": msg, "results": outcomes}), 200
+
+
+@status_bp.route("/changes", methods=["GET"])
+@login_required
+def order_changes():
+    """Delta sync for clients that poll instead of holding /stream open.
+
+    Returns orders created or changed after ``since`` (staff: every order,
+    customers: their own) plus the ``cursor`` to send as ``since`` next time.
+    Call without ``since`` first to get the current cursor.
+    """
+    user_id = None if has_role(current_user, *STAFF_ROLES) else current_user.id
+    success, msg, data = StatusController.get_order_changes(
+        since=request.args.get("since"),
+        user_id=user_id,
+        limit=request.args.get("limit", type=int),
+        with_items=True,
+    )
+    if not success:
+        return jsonify({"success": False, "message": msg}), 400
+    response = jsonify(
+        {
+            "success": True,
+            "orders": [order.to_dict() for order in data["orders"]],
+            "cursor": data["cursor"],
+            "has_more": data["has_more"],
+        }
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@status_bp.route("/prep-times", methods=["GET"])
+@login_required
+def prep_times():
+    """Staff-only p50/p90/p99 seconds spent in each status, per hour."""
+    if not has_role(current_user, *STAFF_ROLES):
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    hours = request.args.get("hours", 24, type=int)
+    window = current_app.config.get("PREP_STATS_WINDOW_HOURS", 48)
+    success, msg, rows = PrepTimeStats.get_hourly(max(1, min(hours, window)))
+    if not success:
+        return jsonify({"success": False, "message": msg}), 500
+    return jsonify({"success": True, "hours": rows}), 200
+
+
+@status_bp.route("/batches", methods=["GET"])
+@login_required
+def prep_batches():
+    """Staff-only kitchen batch proposal for the Pending/Preparing queue."""
+    if not has_role(current_user, *STAFF_ROLES):
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    success, msg, batches = KitchenScheduler.propose_batches()
+    if not success:
+        return jsonify({"success": False, "message": msg}), 500
+    response = jsonify(
+        {
+            "success": True,
+            "batches": [
+                dict(
+                    batch._asdict(),
+                    oldest_at=batch.oldest_at.isoformat(),
+                    due_at=batch.due_at.isoformat(),
+                )
+                for batch in batches
+            ],
+        }
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+@status_bp.route("/stream", methods=["GET"])
+@login_required
+def status_stream():
+    """Server-Sent Events feed of order status changes.
+
+    Customers get changes to their own active orders, and to orders they
+    place while connected; staff may pass ``scope=all`` for every order. The
+    stream holds no database connection while idle and closes after
+    STATUS_STREAM_MAX_AGE seconds, at which point the browser's EventSource
+    reconnects on its own.
+
+    Each open stream occupies a worker thread, so a worker serves at most
+    STATUS_STREAM_MAX_PER_WORKER of them and answers 503 with Retry-After
+    beyond that; the page then polls /status/changes instead. A customer
+    with nothing in progress gets 204, which tells EventSource not to retry.
+    """
+    user_id = None
+    if request.args.get("scope") == "all":
+        if not has_role(current_user, *STAFF_ROLES):
+            return (
+                jsonify({"success": False, "message": "Only staff can watch all."}),
+                403,
+            )
+        order_ids = None
+    else:
+        user_id = current_user.id
+        order_ids = StatusController.get_active_order_ids(user_id)
+        if not order_ids:
+            return "", 204
+
+    heartbeat = current_app.config.get("STATUS_STREAM_HEARTBEAT", 15)
+    max_age = current_app.config.get("STATUS_STREAM_MAX_AGE", 300)
+    subscription = StatusEvents.subscribe(
+        order_ids,
+        user_id=user_id,
+        limit=current_app.config.get("STATUS_STREAM_MAX_PER_WORKER", 2),
+    )
+    if subscription is None:
+        response = jsonify(
+            {"success": False, "message": "Too many open streams; poll instead."}
+        )
+        response.status_code = 503
+        response.headers["Retry-After"] = str(STREAM_RETRY_AFTER)
+        return response
+
+    def stream():
+        try:
+            yield "retry: 3000\n\n"
+            deadline = time.monotonic() + max_age
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=heartbeat)
+                if subscription.overflowed:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                if event is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: status\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @status_bp.route("/cancel/<int:order_id>", methods=["POST"])
 @login_required
 def cancel_order(order_id):
@@ -84,37 +280,135 @@ def get_status_flow():
     """Get the status flow configuration for frontend."""
     try:
         flow = StatusController.get_status_flow()
-        return jsonify({"success": True, "flow": flow}), 200
+        etag = make_etag(json.dumps(flow, sort_keys=True))
+        return conditional_response(
+            etag,
+            lambda: jsonify({"success": True, "flow": flow}),
+            max_age=STATIC_MAX_AGE,
+        )
     except Exception as e:
         return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
 
 
+@status_bp.route("/eta", methods=["GET"])
+def get_wait_estimate():
+    """Estimated wait for an order placed now, from the live kitchen queue."""
+    try:
+        response = jsonify({"success": True, "estimate": WaitTimeEstimator.estimate()})
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    except Exception as e:
+        return jsonify({"success": False, "message": f"Server error: {str(e)}"}), 500
+
+
+@status_bp.route("/pool", methods=["GET"])
+def pool_stats():
+    """
+    Connection pool metrics for this worker, for sizing workers against it.
+
+    Open to staff, or to monitoring with ``Authorization: Bearer
+    <METRICS_TOKEN>``. ``?format=prometheus`` returns the text exposition
+    format instead of JSON.
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if not (
+        (token and hmac.compare_digest(supplied.encode(), token.encode()))
+        or has_role(current_user, *STAFF_ROLES)
+    ):
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    metrics = pool_metrics(db.engine)
+    if request.args.get("format") == "prometheus":
+        labels = f'{{pid="{metrics["pid"]}",pool="{metrics["pool"]}"}}'
+        body = "".join(
+            f"# TYPE stackshack_db_pool_{name} "
+            f"{'counter' if name in POOL_COUNTERS else 'gauge'}\n"
+            f"stackshack_db_pool_{name}{labels} {value}\n"
+            for name, value in metrics.items()
+            if name not in ("pid", "pool")
+        )
+        response = Response(body, mimetype="text/plain; version=0.0.4")
+    else:
+        response = jsonify({"success": True, "pool": metrics})
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _parse_date_arg(name):
+    """Parses a YYYY-MM-DD query argument, returning None when absent/invalid."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        flash(f"Ignoring invalid {name} date: {value}", "error")
+        return None
+
+
 @status_bp.route("/manage", methods=["GET"])
 @login_required
 def manage_orders():
-    """Staff/Admin view to manage all orders with status updates."""
-    if not StatusController.is_staff(current_user.id):
+    """Staff/Admin view to manage orders with status updates.
+
+    Shows the active queue by default. Query arguments: ``status`` (repeatable,
+    or ``all``), ``from`` / ``to`` dates (inclusive), ``cursor`` and ``limit``.
+    """
+    if not has_role(current_user, *STAFF_ROLES):
         flash("Access denied. Only staff can manage orders.", "error")
         return redirect(url_for("order.order_history"))
 
-    success, msg, orders = StatusController.get_all_orders_for_staff()
+    selected_statuses = request.args.getlist("status")
+    if "all" in selected_statuses:
+        statuses = []
+        status_filter = list(StatusController.STATUS_FLOW)
+    elif selected_statuses:
+        statuses = [
+            s for s in selected_statuses if s in StatusController.STATUS_FLOW
+        ] or None
+        status_filter = statuses or StatusController.ACTIVE_STATUSES
+    else:
+        statuses = None
+        status_filter = StatusController.ACTIVE_STATUSES
+
+    since = _parse_date_arg("from")
+    until = _parse_date_arg("to")
+    if until is not None:
+        until += timedelta(days=1)
+
+    # Read before the board so live updates resume from this render.
+    _, _, changes = StatusController.get_order_changes()
+    success, msg, page = StatusController.get_staff_orders_page(
+        statuses=statuses,
+        since=since,
+        until=until,
+        cursor=request.args.get("cursor"),
+        limit=request.args.get("limit", type=int),
+        with_items=True,
+    )
     if not success:
         flash(msg, "error")
-        orders = []
+        page = {"orders": [], "next_cursor": None}
+
+    batched, _, batches = KitchenScheduler.propose_batches()
 
-    status_flow = {
-        "Pending": "Preparing",
-        "Preparing": "Ready for Pickup",
-        "Ready for Pickup": "Delivered",
-        "Delivered": None,
-        "Cancelled": None,
-    }
+    next_page_url = None
+    if page["next_cursor"]:
+        args = request.args.to_dict(flat=False)
+        args["cursor"] = page["next_cursor"]
+        next_page_url = url_for("status.manage_orders", **args)
 
     return render_template(
         "orders/history.html",
-        orders=orders,
+        orders=page["orders"],
         manage_mode=True,
-        status_flow=status_flow,
+        status_flow=StatusController.STATUS_FLOW,
+        status_filter=status_filter,
+        date_from=request.args.get("from", ""),
+        date_to=request.args.get("to", ""),
+        next_page_url=next_page_url,
+        changes_cursor=changes["cursor"] if changes else "",
+        prep_batches=batches if batched else [],
         page_title="Manage Orders",
         header_title="Manage All Orders",
     )
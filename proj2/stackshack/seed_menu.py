@@ -1,5 +1,6 @@
 from database.db import db
 from app import create_app
+from controllers.menu_catalog import MenuCatalog
 from models.menu_item import MenuItem
 
 # Create Flask app context
@@ -233,13 +234,18 @@ def seed_menu_items():
         },
     ]
 
+    added = 0
     for item in menu_data:
         # Avoid duplicates
         existing_item = MenuItem.query.filter_by(name=item["name"]).first()
         if not existing_item:
             new_item = MenuItem(**item)
             db.session.add(new_item)
+            added += 1
 
+    # Running workers only reload their cached menu when the version moves.
+    if added:
+        MenuCatalog.bump_version()
     db.session.commit()
     print(f"Successfully seeded {len(menu_data)} menu items into the database.")
 
@@ -0,0 +1,420 @@
+const burgerStack = document.getElementById('burger-stack');
+const ingredientCardsDiv = document.getElementById('ingredient-cards');
+const currentCategory = document.getElementById('current-category');
+const priceBreakdownEl = document.getElementById('price-breakdown');
+const priceTotalEl = document.querySelector('.price-total');
+const placeOrderForm = document.getElementById('place-order-form');
+const hiddenInputsDiv = document.getElementById('hidden-inputs');
+const placeOrderBtn = document.getElementById('place-order-btn');
+
+// Track selected ingredients - arrays to support multiple items
+const selectedIngredients = {
+  'bun': [],
+  'sauce': [],
+  'topping': [],
+  'cheese': [],
+  'patty': []
+};
+
+let ingredientQuantities = {};
+let activeCategory = null;
+
+function renderBurger() {
+  burgerStack.innerHTML = '';
+
+  // Top bun
+  if (selectedIngredients['bun'].length > 0) {
+    const bunItem = selectedIngredients['bun'][0].item;
+    const topBunEl = createLayerElement('top-bun', 'bun', bunItem, 'Top Bun');
+    topBunEl.style.backgroundPosition = 'center top';
+    topBunEl.style.backgroundSize = '100% 200%';
+    burgerStack.appendChild(topBunEl);
+  } else {
+    burgerStack.appendChild(createLayerElement('top-bun-empty', 'bun', null, 'Top Bun'));
+  }
+
+  // Sauce
+  selectedIngredients['sauce'].forEach((sauce, idx) => {
+    const sauceEl = createLayerElement(`sauce-${idx}`, 'sauce', sauce.item, 'Sauce');
+    burgerStack.appendChild(sauceEl);
+  });
+  if (selectedIngredients['sauce'].length === 0) {
+    burgerStack.appendChild(createLayerElement('sauce-empty', 'sauce', null, 'Sauce'));
+  }
+
+  // Toppings
+  selectedIngredients['topping'].forEach((topping, idx) => {
+    burgerStack.appendChild(createLayerElement(`topping-${idx}`, 'topping', topping.item, 'Topping'));
+  });
+  if (selectedIngredients['topping'].length === 0) {
+    burgerStack.appendChild(createLayerElement('topping-empty', 'topping', null, 'Topping'));
+  }
+
+  // Cheese
+  selectedIngredients['cheese'].forEach((cheese, idx) => {
+    burgerStack.appendChild(createLayerElement(`cheese-${idx}`, 'cheese', cheese.item, 'Cheese'));
+  });
+  if (selectedIngredients['cheese'].length === 0) {
+    burgerStack.appendChild(createLayerElement('cheese-empty', 'cheese', null, 'Cheese'));
+  }
+
+  // Patty
+  selectedIngredients['patty'].forEach((patty, idx) => {
+    burgerStack.appendChild(createLayerElement(`patty-${idx}`, 'patty', patty.item, 'Patty'));
+  });
+  if (selectedIngredients['patty'].length === 0) {
+    burgerStack.appendChild(createLayerElement('patty-empty', 'patty', null, 'Patty'));
+  }
+
+  // Bottom bun
+  if (selectedIngredients['bun'].length > 0) {
+    const bunItem = selectedIngredients['bun'][0].item;
+    const bottomBunEl = createLayerElement('bottom-bun', 'bun', bunItem, 'Bottom Bun');
+    bottomBunEl.style.backgroundPosition = 'center bottom';
+    bottomBunEl.style.backgroundSize = '100% 200%';
+    burgerStack.appendChild(bottomBunEl);
+  } else {
+    burgerStack.appendChild(createLayerElement('bottom-bun-empty', 'bun', null, 'Bottom Bun'));
+  }
+
+  attachLayerListeners();
+}
+
+function createLayerElement(id, category, item, label) {
+  const layer = document.createElement('div');
+  layer.className = 'layer';
+  layer.id = id;
+  layer.dataset.category = category;
+  layer.dataset.label = label;
+  
+  if (item) {
+    layer.classList.add('filled');
+    layer.style.backgroundImage = `url(${item.image_url})`;
+    
+    // Special handling for buns - crop top and bottom
+    if (category === 'bun') {
+      if (id === 'top-bun') {
+        layer.style.backgroundPosition = 'center top';
+        layer.style.backgroundSize = '100% 200%';
+      } else if (id === 'bottom-bun') {
+        layer.style.backgroundPosition = 'center bottom';
+        layer.style.backgroundSize = '100% 200%';
+      }
+    }
+  
+    const canRemove = true; // All items are now removable
+    
+    if (canRemove) {
+      const removeBtn = document.createElement('button');
+      removeBtn.className = 'remove-btn';
+      removeBtn.innerHTML = '×';
+      removeBtn.onclick = (e) => {
+        e.stopPropagation();
+        removeLayer(id, category);
+      };
+      layer.appendChild(removeBtn);
+    }
+  } else {
+    layer.classList.add('empty');
+  }
+  
+  return layer;
+}
+
+function removeLayer(layerId, category) {
+  // Handle bun removal specially - remove the entire bun (both top and bottom)
+  if (category === 'bun') {
+    selectedIngredients['bun'] = [];
+    renderBurger();
+    updateTotalPrice();
+    
+    // Refresh the ingredient list to update quantities
+    if (activeCategory === 'bun') {
+      loadIngredients('bun');
+    }
+    return;
+  }
+  
+  const index = parseInt(layerId.split('-').pop());
+  if (!isNaN(index)) {
+    const removedItem = selectedIngredients[category][index]?.item;
+    selectedIngredients[category].splice(index, 1);
+
+    // Update ingredient quantity if it exists in tracking
+    if (removedItem && removedItem.id) {
+      const itemId = `${category}-${removedItem.id}`;
+      if (ingredientQuantities[itemId] && ingredientQuantities[itemId] > 0) {
+        ingredientQuantities[itemId]--;
+      }
+    }
+
+    renderBurger();
+    updateTotalPrice();
+    
+    // Refresh the ingredient list to update quantities
+    if (activeCategory === category) {
+      loadIngredients(category);
+    }
+  }
+}
+
+// The whole ingredient catalog is fetched once; switching categories is local.
+// Its versioned URL comes from the page, on this script's data-catalog-url.
+const ingredientCatalog = fetch(document.currentScript.dataset.catalogUrl)
+  .then(res => res.json())
+  .then(catalog => catalog.categories);
+
+function loadIngredients(category) {
+  ingredientCatalog
+    .then(categories => categories[category] || [])
+    .then(data => {
+      ingredientCardsDiv.innerHTML = '';
+      data.forEach(item => {
+        const itemId = `${category}-${item.id}`;
+        
+        // Calculate current quantity based on selectedIngredients
+        let currentQty = 0;
+        if (category === 'cheese' || category === 'topping' || category === 'patty') {
+          currentQty = selectedIngredients[category].filter(entry => 
+            String(entry.item.id) === String(item.id)
+          ).length;
+        }
+        
+        // Store in ingredientQuantities for display
+        ingredientQuantities[itemId] = currentQty;
+        
+        const card = document.createElement('div');
+        card.className = 'ingredient-card';
+        
+        const showQuantity = category === 'cheese' || category === 'topping' || category === 'patty';
+        
+        card.innerHTML = `
+          <div class="ingredient-info">
+            <span class="ingredient-name">${item.name}</span>
+            <span class="ingredient-description">${item.description}</span>
+            <span class="ingredient-price">$${item.price}</span>
+            ${item.is_healthy ? '<img class="healthy-icon" src="/static/images/healthyicon.png" alt="Healthy">' : ''}
+          </div>
+          <div class="ingredient-actions">
+            ${showQuantity ? `
+              <div class="quantity-control">
+                <button class="qty-btn qty-minus" data-item-id="${itemId}">-</button>
+                <span class="qty-display" data-item-id="${itemId}">${currentQty}</span>
+                <button class="qty-btn qty-plus" data-item-id="${itemId}">+</button>
+              </div>
+            ` : `<button class="add-btn" data-item-id="${itemId}">Add</button>`}
+          </div>
+        `;
+
+        // Quantity controls for cheese, topping, patty
+        if (showQuantity) {
+          const minusBtn = card.querySelector('.qty-minus');
+          const plusBtn = card.querySelector('.qty-plus');
+          const qtyDisplay = card.querySelector('.qty-display');
+          
+          minusBtn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            if (ingredientQuantities[itemId] > 0) {
+              ingredientQuantities[itemId]--;
+              qtyDisplay.textContent = ingredientQuantities[itemId];
+              updateIngredientQuantity(category, item, itemId);
+            }
+          });
+          
+          plusBtn.addEventListener('click', (e) => {
+            e.stopPropagation();
+            if (ingredientQuantities[itemId] < 10) {
+              ingredientQuantities[itemId]++;
+              qtyDisplay.textContent = ingredientQuantities[itemId];
+              updateIngredientQuantity(category, item, itemId);
+            }
+          });
+        } else {
+          // Add button for bun and sauce
+          const addBtn = card.querySelector('.add-btn');
+          addBtn.addEventListener('click', () => {
+            addIngredient(category, item, itemId);
+          });
+        }
+
+        ingredientCardsDiv.appendChild(card);
+      });
+    });
+}
+
+function attachLayerListeners() {
+  const layers = document.querySelectorAll('.layer');
+  layers.forEach(layer => {
+    layer.addEventListener('mouseenter', () => {
+      layers.forEach(l => l.classList.remove('active'));
+      layer.classList.add('active');
+      const category = layer.dataset.category;
+      activeCategory = category;
+      currentCategory.textContent = `Choose your ${category}`;
+      loadIngredients(category);
+    });
+  });
+}
+
+function addIngredient(category, item, itemId) {
+  if (item && item.id !== undefined && item.id !== null) item.id = String(item.id);
+
+  if (category === 'bun') {
+    // Update single bun item (used for both top & bottom visuals)
+    selectedIngredients['bun'] = [{ item: item }];
+  } else if (category === 'sauce') {
+    selectedIngredients['sauce'] = [{ item: item }];
+  }
+
+  renderBurger();
+  updateTotalPrice();
+}
+
+function updateIngredientQuantity(category, item, itemId) {
+  if (item && item.id !== undefined && item.id !== null) item.id = String(item.id);
+
+  const quantity = ingredientQuantities[itemId];
+  
+  // Remove ALL instances of this item from the category
+  selectedIngredients[category] = selectedIngredients[category].filter(entry => {
+    const entryId = entry.item && entry.item.id !== undefined && entry.item.id !== null ? String(entry.item.id) : '';
+    return entryId !== String(item.id);
+  });
+
+  // Add the item back 'quantity' times
+  for (let i = 0; i < quantity; i++) {
+    selectedIngredients[category].push({ item: item });
+  }
+
+  renderBurger();
+  updateTotalPrice();
+}
+
+function updateTotalPrice() {
+  let total = 0;
+  let breakdownHTML = '';
+  let itemCounts = {};
+
+  for (const [category, items] of Object.entries(selectedIngredients)) {
+    items.forEach(entry => {
+      if (!entry.item) return;
+
+      const price = Number(entry.item.price);
+      const safePrice = Number.isFinite(price) ? price : 0;
+      const name = entry.item.name || 'Unknown';
+      const itemId = entry.item.id;
+
+      // Count bun only once (shared for top & bottom)
+      if (category === 'bun' && itemCounts['bun']) return;
+
+      if (!itemCounts[name]) {
+        itemCounts[name] = { 
+          count: 0, 
+          price: safePrice,
+          itemId: itemId 
+        };
+      }
+      itemCounts[name].count++;
+      total += safePrice;
+    });
+  }
+
+  // Check if bun and patty are present
+  const hasBun = selectedIngredients['bun'].length > 0;
+  const hasPatty = selectedIngredients['patty'].length > 0;
+  const canPlaceOrder = hasBun && hasPatty;
+
+  if (Object.keys(itemCounts).length > 0) {
+    for (const [name, data] of Object.entries(itemCounts)) {
+      const itemTotal = data.price * data.count;
+      breakdownHTML += `
+        <div class="breakdown-item">
+          <span class="breakdown-label">${name} ${data.count > 1 ? `(x${data.count})` : ''}</span>
+          <span class="breakdown-price">$${itemTotal.toFixed(2)}</span>
+        </div>
+      `;
+    }
+    priceBreakdownEl.innerHTML = breakdownHTML;
+    
+    // Enable button only if bun and patty are present
+    if (canPlaceOrder) {
+      placeOrderBtn.disabled = false;
+      placeOrderBtn.title = '';
+    } else {
+      placeOrderBtn.disabled = true;
+      if (!hasBun && !hasPatty) {
+        placeOrderBtn.title = 'Please add a bun and at least one patty';
+      } else if (!hasBun) {
+        placeOrderBtn.title = 'Please add a bun';
+      } else if (!hasPatty) {
+        placeOrderBtn.title = 'Please add at least one patty';
+      }
+    }
+  } else {
+    priceBreakdownEl.innerHTML = '<div style="text-align: center; opacity: 0.7;">No ingredients added yet</div>';
+    placeOrderBtn.disabled = true;
+    placeOrderBtn.title = 'Please add ingredients to your burger';
+  }
+
+  priceTotalEl.textContent = `Total: $${total.toFixed(2)}`;
+  
+  // Update hidden form inputs
+  updateFormInputs(itemCounts);
+}
+
+function updateFormInputs(itemCounts) {
+  // Clear existing hidden inputs
+  hiddenInputsDiv.innerHTML = '';
+  
+  // Create hidden inputs for each item in the format expected by the backend
+  for (const [name, data] of Object.entries(itemCounts)) {
+    const itemId = data.itemId;
+    
+    // Only quantity_ID is submitted; the server prices the order itself.
+    const quantityInput = document.createElement('input');
+    quantityInput.type = 'hidden';
+    quantityInput.name = `quantity_${itemId}`;
+    quantityInput.value = data.count;
+    hiddenInputsDiv.appendChild(quantityInput);
+  }
+}
+
+// Form submission handler
+placeOrderForm.addEventListener('submit', function(e) {
+  // Check if bun is present
+  const hasBun = selectedIngredients['bun'].length > 0;
+  const hasPatty = selectedIngredients['patty'].length > 0;
+  
+  if (!hasBun || !hasPatty) {
+    e.preventDefault();
+    let message = 'Cannot place order: ';
+    if (!hasBun && !hasPatty) {
+      message += 'Please add a bun and at least one patty.';
+    } else if (!hasBun) {
+      message += 'Please add a bun.';
+    } else if (!hasPatty) {
+      message += 'Please add at least one patty.';
+    }
+    alert(message);
+    return false;
+  }
+  
+  // Disable button to prevent double submission
+  placeOrderBtn.disabled = true;
+  placeOrderBtn.textContent = 'Placing Order...';
+});
+
+// Initialize burger with empty state
+renderBurger();
+updateTotalPrice();
+
+// Load a default category when the page first loads
+window.addEventListener('DOMContentLoaded', () => {
+  const defaultCategory = 'bun';
+  const defaultLayer = document.querySelector(`[data-category="${defaultCategory}"]`);
+  if (defaultLayer) {
+    defaultLayer.classList.add('active');
+    currentCategory.textContent = `Choose your ${defaultCategory}`;
+    loadIngredients(defaultCategory);
+  }
+});
@@ -0,0 +1,396 @@
+// Page settings arrive on this script tag's data-* attributes.
+const historyConfig = document.currentScript.dataset;
+
+const statusFlow = {
+  Pending: {
+    display: "Your order has been received and is waiting to be prepared",
+    icon: "📋",
+    nextStatuses: ["Preparing"],
+  },
+  Preparing: {
+    display: "Your order is being prepared in our kitchen",
+    icon: "👨‍🍳",
+    nextStatuses: ["Ready for Pickup"],
+  },
+  "Ready for Pickup": {
+    display: "Your order is ready! Come pick it up",
+    icon: "📦",
+    nextStatuses: ["Delivered"],
+  },
+  Delivered: {
+    display: "Your order has been delivered successfully",
+    icon: "✓",
+    nextStatuses: [],
+  },
+  Cancelled: {
+    display: "This order has been cancelled",
+    icon: "✗",
+    nextStatuses: [],
+  },
+};
+
+function openStatusModal(orderId, currentStatus) {
+  const modal = document.getElementById("statusFlowModal");
+  modal.style.display = "block";
+  updateStatusFlow(currentStatus);
+}
+
+function closeStatusModal() {
+  const modal = document.getElementById("statusFlowModal");
+  modal.style.display = "none";
+}
+
+function updateStatusFlow(currentStatus) {
+  const allStatuses = [
+    "Pending",
+    "Preparing",
+    "Ready for Pickup",
+    "Delivered",
+  ];
+  const currentIndex = allStatuses.indexOf(currentStatus);
+
+  const colorMap = {
+    Pending: "#cc8400",
+    Preparing: "#084298",
+    "Ready for Pickup": "#997404",
+    Delivered: "#155724",
+  };
+
+  // Update flow circles with enhanced animations
+  allStatuses.forEach((status, index) => {
+    const element = document.getElementById(`flow-${getFlowId(status)}`);
+    if (element) {
+      const circle = element.querySelector(".flow-circle");
+
+      if (index < currentIndex) {
+        // Completed statuses - full opacity
+        element.style.opacity = "1";
+        element.style.transform = "scale(1)";
+        if (circle) {
+          circle.classList.remove("active");
+          circle.style.transform = "scale(1)";
+          circle.style.filter = "none";
+        }
+      } else if (index === currentIndex) {
+        // Current status - apply active class for pulsing animation
+        element.style.opacity = "1";
+        element.style.transform = "scale(1)";
+        if (circle) {
+          circle.classList.add("active");
+          circle.style.filter = `drop-shadow(0 0 12px ${colorMap[status]})`;
+        }
+      } else {
+        // Future statuses - slightly faded
+        element.style.opacity = "0.6";
+        element.style.transform = "scale(1)";
+        if (circle) {
+          circle.classList.remove("active");
+          circle.style.transform = "scale(1)";
+          circle.style.filter = "none";
+        }
+      }
+    }
+  });
+
+  // Update arrows - color completed ones
+  const arrows = document.querySelectorAll(".flow-arrow");
+  arrows.forEach((arrow, index) => {
+    if (index < currentIndex) {
+      arrow.style.color = colorMap[allStatuses[index]];
+      arrow.style.opacity = "1";
+    } else {
+      arrow.style.color = "#ddd";
+      arrow.style.opacity = "0.6";
+    }
+  });
+
+  // Update legend with emoji and description
+  const legend = document.getElementById("flowLegend");
+  if (statusFlow[currentStatus]) {
+    legend.innerHTML = `<strong>📍 Current Status:</strong> <em style="color: ${colorMap[currentStatus]}; font-weight: 600;">${currentStatus}</em> — ${statusFlow[currentStatus].display}`;
+  } else if (currentStatus === "Cancelled") {
+    legend.innerHTML = `<strong>⚠️ Status:</strong> <em style="color: #721c24; font-weight: 600;">Cancelled</em> — This order has been cancelled`;
+  }
+}
+
+function getFlowId(status) {
+  const mapping = {
+    Pending: "pending",
+    Preparing: "preparing",
+    "Ready for Pickup": "ready",
+    Delivered: "delivered",
+  };
+  return mapping[status] || status.toLowerCase();
+}
+
+// Close modal on Escape key
+document.addEventListener("keydown", function (event) {
+  if (event.key === "Escape") {
+    closeStatusModal();
+  }
+});
+
+function updateOrderStatus(orderId, newStatus) {
+  fetch("/status/update", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({
+      order_id: orderId,
+      status: newStatus,
+    }),
+  })
+    .then((response) => response.json())
+    .then((data) => {
+      if (data.success) {
+        patchOrderRow(orderId, newStatus);
+      } else {
+        // 409: another staff member moved this order first; the status
+        // stream has already patched the row with their change.
+        alert("Error: " + data.message);
+      }
+    })
+    .catch((error) => {
+      console.error("Error:", error);
+      alert("An error occurred while updating the order status.");
+    });
+}
+
+const statusClasses = {
+  Pending: "pending",
+  Preparing: "preparing",
+  "Ready for Pickup": "ready",
+  Delivered: "delivered",
+  Cancelled: "cancelled",
+};
+
+// Re-draws one order row for its new status without reloading the page.
+function patchOrderRow(orderId, status) {
+  const row = document.querySelector(`tr[data-order-id="${orderId}"]`);
+  if (!row) {
+    if (historyConfig.manageMode && status === "Pending") noteNewOrder();
+    return;
+  }
+  const badge = row.querySelector(".status-span");
+  badge.textContent = status;
+  badge.className = `status-span status-${statusClasses[status] || "other"}`;
+
+  const flowButton = row.querySelector("[data-flow-btn]");
+  if (flowButton) flowButton.onclick = () => openStatusModal(orderId, status);
+  const cancelButton = row.querySelector("[data-cancel-btn]");
+  if (cancelButton && !statusFlow[status].nextStatuses.length) {
+    const note = document.createElement("span");
+    note.className = "muted-note";
+    note.textContent =
+      status === "Delivered" ? "Cannot cancel" : "Already cancelled";
+    cancelButton.replaceWith(note);
+  }
+
+  const button = row.querySelector(".advance-btn");
+  if (!button) return;
+  const next = (statusFlow[status] || {}).nextStatuses || [];
+  if (next.length) {
+    button.innerHTML = "";
+    const icon = document.createElement("span");
+    icon.className = "advance-icon";
+    icon.textContent = statusFlow[next[0]].icon;
+    button.append(icon, " " + next[0]);
+    button.className = `advance-btn advance-btn--${statusClasses[next[0]]}`;
+    button.onclick = () => updateOrderStatus(orderId, next[0]);
+  } else {
+    const label = document.createElement("span");
+    label.textContent = `${statusFlow[status].icon} ${status}`;
+    label.style.fontWeight = "bold";
+    button.replaceWith(label);
+  }
+}
+
+// A new order is not on the board yet; staff reload to pick it up.
+function noteNewOrder() {
+  const banner = document.getElementById("new-orders-banner");
+  if (banner) banner.hidden = false;
+}
+
+const POLL_INTERVAL = 10000;
+
+// Position in /status/changes, starting from the cursor read when the page
+// was rendered so nothing that moved since then is missed.
+let changesCursor = historyConfig.changesCursor || "";
+
+// Live updates: the server pushes every status change for the orders on
+// this page, so nothing here needs a reload to stay current. A customer with
+// no order in progress gets no stream URL and nothing to watch.
+function watchOrders() {
+  if (!historyConfig.streamUrl) return;
+  if (!window.EventSource) {
+    pollChanges();
+    return;
+  }
+  const stream = new EventSource(historyConfig.streamUrl);
+  // The stream only carries changes made while it is connected: on every
+  // (re)connect, fetch whatever moved before it opened.
+  stream.addEventListener("open", () => catchUp());
+  stream.addEventListener("status", (event) => {
+    const change = JSON.parse(event.data);
+    patchOrderRow(change.order_id, change.status);
+    if (historyConfig.manageMode) scheduleBatchRefresh();
+  });
+  stream.addEventListener("resync", () => location.reload());
+  stream.addEventListener("error", () => {
+    // The browser retries dropped streams itself but gives up on a refused
+    // one (503 while the worker is at its stream limit): poll instead.
+    if (stream.readyState === EventSource.CLOSED) pollChanges();
+  });
+}
+
+// Applies one page of /status/changes from changesCursor and advances it.
+// Resolves to whether more changes are waiting.
+function fetchChanges() {
+  const query = changesCursor
+    ? `?since=${encodeURIComponent(changesCursor)}`
+    : "";
+  return fetch(historyConfig.changesUrl + query)
+    .then((response) => response.json())
+    .then((data) => {
+      if (!data.success) throw new Error(data.message);
+      data.orders.forEach((order) => patchOrderRow(order.id, order.status));
+      if (historyConfig.manageMode && data.orders.length) {
+        scheduleBatchRefresh();
+      }
+      changesCursor = data.cursor;
+      return data.has_more;
+    });
+}
+
+// One pass over the changes missed while the stream was not connected.
+function catchUp() {
+  fetchChanges()
+    .then((hasMore) => {
+      if (hasMore) catchUp();
+    })
+    .catch((error) => console.error("Error:", error));
+}
+
+// Fallback to the stream: asks /status/changes what moved every
+// POLL_INTERVAL, immediately while there are more pages.
+function pollChanges() {
+  fetchChanges()
+    .then((hasMore) => setTimeout(pollChanges, hasMore ? 0 : POLL_INTERVAL))
+    .catch((error) => {
+      console.error("Error:", error);
+      setTimeout(pollChanges, POLL_INTERVAL);
+    });
+}
+
+let batchRefreshTimer = null;
+
+function scheduleBatchRefresh() {
+  clearTimeout(batchRefreshTimer);
+  batchRefreshTimer = setTimeout(refreshPrepBatches, 1000);
+}
+
+watchOrders();
+
+// Re-fetches the kitchen batch proposal after status changes, and every
+// 30 seconds so held batches flip to "cook now" and new orders appear.
+function refreshPrepBatches() {
+  const list = document.getElementById("prep-batch-list");
+  if (!list) return;
+  fetch("/status/batches")
+    .then((response) => response.json())
+    .then((data) => {
+      if (!data.success) return;
+      list.innerHTML = "";
+      if (!data.batches.length) {
+        const empty = document.createElement("li");
+        empty.className = "muted-note";
+        empty.textContent = "Nothing to batch right now.";
+        list.append(empty);
+      }
+      data.batches.forEach((batch) => {
+        const item = document.createElement("li");
+        const title = document.createElement("strong");
+        title.textContent = `${batch.station} ${batch.quantity} × ${batch.name}`;
+        const due = batch.due_at.slice(11, 16);
+        item.append(
+          title,
+          ` for orders ${batch.order_ids.map((id) => "#" + id).join(", ")} — ` +
+            (batch.cook_now ? "cook now" : `hold until ${due} UTC`)
+        );
+        list.append(item);
+      });
+    })
+    .catch((error) => console.error("Error:", error));
+}
+if (document.getElementById("prep-batch-list")) {
+  setInterval(refreshPrepBatches, 30000);
+}
+
+function toggleBulkSelection(checked) {
+  document
+    .querySelectorAll(".bulk-select")
+    .forEach((box) => (box.checked = checked));
+}
+
+// One POST for every selected row; rows are patched in place from the
+// per-order results.
+function bulkUpdate(action) {
+  const ids = Array.from(document.querySelectorAll(".bulk-select:checked")).map(
+    (box) => Number(box.value)
+  );
+  if (!ids.length) {
+    alert("Select at least one order.");
+    return;
+  }
+  if (action === "cancel" && !confirm(`Cancel ${ids.length} order(s)?`)) return;
+
+  fetch("/status/bulk", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ order_ids: ids, action: action }),
+  })
+    .then((response) => response.json())
+    .then((data) => {
+      if (!data.success) {
+        alert("Error: " + data.message);
+        return;
+      }
+      const failed = [];
+      data.results.forEach((result) => {
+        patchOrderRow(result.id, result.status);
+        const box = document.querySelector(`.bulk-select[value="${result.id}"]`);
+        if (box) box.checked = !result.success;
+        if (!result.success) failed.push(`#${result.id}: ${result.message}`);
+      });
+      document.getElementById("bulk-result").textContent =
+        data.message + (failed.length ? " — " + failed.join("; ") : "");
+    })
+    .catch((error) => {
+      console.error("Error:", error);
+      alert("An error occurred while updating the orders.");
+    });
+}
+
+function cancelOrderRequest(orderId) {
+  if (confirm("Are you sure you want to cancel this order?")) {
+    fetch("/status/cancel/" + orderId, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+    })
+      .then((response) => response.json())
+      .then((data) => {
+        if (data.success) {
+          patchOrderRow(orderId, "Cancelled");
+        } else {
+          alert("Error: " + data.message);
+        }
+      })
+      .catch((error) => {
+        console.error("Error:", error);
+        alert("An error occurred while cancelling the order.");
+      });
+  }
+}
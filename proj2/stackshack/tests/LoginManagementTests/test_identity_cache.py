@@ -0,0 +1,92 @@
+import time
+import pytest
+from flask_login import AnonymousUserMixin
+from sqlalchemy import update
+from controllers.auth_controller import AuthController
+from controllers.identity_cache import STAFF_ROLES, IdentityCache, has_role
+from database.db import db
+from models.user import User
+
+
+@pytest.fixture
+def fresh_cache(app):
+    """Empty identity cache, restored TTL, inside an app context."""
+    with app.app_context():
+        app.extensions.pop("identity_cache", None)
+        ttl = app.config["IDENTITY_CACHE_TTL"]
+        yield app
+        app.config["IDENTITY_CACHE_TTL"] = ttl
+        app.extensions.pop("identity_cache", None)
+
+
+@pytest.fixture
+def cook(fresh_cache):
+    user = User(username="cache_cook", role="customer")
+    user.set_password("cookpass")
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    yield user_id
+    db.session.rollback()
+    user = db.session.get(User, user_id)
+    if user:
+        db.session.delete(user)
+        db.session.commit()
+
+
+def test_public_pages_need_no_db_connection(app, client, login, count_queries):
+    """Test a logged-in user's identity is served from the cache."""
+    # No app context is held here, so each request loads the user afresh.
+    app.extensions.pop("identity_cache", None)
+    login("test_customer", "customerpass")
+
+    with count_queries(app) as statements:
+        client.get("/")
+        client.get("/status/flow")
+        client.get("/")
+
+    assert statements == []
+
+
+def test_role_update_invalidates_cached_identity(cook):
+    """Test AuthController.update_user_role is visible immediately."""
+    assert IdentityCache.get(cook).role == "customer"
+
+    AuthController.update_user_role(cook, "staff")
+
+    assert IdentityCache.get(cook).role == "staff"
+
+
+def test_delete_user_invalidates_cached_identity(cook):
+    """Test a deleted user stops resolving at once."""
+    assert IdentityCache.get(cook) is not None
+
+    AuthController.delete_user(cook)
+
+    assert IdentityCache.get(cook) is None
+
+
+def test_entries_expire_after_ttl(cook, monkeypatch):
+    """Test out-of-band changes are picked up once the entry expires."""
+    IdentityCache.get(cook)
+    db.session.execute(update(User).where(User.id == cook).values(role="staff"))
+    db.session.commit()
+
+    assert IdentityCache.get(cook).role == "customer"
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert IdentityCache.get(cook).role == "staff"
+
+
+def test_has_role_never_queries(app, cook, count_queries):
+    """Test role checks read the loaded identity only."""
+    identity = IdentityCache.get(cook)
+    anonymous = AnonymousUserMixin()
+
+    with count_queries() as statements:
+        has_role(identity, *STAFF_ROLES)
+        has_role(anonymous, *STAFF_ROLES)
+
+    assert statements == []
+    assert has_role(identity, "customer") is True
+    assert has_role(anonymous, "customer") is False
@@ -0,0 +1,158 @@
+import pytest
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app import create_app
+from config import ProductionConfig, TestingConfig
+from controllers.login_throttle import (
+    LocalBucketStore,
+    LoginThrottle,
+    SqliteBucketStore,
+)
+
+
+@pytest.fixture
+def throttled(app, monkeypatch):
+    """Throttling on with small buckets and an empty store."""
+    monkeypatch.setitem(app.config, "LOGIN_THROTTLE_ENABLED", True)
+    monkeypatch.setitem(app.config, "LOGIN_THROTTLE_USER_BURST", 3)
+    monkeypatch.setitem(app.config, "LOGIN_THROTTLE_USER_PER_MINUTE", 3)
+    monkeypatch.setitem(app.config, "LOGIN_THROTTLE_IP_BURST", 5)
+    monkeypatch.setitem(app.config, "LOGIN_THROTTLE_IP_PER_MINUTE", 5)
+    app.extensions.pop("login_throttle", None)
+    yield app
+    app.extensions.pop("login_throttle", None)
+
+
+def _attempt(client, username, password="wrong", ip="10.0.0.1", headers=None):
+    return client.post(
+        "/auth/login",
+        data=dict(username=username, password=password),
+        environ_base={"REMOTE_ADDR": ip},
+        headers=headers,
+    )
+
+
+def test_over_limit_rejected_before_user_lookup(throttled, client, count_queries):
+    """Test refused attempts never reach the users table."""
+    for _ in range(3):
+        assert _attempt(client, "test_customer").status_code == 200
+
+    with count_queries(throttled) as statements:
+        response = _attempt(client, "test_customer", "customerpass")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+    assert b"Too many sign-in attempts" in response.data
+    assert not [s for s in statements if "users" in s]
+
+
+def test_username_limit_ignores_case(throttled, client):
+    """Test the username bucket is shared across spellings."""
+    for name in ("Test_Customer", "TEST_CUSTOMER", "test_customer"):
+        _attempt(client, name)
+
+    assert _attempt(client, "test_customer").status_code == 429
+
+
+def test_ip_limit_spans_usernames(throttled, client):
+    """Test one address cannot spray many usernames."""
+    for i in range(5):
+        assert _attempt(client, f"spray_{i}", ip="10.0.0.2").status_code == 200
+
+    assert _attempt(client, "spray_new", ip="10.0.0.2").status_code == 429
+    assert _attempt(client, "spray_new", ip="10.0.0.3").status_code == 200
+
+
+def test_rejected_attempt_spends_no_tokens():
+    """Test a refused attempt leaves the other bucket untouched."""
+    store = LocalBucketStore(max_keys=100)
+    limits = [("user:a", 1, 1.0), ("ip:x", 2, 1.0)]
+
+    assert store.take(limits, now=0) == 0
+    assert store.take(limits, now=0) == pytest.approx(1.0)
+    # The IP still has one token because the second attempt was refused.
+    assert store.take([("ip:x", 2, 1.0)], now=0) == 0
+
+
+def test_buckets_refill_and_expire():
+    """Test tokens come back over time and full buckets are dropped."""
+    store = LocalBucketStore(max_keys=100)
+    limits = [("user:a", 2, 0.5)]
+    store.take(limits, now=0)
+    store.take(limits, now=0)
+
+    assert store.take(limits, now=0) == pytest.approx(2.0)
+    assert store.take(limits, now=2) == 0
+    store.take([("user:b", 2, 0.5)], now=10)
+
+    assert len(store) == 1  # "user:a" was full again, so it was pruned
+
+
+def test_memory_is_bounded_by_max_keys():
+    """Test a flood of distinct keys cannot grow the store past its cap."""
+    store = LocalBucketStore(max_keys=50)
+    for i in range(1000):
+        store.take([(f"ip:{i}", 5, 0.5)], now=0)
+
+    assert len(store) == 50
+
+
+def test_trusted_proxy_hops_applies_proxy_fix(monkeypatch):
+    """Test TRUSTED_PROXY_HOPS wraps the app so X-Forwarded-For is used."""
+    assert not isinstance(create_app("testing").wsgi_app, ProxyFix)
+
+    monkeypatch.setattr(TestingConfig, "TRUSTED_PROXY_HOPS", 2)
+    middleware = create_app("testing").wsgi_app
+
+    assert isinstance(middleware, ProxyFix)
+    assert (middleware.x_for, middleware.x_proto) == (2, 2)
+
+
+def test_clients_behind_one_proxy_get_own_ip_buckets(throttled, client, monkeypatch):
+    """Test per-IP limits key on the forwarded client, not the proxy."""
+    monkeypatch.setattr(throttled, "wsgi_app", ProxyFix(throttled.wsgi_app, x_for=1))
+
+    def via_proxy(username, client_ip):
+        return _attempt(
+            client,
+            username,
+            ip="10.9.9.9",
+            headers={"X-Forwarded-For": client_ip},
+        )
+
+    for i in range(5):
+        assert via_proxy(f"spray_{i}", "203.0.113.5").status_code == 200
+    assert via_proxy("spray_new", "203.0.113.5").status_code == 429
+    assert via_proxy("spray_new", "203.0.113.6").status_code == 200
+
+
+def test_production_shares_buckets_between_workers():
+    """Test production defaults to the shared bucket file."""
+    assert ProductionConfig.LOGIN_THROTTLE_STORE_PATH
+
+
+def test_shared_store_limits_across_workers(tmp_path):
+    """Test two stores on one file draw from the same bucket."""
+    path = str(tmp_path / "throttle.db")
+    worker_a, worker_b = SqliteBucketStore(path), SqliteBucketStore(path)
+    limits = [("user:shared", 2, 0.1)]
+
+    assert worker_a.take(limits, now=100) == 0
+    assert worker_b.take(limits, now=100) == 0
+    assert worker_a.take(limits, now=100) > 0
+    assert worker_b.take(limits, now=120) == 0
+
+
+def test_store_path_selects_shared_store(throttled, tmp_path, monkeypatch):
+    """Test LOGIN_THROTTLE_STORE_PATH switches LoginThrottle to the file."""
+    monkeypatch.setitem(
+        throttled.config, "LOGIN_THROTTLE_STORE_PATH", str(tmp_path / "t.db")
+    )
+    with throttled.app_context():
+        for _ in range(3):
+            assert LoginThrottle.check("shared_user", "10.0.0.9")[0] is True
+        allowed, msg, retry_after = LoginThrottle.check("shared_user", "10.0.0.9")
+
+        assert isinstance(LoginThrottle.store(), SqliteBucketStore)
+    assert allowed is False
+    assert retry_after == 20
+    assert str(retry_after) in msg
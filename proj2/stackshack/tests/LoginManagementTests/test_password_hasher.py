@@ -0,0 +1,107 @@
+import pytest
+from controllers.auth_controller import AuthController
+from controllers.password_hasher import PasswordHasher, PasswordHasherBusy
+from database.db import db
+from models.user import User
+
+FAST_METHOD = "pbkdf2:sha256:1000"
+
+
+@pytest.fixture
+def ctx(app, monkeypatch):
+    """App context with a cheap hash method for speed."""
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_METHOD", FAST_METHOD)
+    with app.test_request_context():
+        yield app
+        db.session.rollback()
+        User.query.filter(User.username.like("hasher_%")).delete()
+        db.session.commit()
+
+
+def _user(name, password):
+    user = User(username=name, role="customer")
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_hash_uses_configured_method(ctx):
+    """Test new hashes carry PASSWORD_HASH_METHOD and verify."""
+    stored = PasswordHasher.hash("secret")
+
+    assert stored.startswith(FAST_METHOD + "$")
+    assert PasswordHasher.verify(stored, "secret") is True
+    assert PasswordHasher.verify(stored, "wrong") is False
+    assert PasswordHasher.needs_rehash(stored) is False
+    assert PasswordHasher.needs_rehash("scrypt:32768:8:1$salt$hash") is True
+
+
+def test_login_rehashes_when_method_changes(ctx, monkeypatch):
+    """Test a successful login upgrades a hash made with old settings."""
+    user = _user("hasher_old", "oldpass")
+    old_hash = user.password
+
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:2000")
+    success, _, _ = AuthController.login_user_account("hasher_old", "oldpass")
+
+    assert success is True
+    user = User.get_by_username("hasher_old")
+    assert user.password != old_hash
+    assert user.password.startswith("pbkdf2:sha256:2000$")
+    assert user.check_password("oldpass") is True
+
+
+def test_failed_login_does_not_rehash(ctx, monkeypatch):
+    """Test a wrong password leaves the stored hash alone."""
+    user = _user("hasher_keep", "keeppass")
+    old_hash = user.password
+
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_METHOD", "pbkdf2:sha256:2000")
+    AuthController.login_user_account("hasher_keep", "nope")
+
+    assert User.get_by_username("hasher_keep").password == old_hash
+
+
+def test_pool_hashes_in_worker_process(ctx, monkeypatch):
+    """Test hashing round-trips through the process pool."""
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_WORKERS", 1)
+    try:
+        stored = PasswordHasher.hash("pooled")
+        assert PasswordHasher.verify(stored, "pooled") is True
+    finally:
+        PasswordHasher.shutdown()
+
+
+def test_saturated_pool_rejects_fast(ctx, monkeypatch):
+    """Test logins are turned away instead of queued when slots run out."""
+    _user("hasher_busy", "busypass")
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_QUEUE", 0)
+    _, slots = PasswordHasher._executor(1)
+    slots.acquire()
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            PasswordHasher.verify("x", "y")
+        success, msg, _ = AuthController.login_user_account("hasher_busy", "busypass")
+    finally:
+        slots.release()
+        PasswordHasher.shutdown()
+
+    assert success is False
+    assert msg == AuthController.BUSY_MESSAGE
+
+
+def test_slots_built_once_per_pool(ctx, monkeypatch):
+    """Test the semaphore only changes together with the pool."""
+    monkeypatch.setitem(ctx.config, "PASSWORD_HASH_QUEUE", 2)
+    try:
+        pool, slots = PasswordHasher._executor(1)
+        assert PasswordHasher._executor(1) == (pool, slots)
+
+        monkeypatch.setitem(ctx.config, "PASSWORD_HASH_QUEUE", 3)
+        new_pool, new_slots = PasswordHasher._executor(1)
+        assert new_pool is not pool
+        assert new_slots is not slots
+    finally:
+        PasswordHasher.shutdown()
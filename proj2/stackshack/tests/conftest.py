@@ -0,0 +1,44 @@
+import pytest
+import sys
+import os
+from contextlib import contextmanager
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database.db import db
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Records the SQL sent to the database inside a ``with`` block:
+
+        with count_queries() as statements:
+            ...
+        assert len(statements) == 1
+
+    Pass ``app`` when no app context is held (e.g. around test-client
+    requests) and ``match`` to keep only the statements it returns True for.
+    """
+
+    @contextmanager
+    def recording(app=None, match=None):
+        if app is not None:
+            with app.app_context():
+                engine = db.engine
+        else:
+            engine = db.engine
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if match is None or match(statement):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return recording
@@ -0,0 +1,112 @@
+from flask_login import login_user
+from sqlalchemy import update
+from controllers.menu_catalog import MenuCatalog
+from controllers.menu_controller import MenuController
+from models.cache_version import CacheVersion
+from models.menu_item import MenuItem
+from database.db import db
+
+
+class TestMenuCatalog:
+    """Test the versioned in-process menu cache"""
+
+    def test_snapshot_views(self, app, multiple_menu_items):
+        """Test pre-sorted and pre-grouped views"""
+        snapshot = MenuCatalog.get()
+
+        assert [(i.category, i.name) for i in snapshot.items] == sorted(
+            (i.category, i.name) for i in multiple_menu_items
+        )
+        assert "Turkey Patty" not in [i.name for i in snapshot.available]
+        assert [i.name for i in snapshot.healthy] == ["Lettuce"]
+        assert [i.name for i in snapshot.by_category["patty"]] == [
+            "Beef Patty",
+            "Turkey Patty",
+        ]
+        assert [i.name for i in snapshot.available_by_category["patty"]] == [
+            "Beef Patty"
+        ]
+
+    def test_repeat_reads_do_not_query_menu_items(
+        self, app, multiple_menu_items, count_queries
+    ):
+        """Test a warm cache serves reads without touching menu_items"""
+        MenuCatalog.get()
+
+        with count_queries(match=lambda s: "menu_items" in s) as statements:
+            MenuController.get_available_items()
+            MenuController.get_healthy_choices()
+            MenuController.get_items_by_category("bun")
+
+        assert statements == []
+
+    def test_controller_mutation_bumps_version(
+        self, app, admin_user, multiple_menu_items
+    ):
+        """Test toggling availability is visible on the next read"""
+        before = MenuCatalog.get()
+        turkey = next(i for i in multiple_menu_items if i.name == "Turkey Patty")
+
+        with app.test_request_context():
+            login_user(admin_user)
+            success, _, _ = MenuController.toggle_availability(turkey.id)
+        assert success is True
+
+        after = MenuCatalog.get()
+        assert after.version == before.version + 1
+        assert "Turkey Patty" in [i.name for i in after.available]
+
+    def test_snapshot_kept_until_commit(self, app, multiple_menu_items):
+        """Test bumping alone does not drop the snapshot before commit"""
+        before = MenuCatalog.get()
+
+        MenuCatalog.bump_version()
+        assert MenuCatalog._state().snapshot is before
+
+        db.session.commit()
+        MenuCatalog.invalidate()
+        assert MenuCatalog.get().version == before.version + 1
+
+    def test_picks_up_version_bumped_by_another_worker(self, app, multiple_menu_items):
+        """Test a change committed elsewhere is seen once the version moves"""
+        db.session.add(CacheVersion(name=MenuCatalog.VERSION_NAME, version=1))
+        db.session.commit()
+        MenuCatalog.get()
+
+        # Simulate another worker: it changes the row and bumps the shared
+        # version, but this process's snapshot is never explicitly invalidated.
+        db.session.execute(
+            update(MenuItem)
+            .where(MenuItem.name == "Lettuce")
+            .values(is_healthy_choice=False)
+        )
+        db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == MenuCatalog.VERSION_NAME)
+            .values(version=CacheVersion.version + 1)
+        )
+        db.session.commit()
+
+        assert MenuCatalog.get().healthy == []
+
+    def test_check_interval_limits_version_reads(
+        self, app, multiple_menu_items, count_queries
+    ):
+        """Test the version row is not re-read inside the check interval"""
+        app.config["MENU_VERSION_CHECK_INTERVAL"] = 60
+        db.session.add(CacheVersion(name=MenuCatalog.VERSION_NAME, version=1))
+        db.session.commit()
+        MenuCatalog.get()
+
+        db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.name == MenuCatalog.VERSION_NAME)
+            .values(version=CacheVersion.version + 1)
+        )
+        db.session.commit()
+
+        with count_queries() as statements:
+            snapshot = MenuCatalog.get()
+
+        assert statements == []
+        assert snapshot.version == 1
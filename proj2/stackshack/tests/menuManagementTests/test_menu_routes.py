@@ -241,3 +241,15 @@ class TestMenuRoutes:
         # Check for the *actual* message from your template,
         # which was visible in the test failure log.
         assert b"We're stocking up on fresh ingredients" in response.data
+
+    def test_browse_menu_not_modified(self, app, client, multiple_menu_items):
+        """Test the browse page answers 304 when the menu has not changed."""
+        from controllers.menu_catalog import MenuCatalog
+        from routes.http_cache import menu_etag
+
+        etag = menu_etag("browse:None", MenuCatalog.get().available)
+
+        response = client.get("/menu/browse", headers={"If-None-Match": f'"{etag}"'})
+
+        assert response.status_code == 304
+        assert "private" in response.headers["Cache-Control"]
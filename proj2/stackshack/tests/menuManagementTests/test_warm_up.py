@@ -0,0 +1,94 @@
+import pytest
+from app import create_app, precompile_templates, warm_pool, warm_up
+from config import TestingConfig
+from database.db import db
+from database.pool import MeteredQueuePool
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """App on a SQLite file with a three-connection metered pool."""
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'w.db'}"
+    )
+    monkeypatch.setattr(
+        TestingConfig,
+        "SQLALCHEMY_ENGINE_OPTIONS",
+        {"poolclass": MeteredQueuePool, "pool_size": 3},
+        raising=False,
+    )
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_templates_reload_only_in_development():
+    """Test only the development profile re-checks templates on disk."""
+    assert create_app("testing").jinja_env.auto_reload is False
+    assert create_app("development").jinja_env.auto_reload is True
+
+
+def test_precompile_templates_fills_cache(app):
+    """Test every template is compiled before the first request."""
+    compiled = precompile_templates(app)
+
+    assert compiled == len(app.jinja_env.list_templates(extensions=["html"]))
+    assert compiled >= 10
+    assert len(app.jinja_env.cache) == compiled
+
+
+def test_warm_up_primes_catalog_and_releases_connections(file_app):
+    """Test the master keeps the catalog but no open connections."""
+    warm_up(file_app)
+
+    assert "menu_catalog" in file_app.extensions
+    assert file_app.extensions["prep_time_stats"].warm is True
+    with file_app.app_context():
+        assert db.engine.pool.checkedin() == 0
+        assert db.engine.pool.checkedout() == 0
+
+
+def test_warm_pool_opens_pool_size_connections(file_app):
+    """Test a worker opens its whole pool before taking requests."""
+    warm_pool(file_app)
+
+    with file_app.app_context():
+        assert db.engine.pool.checkedin() == 3
+        assert db.engine.pool.checkedout() == 0
+
+
+@pytest.fixture
+def bytecode_dir(tmp_path, monkeypatch):
+    path = tmp_path / "jinja"
+    monkeypatch.setattr(
+        TestingConfig, "JINJA_BYTECODE_CACHE_DIR", str(path), raising=False
+    )
+    return path
+
+
+def test_cli_precompiles_into_bytecode_cache(bytecode_dir):
+    """Test the deploy-time command writes one cache file per template."""
+    app = create_app("testing")
+
+    result = app.test_cli_runner().invoke(args=["precompile-templates"])
+
+    compiled = len(app.jinja_env.list_templates(extensions=["html"]))
+    assert result.exit_code == 0
+    assert f"Compiled {compiled} templates" in result.output
+    assert len(list(bytecode_dir.iterdir())) == compiled
+
+
+def test_restarted_worker_loads_bytecode(bytecode_dir, monkeypatch):
+    """Test a new app reuses the compiled templates instead of parsing."""
+    precompile_templates(create_app("testing"))
+    app = create_app("testing")
+
+    def compile_disallowed(*args, **kwargs):
+        raise AssertionError("template was recompiled")
+
+    monkeypatch.setattr(app.jinja_env, "compile", compile_disallowed)
+
+    assert precompile_templates(app) >= 10
@@ -0,0 +1,134 @@
+import json
+import os
+from decimal import Decimal
+from controllers.admission import AdmissionController, FileCounter
+from database.db import db
+from models.order import Order
+
+
+def _queue(user_id, count):
+    db.session.add_all(
+        Order(user_id=user_id, total_price=Decimal("1.00"), status="Pending")
+        for _ in range(count)
+    )
+    db.session.commit()
+
+
+class TestAdmissionController:
+    """Test queue-depth and concurrency limits on order placement."""
+
+    def test_admits_when_limits_disabled(self, app):
+        """Test the defaults never shed orders."""
+        assert AdmissionController.admit_order() == (True, "Order admitted.", 0)
+        AdmissionController.release()
+
+    def test_sheds_when_pending_queue_full(self, app, test_user):
+        """Test the retry time covers draining the queue under the limit."""
+        app.config.update(ADMISSION_MAX_PENDING=5, KITCHEN_CAPACITY=2)
+        _queue(test_user, 7)
+
+        admitted, msg, retry_after = AdmissionController.admit_order()
+
+        assert admitted is False
+        # 3 orders over the limit at 2 per 600 s batch.
+        assert retry_after == 1200
+        assert msg == "We're very busy right now. Please try again in 20 minutes."
+
+    def test_concurrency_limit_and_release(self, app):
+        """Test in-flight slots are reserved and freed."""
+        app.config["ADMISSION_MAX_CONCURRENT_ORDERS"] = 2
+
+        assert AdmissionController.admit_order()[0] is True
+        assert AdmissionController.admit_order()[0] is True
+        admitted, _, retry_after = AdmissionController.admit_order()
+        assert admitted is False
+        assert retry_after == 60
+
+        AdmissionController.release()
+        assert AdmissionController.admit_order()[0] is True
+
+    def test_file_counter_is_shared_and_drops_dead_workers(self, tmp_path):
+        """Test counts are summed across processes and dead pids ignored."""
+        path = str(tmp_path / "admission.json")
+        with open(path, "w") as counter_file:
+            # A live worker (pid 1 always exists) and one that has exited.
+            json.dump({"1": 3, "999999999": 5}, counter_file)
+        counter = FileCounter(path)
+
+        assert counter.add(1) == 4
+        assert counter.add(-1) == 3
+        with open(path) as counter_file:
+            assert str(os.getpid()) not in json.load(counter_file)
+
+
+class TestPlaceOrderAdmission:
+    """Test place_order sheds load before writing."""
+
+    def login(self, client):
+        return client.post(
+            "/auth/login",
+            data={"username": "testuser", "password": "testpassword123"},
+            follow_redirects=True,
+        )
+
+    def test_busy_response_before_any_write(
+        self, app, client, test_user, sample_menu_items, count_queries
+    ):
+        """Test a refused order redirects with Retry-After and writes nothing."""
+        app.config["ADMISSION_MAX_PENDING"] = 1
+        _queue(test_user, 1)
+        self.login(client)
+
+        with count_queries() as statements:
+            response = client.post(
+                "/orders/place", data={f"quantity_{sample_menu_items[0]}": "1"}
+            )
+
+        assert response.status_code == 302
+        assert response.headers["Retry-After"] == "600"
+        assert not [s for s in statements if not s.startswith("SELECT")]
+        assert Order.query.count() == 1
+
+    def test_busy_json_response(self, app, client, test_user, sample_menu_items):
+        """Test API clients get 503 with the retry message."""
+        app.config["ADMISSION_MAX_PENDING"] = 1
+        _queue(test_user, 1)
+        self.login(client)
+
+        response = client.post(
+            "/orders/place",
+            data={f"quantity_{sample_menu_items[0]}": "1"},
+            headers={"Accept": "application/json"},
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "600"
+        assert "try again in 10 minutes" in response.get_json()["message"]
+
+    def test_reads_unaffected_during_surge(self, app, client, test_user):
+        """Test order history still loads while orders are being shed."""
+        app.config["ADMISSION_MAX_PENDING"] = 1
+        _queue(test_user, 3)
+        self.login(client)
+
+        assert client.get("/orders/history").status_code == 200
+
+    def test_replay_skips_admission(self, app, client, test_user, sample_menu_items):
+        """Test a retried order is replayed even while new orders are shed."""
+        self.login(client)
+        form_data = {
+            f"quantity_{sample_menu_items[0]}": "1",
+            "idempotency_key": "retry-key",
+        }
+        client.post("/orders/place", data=form_data)
+        app.config["ADMISSION_MAX_PENDING"] = 1
+        app.config["ADMISSION_MAX_CONCURRENT_ORDERS"] = 1
+        AdmissionController.counter().add(1)
+
+        response = client.post("/orders/place", data=form_data, follow_redirects=True)
+
+        assert response.status_code == 200
+        assert b"placed successfully" in response.data
+        assert "Retry-After" not in response.headers
+        assert Order.query.count() == 1
+        assert AdmissionController.counter().add(0) == 1
@@ -1,9 +1,42 @@
 from decimal import Decimal
 from controllers.order_controller import OrderController
-from models.order import Order
+from models.idempotency_key import IdempotencyKey
+from models.order import Order, OrderItem
+from models.user import User
 from database.db import db
 
 
+def _add_orders(user_id, menu_item_id, count):
+    """Insert ``count`` orders with two lines each for ``user_id``."""
+    for i in range(count):
+        order = Order(user_id=user_id, total_price=Decimal("3.00"), status="Pending")
+        db.session.add(order)
+        db.session.flush()
+        for qty in (1, 2):
+            db.session.add(
+                OrderItem(
+                    order_id=order.id,
+                    menu_item_id=menu_item_id,
+                    name=f"Item {i}-{qty}",
+                    price=Decimal("1.00"),
+                    quantity=qty,
+                )
+            )
+    db.session.commit()
+
+
+def _is_order_write(statement):
+    return statement.startswith(("INSERT INTO order", "UPDATE order"))
+
+
+def _load_history(user_id):
+    """Load a user's history and serialize every line."""
+    db.session.expire_all()
+    _, _, orders = OrderController.get_user_orders(user_id, with_items=True)
+    for order in orders:
+        order.to_dict()
+
+
 class TestOrderController:
     """Test cases for OrderController methods."""
 
@@ -302,3 +335,143 @@ class TestOrderController:
             # Verify no new orders were created
             final_count = Order.query.count()
             assert final_count == initial_count
+
+    def test_get_user_orders_with_items_preloads_lines(
+        self, app, test_user, multiple_orders
+    ):
+        """Test with_items populates line_items for every order."""
+        with app.app_context():
+            success, _, orders = OrderController.get_user_orders(
+                test_user, with_items=True
+            )
+
+            assert success is True
+            for order in orders:
+                assert "line_items" in order.__dict__
+                assert len(order.line_items) == order.items.count()
+
+    def test_get_user_orders_with_items_query_count_is_flat(
+        self, app, test_user, sample_menu_items, count_queries
+    ):
+        """Test history loading cost does not grow with the number of orders."""
+        with app.app_context():
+            _add_orders(test_user, sample_menu_items[0], 2)
+            with count_queries() as small:
+                _load_history(test_user)
+
+            _add_orders(test_user, sample_menu_items[0], 20)
+            with count_queries() as large:
+                _load_history(test_user)
+
+            assert len(small) == len(large)
+            assert len(large) <= 2
+
+
+class TestCreateOrderBulkInsert:
+    """Test the executemany fast path for order lines"""
+
+    def test_bulk_path_uses_two_insert_statements(
+        self, app, test_user, sample_menu_items, count_queries
+    ):
+        """Test header and every line are written with two statements"""
+        item_data = [
+            (item_id, "1.25", 2, f"Item {item_id}") for item_id in sample_menu_items[:5]
+        ]
+
+        with count_queries(match=_is_order_write) as writes:
+            success, message, order = OrderController.create_new_order(
+                test_user, item_data
+            )
+
+        assert success is True
+        assert message == f"Order #{order.id} placed successfully."
+        assert len(writes) == 2
+        assert "orders" in writes[0]
+        assert "order_items" in writes[1]
+        assert order.total_price == Decimal("12.50")
+        assert [line.quantity for line in order.line_items] == [2] * 5
+
+    def test_bulk_and_unit_of_work_paths_match(self, app, test_user, sample_menu_items):
+        """Test both paths store identical orders"""
+        item_data = [
+            (sample_menu_items[0], "1.50", 1, "Classic Bun"),
+            (None, "5.00", 2, "Custom Burger"),
+            (sample_menu_items[1], "3.50", 0, "Beef Patty"),
+        ]
+
+        _, _, fast = OrderController.create_new_order(test_user, item_data)
+        _, _, slow = OrderController.create_new_order(test_user, item_data, bulk=False)
+
+        def rows(order):
+            return [
+                (i.menu_item_id, i.name, i.price, i.quantity) for i in order.line_items
+            ]
+
+        assert fast.total_price == slow.total_price == Decimal("11.50")
+        assert rows(fast) == rows(slow)
+
+
+class TestIdempotentCheckout:
+    """Test idempotency keys on order placement"""
+
+    def test_replayed_key_returns_original_order(
+        self, app, test_user, sample_menu_items, count_queries
+    ):
+        """Test a repeated key returns the first order without writing"""
+        cart = {sample_menu_items[0]: 1}
+        first = OrderController.checkout(test_user, cart, idempotency_key="k1")
+
+        with count_queries(match=_is_order_write) as writes:
+            second = OrderController.checkout(test_user, cart, idempotency_key="k1")
+
+        assert second[0] is True
+        assert second[1] == first[1]
+        assert second[2].id == first[2].id
+        assert writes == []
+        assert Order.query.count() == 1
+
+    def test_key_claimed_concurrently_replays(self, app, test_user, sample_menu_items):
+        """Test losing the unique-index race answers with the winner's order"""
+        item_data = [(sample_menu_items[0], "1.50", 1, "Classic Bun")]
+        _, _, winner = OrderController.create_new_order(
+            test_user, item_data, idempotency_key="race"
+        )
+
+        # The loser skipped the lookup (it ran before the winner committed)
+        # and goes straight to claiming the key.
+        success, message, order = OrderController.create_new_order(
+            test_user, item_data, idempotency_key="race"
+        )
+
+        assert success is True
+        assert order.id == winner.id
+        assert message == f"Order #{winner.id} placed successfully."
+        assert Order.query.count() == 1
+        assert OrderItem.query.count() == 1
+
+    def test_keys_are_scoped_per_user(self, app, test_user, sample_menu_items):
+        """Test the same key from two users places two orders"""
+        other = User(username="otheruser")
+        other.set_password("otherpassword123")
+        db.session.add(other)
+        db.session.commit()
+        cart = {sample_menu_items[0]: 1}
+
+        OrderController.checkout(test_user, cart, idempotency_key="shared")
+        OrderController.checkout(other.id, cart, idempotency_key="shared")
+
+        assert Order.query.count() == 2
+
+    def test_expired_keys_are_purged_and_reusable(
+        self, app, test_user, sample_menu_items
+    ):
+        """Test keys past the TTL are removed and no longer replay"""
+        cart = {sample_menu_items[0]: 1}
+        OrderController.checkout(test_user, cart, idempotency_key="old")
+        app.config["IDEMPOTENCY_KEY_TTL"] = -1
+
+        success, _, _ = OrderController.checkout(test_user, cart, idempotency_key="old")
+        assert success is True
+        assert Order.query.count() == 2
+        assert OrderController.purge_idempotency_keys() == 1
+        assert IdempotencyKey.query.count() == 0
@@ -1,3 +1,6 @@
+import re
+
+
 class TestCreateOrderPage:
     """Test cases for the create order page (create.html)."""
 
@@ -9,13 +12,25 @@ class TestCreateOrderPage:
             follow_redirects=True,
         )
 
+    def get_builder(self, client):
+        """
+        Fetches the builder page with its CSS/JS bundles appended to the body,
+        i.e. everything the browser ends up running for the page.
+        """
+        response = client.get("/orders/new")
+        bundles = re.findall(rb'(?:href|src)="(/assets/[^"]+)"', response.data)
+        response.set_data(
+            response.data + b"".join(client.get(url.decode()).data for url in bundles)
+        )
+        return response
+
     def test_create_page_loads(self, client, app, test_user, sample_menu_items):
         """Test that the create order page loads successfully."""
         # Login first
         self.login_user(client)
 
         # Now access the create page
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -29,7 +44,7 @@ class TestCreateOrderPage:
     ):
         """Test that burger builder elements are present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"burger-builder" in response.data or b"builder" in response.data.lower()
@@ -39,7 +54,7 @@ class TestCreateOrderPage:
     ):
         """Test that burger stack element is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"burger-stack" in response.data or b"stack" in response.data.lower()
@@ -49,7 +64,7 @@ class TestCreateOrderPage:
     ):
         """Test that ingredient cards container is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -62,7 +77,7 @@ class TestCreateOrderPage:
     ):
         """Test that total price display is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"total-price" in response.data or b"total" in response.data.lower()
@@ -72,7 +87,7 @@ class TestCreateOrderPage:
     ):
         """Test that place order button is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"place-order-btn" in response.data or b"Place Order" in response.data
@@ -80,7 +95,7 @@ class TestCreateOrderPage:
     def test_create_page_has_form(self, client, app, test_user, sample_menu_items):
         """Test that the order form is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"place-order-form" in response.data or b"<form" in response.data.lower()
@@ -88,7 +103,7 @@ class TestCreateOrderPage:
     def test_create_page_form_action(self, client, app, test_user, sample_menu_items):
         """Test that form has correct action URL."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"/orders/place" in response.data or b"/place" in response.data
@@ -98,7 +113,7 @@ class TestCreateOrderPage:
     ):
         """Test that page includes JavaScript functionality."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"<script>" in response.data or b"<script " in response.data
@@ -106,7 +121,7 @@ class TestCreateOrderPage:
     def test_create_page_has_styles(self, client, app, test_user, sample_menu_items):
         """Test that page includes CSS styles."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -120,7 +135,7 @@ class TestCreateOrderPage:
     ):
         """Test that current category header is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -132,7 +147,7 @@ class TestCreateOrderPage:
     ):
         """Test that price breakdown element is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -144,7 +159,7 @@ class TestCreateOrderPage:
     ):
         """Test that hidden inputs container is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"hidden-inputs" in response.data or b"hidden" in response.data.lower()
@@ -152,7 +167,7 @@ class TestCreateOrderPage:
     def test_create_page_burger_layers(self, client, app, test_user, sample_menu_items):
         """Test that burger layer structure is defined."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"layer" in response.data
@@ -162,7 +177,7 @@ class TestCreateOrderPage:
     ):
         """Test that ingredient category logic is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"bun" in response.data
@@ -173,7 +188,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has ingredient fetching functionality."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -186,7 +201,7 @@ class TestCreateOrderPage:
     ):
         """Test that add ingredient functionality is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"addIngredient" in response.data or b"add" in response.data.lower()
@@ -196,7 +211,7 @@ class TestCreateOrderPage:
     ):
         """Test that remove layer functionality is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"removeLayer" in response.data or b"remove" in response.data.lower()
@@ -206,7 +221,7 @@ class TestCreateOrderPage:
     ):
         """Test that quantity control functionality is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"quantity" in response.data.lower()
@@ -216,7 +231,7 @@ class TestCreateOrderPage:
     ):
         """Test that price update functionality is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"updateTotalPrice" in response.data or b"total-price" in response.data
@@ -226,7 +241,7 @@ class TestCreateOrderPage:
     ):
         """Test that selected ingredients tracking is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -239,7 +254,7 @@ class TestCreateOrderPage:
     ):
         """Test that form inputs generation functionality is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"updateFormInputs" in response.data or b"hidden-inputs" in response.data
@@ -249,7 +264,7 @@ class TestCreateOrderPage:
     ):
         """Test that form submission handler is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -261,7 +276,7 @@ class TestCreateOrderPage:
     ):
         """Test that window load initialization is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -274,7 +289,7 @@ class TestCreateOrderPage:
     ):
         """Test that default category loading is present."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"bun" in response.data
@@ -284,7 +299,7 @@ class TestCreateOrderPage:
     ):
         """Test that layer event listeners are attached."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -297,7 +312,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has responsive design elements."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"display: flex" in response.data or b"display:flex" in response.data
@@ -307,7 +322,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has visual feedback elements."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"transition" in response.data or b":hover" in response.data
@@ -317,7 +332,7 @@ class TestCreateOrderPage:
     ):
         """Test that page supports healthy icons."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -329,7 +344,7 @@ class TestCreateOrderPage:
     def test_create_page_image_display(self, client, app, test_user, sample_menu_items):
         """Test that page displays ingredient images."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -343,7 +358,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has price formatting logic."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"toFixed" in response.data or b"$" in response.data
@@ -353,7 +368,7 @@ class TestCreateOrderPage:
     ):
         """Test that page supports category switching."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -367,7 +382,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has layer creation functionality."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -379,7 +394,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has special handling for buns."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -391,7 +406,7 @@ class TestCreateOrderPage:
     def test_create_page_order_summary(self, client, app, test_user, sample_menu_items):
         """Test that page has order summary section."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"Order Summary" in response.data or b"summary" in response.data.lower()
@@ -401,7 +416,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has price breakdown display."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"breakdown" in response.data.lower()
@@ -411,7 +426,7 @@ class TestCreateOrderPage:
     ):
         """Test that page handles button disabled state."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -423,7 +438,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has order validation logic."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         # Page should have some validation
@@ -434,7 +449,7 @@ class TestCreateOrderPage:
     ):
         """Test that page has error handling."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -446,7 +461,7 @@ class TestCreateOrderPage:
     def test_create_page_loading_state(self, client, app, test_user, sample_menu_items):
         """Test that page handles loading states."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert (
@@ -458,8 +473,37 @@ class TestCreateOrderPage:
     def test_create_page_extends_base(self, client, app, test_user, sample_menu_items):
         """Test that page extends base template."""
         self.login_user(client)
-        response = client.get("/orders/new")
+        response = self.get_builder(client)
 
         assert response.status_code == 200
         assert b"<html" in response.data.lower()
         assert b"<body" in response.data.lower()
+
+    def test_create_page_loads_fingerprinted_bundles(
+        self, client, app, test_user, sample_menu_items
+    ):
+        """Test CSS/JS ship as immutable bundles instead of inline blocks."""
+        self.login_user(client)
+        page = client.get("/orders/new").data
+
+        bundles = re.findall(
+            rb'(?:href|src)="(/assets/(?:css|js)/orders-create\.\w{12}\.(?:css|js))"',
+            page,
+        )
+        assert len(bundles) == 2
+        assert b".burger-builder {" not in page
+        assert b"<script>" not in page
+        for url in bundles:
+            response = client.get(url.decode())
+            assert response.status_code == 200
+            assert "immutable" in response.headers["Cache-Control"]
+            assert "max-age=31536000" in response.headers["Cache-Control"]
+
+    def test_outdated_bundle_hash_is_not_cached(self, client, app):
+        """Test a page from before a deploy still loads, but uncached."""
+        response = client.get("/assets/css/orders-create.000000000000.css")
+
+        assert response.status_code == 200
+        assert b".burger-builder" in response.data
+        assert "immutable" not in response.headers["Cache-Control"]
+        assert client.get("/assets/css/missing.000000000000.css").status_code == 404
@@ -1,8 +1,10 @@
 from decimal import Decimal
+from sqlalchemy import inspect, text
 from datetime import datetime
 from models.order import Order, OrderItem
 from models.menu_item import MenuItem
 from database.db import db
+from database.migrations import ensure_columns, ensure_indexes, missing_indexes
 
 
 class TestOrderModel:
@@ -247,3 +249,55 @@ class TestOrderItemModel:
             # Check if order item is also deleted (cascade='all, delete-orphan')
             deleted_item = db.session.get(OrderItem, order_item_id)
             assert deleted_item is None  # Should be deleted due to cascade
+
+
+class TestQueryIndexes:
+    """Test cases for the model-declared secondary indexes."""
+
+    def test_create_all_builds_indexes(self, app):
+        """Test a fresh schema already has every declared index."""
+        with app.app_context():
+            with db.engine.connect() as connection:
+                assert missing_indexes(connection) == []
+
+    def test_ensure_indexes_adds_missing_and_is_idempotent(self, app):
+        """Test ensure_indexes recreates dropped indexes exactly once."""
+        with app.app_context():
+            with db.engine.begin() as connection:
+                for index in Order.__table__.indexes:
+                    index.drop(connection)
+
+            created = ensure_indexes()
+
+            assert sorted(created) == sorted(
+                index.name for index in Order.__table__.indexes
+            )
+            assert ensure_indexes() == []
+
+    def test_ensure_columns_adds_changed_at(self, app):
+        """Test ensure_columns adds a model column missing from the table."""
+        with app.app_context():
+            with db.engine.begin() as connection:
+                connection.execute(text("DROP INDEX ix_orders_changed_at"))
+                connection.execute(text("ALTER TABLE orders DROP COLUMN changed_at"))
+
+            assert ensure_columns() == ["orders.changed_at"]
+            assert ensure_columns() == []
+            assert ensure_indexes() == ["ix_orders_changed_at"]
+
+    def test_ensure_indexes_drops_retired_index(self, app):
+        """Test the old two-column board index is replaced, not kept."""
+        with app.app_context():
+            with db.engine.begin() as connection:
+                connection.execute(text("DROP INDEX ix_orders_status_ordered_at_id"))
+                connection.execute(
+                    text(
+                        "CREATE INDEX ix_orders_status_ordered_at "
+                        "ON orders (status, ordered_at)"
+                    )
+                )
+
+            assert ensure_indexes() == ["ix_orders_status_ordered_at_id"]
+            with db.engine.connect() as connection:
+                names = {i["name"] for i in inspect(connection).get_indexes("orders")}
+            assert "ix_orders_status_ordered_at" not in names
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from controllers.order_controller import OrderController
+from controllers.pricing_engine import PricingEngine, from_cents, to_cents
+
+
+class TestPricingEngine:
+    """Test server-side cart pricing"""
+
+    def test_cents_round_trip(self):
+        """Test prices convert to and from integer cents exactly"""
+        assert to_cents("1.99") == 199
+        assert to_cents(Decimal("3.50")) == 350
+        assert to_cents(0.1) == 10
+        assert from_cents(697) == Decimal("6.97")
+
+    def test_price_cart_uses_menu_prices(self, app, sample_menu_items):
+        """Test prices and names come from the menu, totals in cents"""
+        bun, patty, cheese = sample_menu_items[:3]
+
+        success, _, priced = PricingEngine.price_cart({bun: 1, patty: 2, cheese: 3})
+
+        assert success is True
+        assert priced["lines"] == [
+            (bun, 150, 1, "Classic Bun"),
+            (patty, 350, 2, "Beef Patty"),
+            (cheese, 100, 3, "Cheddar Cheese"),
+        ]
+        assert priced["total_cents"] == 150 + 700 + 300
+
+    def test_price_cart_single_query(self, app, sample_menu_items, count_queries):
+        """Test every line is resolved with one IN (...) query"""
+        with count_queries() as statements:
+            success, _, _ = PricingEngine.price_cart(
+                [(item_id, 1) for item_id in sample_menu_items[:5]]
+            )
+
+        assert success is True
+        assert len(statements) == 1
+        assert " IN " in statements[0]
+
+    def test_price_cart_from_catalog(self, app, sample_menu_items):
+        """Test the catalog path prices the same as the database path"""
+        cart = {item_id: 2 for item_id in sample_menu_items[:5]}
+
+        assert PricingEngine.price_cart(cart, use_catalog=True) == (
+            PricingEngine.price_cart(cart)
+        )
+
+    def test_price_cart_merges_duplicate_lines(self, app, sample_menu_items):
+        """Test repeated ids are merged and zero quantities dropped"""
+        bun, patty = sample_menu_items[:2]
+
+        success, _, priced = PricingEngine.price_cart(
+            [(str(bun), "1"), (bun, 2), (patty, 0)]
+        )
+
+        assert success is True
+        assert priced["lines"] == [(bun, 150, 3, "Classic Bun")]
+
+    def test_price_cart_rejects_unavailable_item(self, app, sample_menu_items):
+        """Test an unavailable item rejects the whole cart"""
+        success, message, priced = PricingEngine.price_cart(
+            {sample_menu_items[0]: 1, sample_menu_items[5]: 1}
+        )
+
+        assert success is False
+        assert "unavailable" in message
+        assert priced is None
+
+    def test_price_cart_rejects_unknown_item(self, app, sample_menu_items):
+        """Test an id that is not on the menu is rejected"""
+        success, message, _ = PricingEngine.price_cart({99999: 1})
+
+        assert success is False
+        assert "no longer on the menu" in message
+
+    def test_price_cart_empty_and_invalid(self, app):
+        """Test empty carts and non-numeric input are rejected"""
+        assert PricingEngine.price_cart({})[1] == "Order cannot be empty."
+        assert PricingEngine.price_cart([("abc", 1)])[0] is False
+
+    def test_checkout_places_order_at_menu_prices(
+        self, app, test_user, sample_menu_items
+    ):
+        """Test checkout stores server-side prices on the order"""
+        bun, patty = sample_menu_items[:2]
+
+        success, _, order = OrderController.checkout(test_user, {bun: 1, patty: 2})
+
+        assert success is True
+        assert order.total_price == Decimal("8.50")
+        assert [(i.name, i.price) for i in order.line_items] == [
+            ("Classic Bun", Decimal("1.50")),
+            ("Beef Patty", Decimal("3.50")),
+        ]
@@ -0,0 +1,137 @@
+import shutil
+from decimal import Decimal
+import pytest
+from app import create_app
+from config import TestingConfig
+from controllers.menu_controller import MenuController
+from database.db import db
+from models.menu_item import MenuItem
+from models.order import Order
+from models.user import User
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    App whose primary and replica are two SQLite files.
+
+    The replica starts as a copy of the seeded primary and is never written,
+    so anything written later is visible on the primary only. No app context
+    is held, so each request starts with fresh routing state.
+    """
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}"
+    )
+    monkeypatch.setattr(
+        TestingConfig, "SQLALCHEMY_BINDS", {"replica": f"sqlite:///{replica}"}
+    )
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        user = User(username="testuser")
+        user.set_password("testpassword123")
+        item = MenuItem(
+            name="Beef Patty",
+            price=Decimal("3.50"),
+            category="patty",
+            is_available=True,
+        )
+        db.session.add_all([user, item])
+        db.session.commit()
+        app.config["ITEM_ID"] = item.id
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    shutil.copy(primary, replica)
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # db is shared by every test app; later ones have no replica bind.
+    db.metadatas.pop("replica", None)
+
+
+class TestReadReplicaRouting:
+    """Test read-only controller calls are routed to the replica bind."""
+
+    def login(self, client):
+        return client.post(
+            "/auth/login",
+            data={"username": "testuser", "password": "testpassword123"},
+        )
+
+    def test_read_only_calls_use_replica(self, app):
+        """Test @read_only reads hit the replica and other reads the primary."""
+        with app.app_context():
+            db.session.add(
+                MenuItem(name="Late Bun", price=Decimal("1"), category="bun")
+            )
+            db.session.commit()
+        with app.app_context():
+            success, _, items = MenuController.get_all_items()
+
+            assert success is True
+            assert [item.name for item in items] == ["Beef Patty"]
+            assert MenuItem.query.count() == 2
+
+    def test_reads_after_write_in_same_request_use_primary(self, app):
+        """Test a request sees its own writes."""
+        with app.test_request_context():
+            db.session.add(
+                MenuItem(name="Late Bun", price=Decimal("1"), category="bun")
+            )
+            db.session.commit()
+            _, _, items = MenuController.get_all_items()
+
+            assert len(items) == 2
+
+    def test_history_after_place_order_reads_own_write(self, app):
+        """Test the redirect after placing an order shows the new order."""
+        client = app.test_client()
+        self.login(client)
+
+        response = client.post(
+            "/orders/place",
+            data={f"quantity_{app.config['ITEM_ID']}": "1"},
+            follow_redirects=True,
+        )
+
+        with app.app_context():
+            order_id = db.session.query(Order.id).scalar()
+        assert order_id is not None
+        assert f'data-order-id="{order_id}"'.encode() in response.data
+
+        # Another client has no stickiness and reads the lagging replica.
+        other = app.test_client()
+        self.login(other)
+        response = other.get("/orders/history")
+
+        assert f'data-order-id="{order_id}"'.encode() not in response.data
+
+    def test_stickiness_expires(self, app):
+        """Test the client returns to the replica after REPLICA_STICKY_SECONDS."""
+        app.config["REPLICA_STICKY_SECONDS"] = 0
+        client = app.test_client()
+        self.login(client)
+        client.post("/orders/place", data={f"quantity_{app.config['ITEM_ID']}": "1"})
+
+        response = client.get("/orders/history")
+
+        assert b'data-order-id="1"' not in response.data
+
+    def test_order_changes_ignore_lagging_replica(self, app):
+        """Test /status/changes serves writes the replica has not seen yet."""
+        watcher = app.test_client()
+        self.login(watcher)
+        cursor = watcher.get("/status/changes").get_json()["cursor"]
+
+        client = app.test_client()
+        self.login(client)
+        client.post("/orders/place", data={f"quantity_{app.config['ITEM_ID']}": "1"})
+
+        changes = watcher.get("/status/changes", query_string={"since": cursor})
+
+        assert [order["status"] for order in changes.get_json()["orders"]] == [
+            "Pending"
+        ]
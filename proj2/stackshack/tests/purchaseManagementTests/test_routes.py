@@ -1,5 +1,6 @@
 import json
 from decimal import Decimal
+from sqlalchemy import update
 from models.order import Order
 from models.menu_item import MenuItem
 from database.db import db
@@ -211,12 +212,12 @@ class TestOrderRoutes:
     def test_get_ingredients_partial_category_match(
         self, client, app, sample_menu_items
     ):
-        """Test ingredients endpoint with partial category matches."""
+        """Test partial category names no longer match (exact lookup)."""
         response = client.get("/orders/ingredients/top")
 
         assert response.status_code == 200
         data = json.loads(response.data)
-        assert isinstance(data, list)
+        assert data == []
 
     def test_get_ingredients_all_categories(self, client, app, sample_menu_items):
         """Test getting ingredients for all categories."""
@@ -246,6 +247,119 @@ class TestOrderRoutes:
         data = json.loads(response.data)
         assert isinstance(data, list)
 
+    def test_get_ingredients_cache_headers(self, client, app, sample_menu_items):
+        """Test ingredients responses carry validators and Cache-Control."""
+        response = client.get("/orders/ingredients/bun")
+
+        assert response.status_code == 200
+        assert response.headers.get("ETag")
+        assert response.headers.get("Last-Modified")
+        assert "public" in response.headers["Cache-Control"]
+        assert "max-age=" in response.headers["Cache-Control"]
+
+    def test_get_ingredients_not_modified(self, client, app, sample_menu_items):
+        """Test a matching If-None-Match returns 304 with no body."""
+        first = client.get("/orders/ingredients/bun")
+        etag = first.headers["ETag"]
+
+        second = client.get("/orders/ingredients/bun", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.headers["ETag"] == etag
+
+    def test_get_ingredients_etag_changes_with_category(
+        self, client, app, sample_menu_items
+    ):
+        """Test a change in one category only invalidates that category."""
+        bun_etag = client.get("/orders/ingredients/bun").headers["ETag"]
+        patty_etag = client.get("/orders/ingredients/patty").headers["ETag"]
+
+        with app.app_context():
+            from controllers.menu_catalog import MenuCatalog
+
+            db.session.add(
+                MenuItem(
+                    name="Brioche Bun",
+                    description="Buttery bun",
+                    price=Decimal("2.00"),
+                    category="bun",
+                    is_available=True,
+                )
+            )
+            MenuCatalog.bump_version()
+            db.session.commit()
+            MenuCatalog.invalidate()
+
+        bun = client.get("/orders/ingredients/bun", headers={"If-None-Match": bun_etag})
+        patty = client.get(
+            "/orders/ingredients/patty", headers={"If-None-Match": patty_etag}
+        )
+
+        assert bun.status_code == 200
+        assert bun.headers["ETag"] != bun_etag
+        assert patty.status_code == 304
+
+    def test_get_ingredient_catalog_groups_available_items(
+        self, client, app, sample_menu_items
+    ):
+        """Test the catalog returns every available ingredient by category."""
+        response = client.get("/orders/ingredients")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["version"]
+        categories = data["categories"]
+        assert set(categories) == {"bun", "patty", "cheese", "topping", "sauce"}
+        assert [item["name"] for item in categories["topping"]] == ["Lettuce"]
+        assert categories["bun"][0]["is_healthy"] is True
+
+    def test_get_ingredient_catalog_pinned_version_is_immutable(
+        self, client, app, sample_menu_items
+    ):
+        """Test the versioned catalog URL is served as immutable."""
+        version = json.loads(client.get("/orders/ingredients").data)["version"]
+
+        pinned = client.get(f"/orders/ingredients?v={version}")
+        stale = client.get("/orders/ingredients?v=outdated")
+
+        assert "immutable" in pinned.headers["Cache-Control"]
+        assert "max-age=31536000" in pinned.headers["Cache-Control"]
+        assert "immutable" not in stale.headers["Cache-Control"]
+
+    def test_get_ingredient_catalog_version_covers_content(
+        self, client, app, sample_menu_items
+    ):
+        """Test an edit that keeps ids and updated_at still moves the version."""
+        from controllers.menu_catalog import MenuCatalog
+
+        before = json.loads(client.get("/orders/ingredients").data)["version"]
+        with app.app_context():
+            db.session.execute(
+                update(MenuItem)
+                .where(MenuItem.id == sample_menu_items[0])
+                .values(price=Decimal("9.99"), updated_at=MenuItem.updated_at)
+            )
+            MenuCatalog.bump_version()
+            db.session.commit()
+            MenuCatalog.invalidate()
+
+        after = json.loads(client.get("/orders/ingredients").data)["version"]
+
+        assert after != before
+
+    def test_create_order_form_embeds_catalog_url(
+        self, client, app, test_user, sample_menu_items
+    ):
+        """Test the builder page points at the current catalog version."""
+        self.login(client)
+        version = json.loads(client.get("/orders/ingredients").data)["version"]
+
+        response = client.get("/orders/new")
+
+        assert response.status_code == 200
+        assert f"/orders/ingredients?v={version}".encode() in response.data
+
     # ==================== CREATE ORDER FORM TESTS ====================
 
     def test_create_order_form_requires_login(self, client):
@@ -618,7 +732,7 @@ class TestOrderRoutes:
     def test_place_order_with_very_high_price(
         self, client, app, test_user, sample_menu_items
     ):
-        """Test placing order with very high price."""
+        """Test that a tampered client price is ignored."""
         self.login(client)
 
         with app.app_context():
@@ -627,7 +741,7 @@ class TestOrderRoutes:
             form_data = {
                 f"quantity_{bun.id}": "1",
                 f"price_{bun.id}": "999999.99",
-                f"name_{bun.id}": bun.name,
+                f"name_{bun.id}": "Free Burger",
             }
 
         response = client.post("/orders/place", data=form_data, follow_redirects=True)
@@ -640,8 +754,58 @@ class TestOrderRoutes:
                 .order_by(Order.ordered_at.desc())
                 .first()
             )
-            if order:
-                assert order.total_price == Decimal("999999.99")
+            assert order.total_price == Decimal("1.50")
+            assert order.items.first().name == "Classic Bun"
+
+    def test_place_order_unavailable_item_rejected(
+        self, client, app, test_user, sample_menu_items
+    ):
+        """Test that an unavailable item rejects the order."""
+        self.login(client)
+
+        form_data = {
+            f"quantity_{sample_menu_items[0]}": "1",
+            f"quantity_{sample_menu_items[5]}": "1",
+        }
+
+        response = client.post("/orders/place", data=form_data, follow_redirects=True)
+
+        assert response.status_code == 200
+        assert b"currently unavailable" in response.data
+        with app.app_context():
+            assert Order.query.filter_by(user_id=test_user).count() == 0
+
+    def test_place_order_double_submit_places_one_order(
+        self, client, app, test_user, sample_menu_items
+    ):
+        """Test resubmitting the same builder form does not duplicate the order."""
+        self.login(client)
+        page = client.get("/orders/new").data.decode()
+        key = page.split('name="idempotency_key" value="')[1].split('"')[0]
+        form_data = {f"quantity_{sample_menu_items[0]}": "1", "idempotency_key": key}
+
+        first = client.post("/orders/place", data=form_data)
+        second = client.post("/orders/place", data=form_data, follow_redirects=True)
+
+        assert first.status_code == 302
+        assert b"placed successfully" in second.data
+        with app.app_context():
+            assert Order.query.filter_by(user_id=test_user).count() == 1
+
+    def test_place_order_idempotency_key_header(
+        self, client, app, test_user, sample_menu_items
+    ):
+        """Test API clients can send the key as an Idempotency-Key header."""
+        self.login(client)
+        form_data = {f"quantity_{sample_menu_items[0]}": "1"}
+        headers = {"Idempotency-Key": "retry-1"}
+
+        client.post("/orders/place", data=form_data, headers=headers)
+        client.post("/orders/place", data=form_data, headers=headers)
+        client.post("/orders/place", data=form_data)
+
+        with app.app_context():
+            assert Order.query.filter_by(user_id=test_user).count() == 2
 
     def test_place_order_mixed_valid_invalid_items(
         self, client, app, test_user, sample_menu_items
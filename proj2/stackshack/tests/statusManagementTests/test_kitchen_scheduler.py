@@ -0,0 +1,173 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from controllers.kitchen_scheduler import KitchenScheduler, plan_batches
+from controllers.order_controller import OrderController
+from controllers.status_controller import StatusController
+from database.db import db
+from models.menu_item import MenuItem
+from models.order import Order
+
+
+@pytest.fixture
+def patties(app):
+    """A batchable patty and a non-batchable topping."""
+    items = [
+        MenuItem(name="Beef Patty", category="patty", price=3, is_available=True),
+        MenuItem(name="Lettuce", category="topping", price=1, is_available=True),
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    app.config["KITCHEN_BATCH_SIZE"] = 4
+    return [item.id for item in items]
+
+
+def _place(user_id, beef_id, quantity, lettuce_id=None):
+    lines = [(beef_id, "3.00", quantity, "Beef Patty")]
+    if lettuce_id:
+        lines.append((lettuce_id, "1.00", 1, "Lettuce"))
+    _, _, order = OrderController.create_new_order(user_id, lines)
+    return order.id
+
+
+class TestPlanBatches:
+    """Test packing queued units into batches."""
+
+    def test_packs_oldest_first_and_holds_partial_batch(self):
+        """Test full batches cook now and the remainder waits for max_wait."""
+        start = datetime(2025, 1, 1, 12, 0)
+        demand = {
+            7: {
+                101: (start, 2),
+                103: (start + timedelta(minutes=1), 3),
+                104: (start + timedelta(minutes=2), 1),
+            }
+        }
+
+        batches = plan_batches(
+            demand,
+            {7: ("Grill", "Beef Patty")},
+            batch_size=4,
+            max_wait=timedelta(minutes=5),
+            now=start + timedelta(minutes=3),
+        )
+
+        assert [(b.quantity, b.order_ids, b.cook_now) for b in batches] == [
+            (4, [101, 103], True),
+            (2, [103, 104], False),
+        ]
+        assert batches[1].due_at == start + timedelta(minutes=6)
+
+    def test_partial_batch_due_after_max_wait(self):
+        """Test a partial batch is released once its oldest order waited."""
+        start = datetime(2025, 1, 1, 12, 0)
+        batches = plan_batches(
+            {7: {101: (start, 1)}},
+            {7: ("Grill", "Beef Patty")},
+            batch_size=12,
+            max_wait=timedelta(minutes=5),
+            now=start + timedelta(minutes=5),
+        )
+
+        assert batches[0].cook_now is True
+
+
+class TestKitchenScheduler:
+    """Test the incremental queue behind the batch proposal."""
+
+    def test_proposes_batches_for_batchable_items(
+        self, app, test_customer_user, patties
+    ):
+        """Test only KITCHEN_BATCH_STATIONS categories are batched."""
+        beef, lettuce = patties
+        first = _place(test_customer_user, beef, 2, lettuce)
+        second = _place(test_customer_user, beef, 3)
+
+        success, _, batches = KitchenScheduler.propose_batches()
+
+        assert success is True
+        assert [(b.station, b.name, b.quantity, b.order_ids) for b in batches] == [
+            ("Grill", "Beef Patty", 4, [first, second]),
+            ("Grill", "Beef Patty", 1, [second]),
+        ]
+
+    def test_refresh_reads_only_changed_orders(
+        self, app, test_customer_user, patties, count_queries
+    ):
+        """Test new and advanced orders are folded in without a reload."""
+        beef, _ = patties
+        first = _place(test_customer_user, beef, 1)
+        KitchenScheduler.propose_batches()
+
+        second = _place(test_customer_user, beef, 1)
+        StatusController.update_order_status(first, "Preparing")
+        StatusController.update_order_status(first, "Ready for Pickup")
+        with count_queries() as statements:
+            assert KitchenScheduler.refresh() == 2
+
+        # The overlap re-read and one delta read of orders, plus selectin loads
+        # of their lines.
+        assert len([s for s in statements if "FROM orders" in s]) == 2
+        _, _, batches = KitchenScheduler.propose_batches()
+        assert [b.order_ids for b in batches] == [[second]]
+
+    def test_idle_refresh_is_two_range_reads(
+        self, app, test_customer_user, patties, count_queries
+    ):
+        """Test a refresh with no recent changes costs two indexed reads."""
+        order_id = _place(test_customer_user, patties[0], 1)
+        db.session.execute(
+            update(Order)
+            .where(Order.id == order_id)
+            .values(changed_at=datetime.utcnow() - timedelta(minutes=5))
+        )
+        db.session.commit()
+        KitchenScheduler.refresh()
+        with count_queries() as statements:
+            assert KitchenScheduler.refresh() == 0
+
+        # The (empty) overlap re-read and read past the cursor.
+        assert len(statements) == 2
+
+
+class TestPrepBatchRoutes:
+    """Test the batch endpoint and the manage view panel."""
+
+    def login(self, client, username, password):
+        return client.post(
+            "/auth/login",
+            data={"username": username, "password": password},
+            follow_redirects=True,
+        )
+
+    def test_staff_batches_json(self, client, test_staff_user, patties):
+        """Test staff get the proposal as JSON."""
+        order_id = _place(test_staff_user, patties[0], 5)
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/batches")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [(b["quantity"], b["order_ids"]) for b in data["batches"]] == [
+            (4, [order_id]),
+            (1, [order_id]),
+        ]
+
+    def test_customer_cannot_read_batches(self, client, test_customer_user):
+        """Test customers are refused."""
+        self.login(client, "customer1", "password123")
+
+        assert client.get("/status/batches").status_code == 403
+
+    def test_manage_view_shows_batches(self, client, test_staff_user, patties):
+        """Test the staff board renders the batch panel."""
+        order_id = _place(test_staff_user, patties[0], 2)
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/manage")
+
+        assert b"Prep Batches" in response.data
+        assert b"Grill 2 &times; Beef Patty" in response.data
+        assert f"#{order_id}".encode() in response.data
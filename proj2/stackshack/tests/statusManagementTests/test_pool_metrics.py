@@ -0,0 +1,136 @@
+import os
+import pytest
+from sqlalchemy import create_engine, exc, text
+from config import ProductionConfig, pymysql_connect_args
+from database.pool import MeteredQueuePool, pool_metrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File-backed engine with a one-connection metered pool."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    """Test connection pool metrics and the production pool profile."""
+
+    def login(self, client, username, password):
+        return client.post(
+            "/auth/login", data={"username": username, "password": password}
+        )
+
+    def test_production_pool_options(self):
+        """Test production gets a sized, pre-pinged, recycled pool."""
+        options = ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS
+
+        assert options["poolclass"] is MeteredQueuePool
+        assert options["pool_pre_ping"] is True
+        assert 0 < options["pool_recycle"] < 28800  # MySQL wait_timeout
+        assert options["pool_size"] > 0
+        assert "max_execution_time" in options["connect_args"]["init_command"]
+
+    def test_connect_args_only_for_pymysql(self):
+        """Test other drivers are not handed PyMySQL-only options."""
+        assert pymysql_connect_args("mysql+pymysql://u:p@db/x")["read_timeout"] > 0
+        assert pymysql_connect_args("postgresql://u:p@db/x") == {}
+        assert pymysql_connect_args("sqlite:///x.db") == {}
+
+    def test_counts_checked_out_connections(self, engine):
+        """Test in-use connections and checkout totals are reported."""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            busy = pool_metrics(engine)
+        idle = pool_metrics(engine)
+
+        assert busy["checked_out"] == 1
+        assert idle["checked_out"] == 0
+        assert idle["checked_in"] == 1
+        assert idle["size"] == 1
+        assert idle["max_overflow"] == 0
+        assert idle["checkouts"] == 1
+        assert idle["timeouts"] == 0
+
+    def test_exhausted_pool_records_timeout(self, engine):
+        """Test a checkout that gives up counts as a timeout and a wait."""
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        metrics = pool_metrics(engine)
+
+        assert metrics["timeouts"] == 1
+        assert metrics["wait_seconds_max"] >= 0.05
+
+    def test_stats_survive_dispose(self, engine):
+        """Test recreating the pool keeps the running totals."""
+        engine.connect().close()
+        engine.dispose()
+        engine.connect().close()
+
+        assert pool_metrics(engine)["checkouts"] == 2
+
+    def test_endpoint_staff_only(self, client, test_staff_user, test_customer_user):
+        """Test customers are refused and staff see this worker's pool."""
+        self.login(client, "customer1", "password123")
+        assert client.get("/status/pool").status_code == 403
+
+        client.get("/auth/logout")
+        self.login(client, "staff1", "staffpass123")
+        response = client.get("/status/pool")
+
+        assert response.status_code == 200
+        assert response.get_json()["pool"]["pool"] == "StaticPool"
+
+    def test_endpoint_token_and_prometheus(self, app, client):
+        """Test monitoring can scrape with METRICS_TOKEN and no login."""
+        app.config["METRICS_TOKEN"] = "scrape-me"
+
+        assert client.get("/status/pool").status_code == 403
+        response = client.get(
+            "/status/pool?format=prometheus",
+            headers={"Authorization": "Bearer scrape-me"},
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert response.headers["Cache-Control"] == "no-store"
+
+    def test_prometheus_type_lines(self, app, client, engine, monkeypatch):
+        """Test every sample is preceded by its counter or gauge type."""
+        app.config["METRICS_TOKEN"] = "scrape-me"
+        engine.connect().close()
+        monkeypatch.setattr(
+            "routes.status_routes.pool_metrics", lambda _: pool_metrics(engine)
+        )
+
+        body = client.get(
+            "/status/pool?format=prometheus",
+            headers={"Authorization": "Bearer scrape-me"},
+        ).get_data(as_text=True)
+
+        lines = body.splitlines()
+        labels = f'{{pid="{os.getpid()}",pool="MeteredQueuePool"}}'
+        assert lines[:2] == [
+            "# TYPE stackshack_db_pool_size gauge",
+            f"stackshack_db_pool_size{labels} 1",
+        ]
+        assert "# TYPE stackshack_db_pool_checkouts counter" in lines
+        assert "# TYPE stackshack_db_pool_wait_seconds_max gauge" in lines
+        assert len(lines) == 2 * (len(pool_metrics(engine)) - 2)
+
+    def test_endpoint_non_ascii_token_is_refused(self, app, client):
+        """Test a non-ASCII Authorization header is a 403, not an error."""
+        app.config["METRICS_TOKEN"] = "scrape-me"
+
+        response = client.get(
+            "/status/pool", headers={"Authorization": "Bearer sçrape-me"}
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,245 @@
+import json
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from controllers.prep_time_stats import PrepTimeStats, QuantileSketch
+from controllers.status_controller import StatusController
+from database.db import db
+from models.order import Order
+from models.order_status_event import OrderStatusEvent
+
+
+def _totals(rows):
+    """Merge hourly rows into {state: count} for assertions."""
+    totals = {}
+    for row in rows:
+        for status, summary in row["states"].items():
+            totals[status] = totals.get(status, 0) + summary["count"]
+    return totals
+
+
+class TestQuantileSketch:
+    """Test the streaming quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Test p50/p90/p99 stay within 1% of the exact values."""
+        rng = random.Random(14)
+        values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        values.sort()
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+    def test_memory_grows_with_range_not_samples(self):
+        """Test a day's worth of second-resolution values fits few buckets."""
+        sketch = QuantileSketch()
+        for seconds in range(1, 86400):
+            sketch.add(seconds)
+
+        assert sketch.count == 86399
+        assert len(sketch.buckets) < 600
+
+    def test_empty_and_zero(self):
+        """Test an empty sketch and zero durations."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+
+        sketch.add(0)
+        assert sketch.quantile(0.5) == 0.0
+
+
+class TestStatusEventLog:
+    """Test every status transition is appended to order_status_events."""
+
+    def _events(self, order_id):
+        return [
+            (e.from_status, e.to_status)
+            for e in OrderStatusEvent.query.filter_by(order_id=order_id).order_by(
+                OrderStatusEvent.id
+            )
+        ]
+
+    def test_update_and_cancel_are_logged(self, app, test_customer_user, pending_order):
+        """Test single updates and cancellation each write one event."""
+        StatusController.update_order_status(pending_order, "Preparing")
+        StatusController.cancel_order(pending_order, test_customer_user)
+
+        assert self._events(pending_order) == [
+            ("Pending", "Preparing"),
+            ("Preparing", "Cancelled"),
+        ]
+
+    def test_failed_update_is_not_logged(self, app, pending_order):
+        """Test a rejected transition leaves the log untouched."""
+        StatusController.update_order_status(pending_order, "Preparing")
+        StatusController.update_order_status(pending_order, "Preparing")
+
+        assert self._events(pending_order) == [("Pending", "Preparing")]
+
+    def test_bulk_update_is_logged(self, app, pending_order, preparing_order):
+        """Test a bulk advance logs one event per moved order."""
+        StatusController.bulk_update_status([pending_order, preparing_order], "advance")
+
+        assert self._events(pending_order) == [("Pending", "Preparing")]
+        assert self._events(preparing_order) == [("Preparing", "Ready for Pickup")]
+
+
+class TestPrepTimeStats:
+    """Test the incremental per-hour time-in-state aggregator."""
+
+    def _order(self, user_id, ordered_at):
+        order = Order(
+            user_id=user_id,
+            total_price=Decimal("1.00"),
+            status="Pending",
+            ordered_at=ordered_at,
+        )
+        db.session.add(order)
+        db.session.commit()
+        return order.id
+
+    def _log(self, order_id, from_status, to_status, changed_at):
+        db.session.add(
+            OrderStatusEvent(
+                order_id=order_id,
+                from_status=from_status,
+                to_status=to_status,
+                changed_at=changed_at,
+            )
+        )
+        db.session.commit()
+
+    def test_time_in_state_from_event_log(self, app, test_customer_user):
+        """Test durations come from ordered_at and the previous event."""
+        now = datetime.utcnow()
+        order_id = self._order(test_customer_user, now - timedelta(minutes=10))
+        self._log(order_id, "Pending", "Preparing", now - timedelta(minutes=8))
+        self._log(order_id, "Preparing", "Ready for Pickup", now - timedelta(minutes=3))
+
+        success, _, rows = PrepTimeStats.get_hourly(hours=2)
+
+        assert success is True
+        assert _totals(rows) == {"Pending": 1, "Preparing": 1}
+        summaries = {
+            status: summary for row in rows for status, summary in row["states"].items()
+        }
+        assert abs(summaries["Pending"]["p50"] - 120) <= 1.2
+        assert abs(summaries["Preparing"]["p99"] - 300) <= 3
+
+    def test_refresh_reads_only_new_events(
+        self, app, test_customer_user, count_queries
+    ):
+        """Test a warm aggregator folds in new events without a rescan."""
+        now = datetime.utcnow()
+        order_id = self._order(test_customer_user, now - timedelta(minutes=10))
+        self._log(order_id, "Pending", "Preparing", now - timedelta(minutes=8))
+        assert PrepTimeStats.refresh() == 1
+        assert PrepTimeStats.refresh() == 0
+
+        self._log(order_id, "Preparing", "Ready for Pickup", now - timedelta(minutes=3))
+        with count_queries() as statements:
+            assert PrepTimeStats.refresh() == 1
+
+        # The known order needs no lookup: one read of new events, one empty.
+        assert len(statements) == 2
+        assert all("order_status_events.id > ?" in s for s in statements)
+        assert _totals(PrepTimeStats.get_hourly(hours=2)[2]) == {
+            "Pending": 1,
+            "Preparing": 1,
+        }
+
+    def test_refresh_waits_for_late_commits(self, app, test_customer_user):
+        """Test an event committed after a higher id is still folded in."""
+        app.config["PREP_STATS_SETTLE_SECONDS"] = 60
+        now = datetime.utcnow()
+        first = self._order(test_customer_user, now - timedelta(minutes=10))
+        second = self._order(test_customer_user, now - timedelta(minutes=10))
+        # Event 2 commits first; event 1 is still in flight.
+        db.session.add(
+            OrderStatusEvent(
+                id=2,
+                order_id=second,
+                from_status="Pending",
+                to_status="Preparing",
+                changed_at=now - timedelta(seconds=20),
+            )
+        )
+        db.session.commit()
+        assert PrepTimeStats.refresh() == 0
+
+        db.session.add(
+            OrderStatusEvent(
+                id=1,
+                order_id=first,
+                from_status="Pending",
+                to_status="Preparing",
+                changed_at=now - timedelta(seconds=30),
+            )
+        )
+        db.session.commit()
+        app.config["PREP_STATS_SETTLE_SECONDS"] = 0
+
+        assert PrepTimeStats.refresh() == 2
+        assert _totals(PrepTimeStats.get_hourly(hours=2)[2]) == {"Pending": 2}
+
+    def test_cold_start_resumes_mid_order(self, app, test_customer_user):
+        """Test a fresh worker times the first event it sees correctly."""
+        now = datetime.utcnow()
+        order_id = self._order(test_customer_user, now - timedelta(minutes=10))
+        self._log(order_id, "Pending", "Preparing", now - timedelta(minutes=8))
+        PrepTimeStats.refresh()
+        # Another worker starts with no in-memory state.
+        app.extensions.pop("prep_time_stats")
+        self._log(order_id, "Preparing", "Ready for Pickup", now - timedelta(minutes=3))
+
+        _, _, rows = PrepTimeStats.get_hourly(hours=2)
+
+        preparing = [
+            row["states"]["Preparing"] for row in rows if "Preparing" in row["states"]
+        ]
+        assert abs(preparing[0]["p50"] - 300) <= 3
+
+    def test_cold_start_skips_history_outside_window(self, app, test_customer_user):
+        """Test events older than PREP_STATS_WINDOW_HOURS are not read."""
+        app.config["PREP_STATS_WINDOW_HOURS"] = 2
+        old = datetime.utcnow() - timedelta(days=3)
+        order_id = self._order(test_customer_user, old)
+        self._log(order_id, "Pending", "Preparing", old + timedelta(minutes=2))
+
+        assert PrepTimeStats.refresh() == 0
+        assert PrepTimeStats.get_hourly(hours=2)[2] == []
+
+
+class TestPrepTimesRoute:
+    """Test the staff prep-time endpoint."""
+
+    def login(self, client, username, password):
+        return client.post(
+            "/auth/login",
+            data={"username": username, "password": password},
+            follow_redirects=True,
+        )
+
+    def test_staff_can_read_prep_times(self, client, test_staff_user, pending_order):
+        """Test staff get hourly percentiles as JSON."""
+        StatusController.update_order_status(pending_order, "Preparing")
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/prep-times?hours=2")
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["success"] is True
+        assert _totals(data["hours"]) == {"Pending": 1}
+
+    def test_customer_cannot_read_prep_times(self, client, test_customer_user):
+        """Test customers are refused."""
+        self.login(client, "customer1", "password123")
+
+        response = client.get("/status/prep-times")
+
+        assert response.status_code == 403
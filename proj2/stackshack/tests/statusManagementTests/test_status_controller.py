@@ -1,5 +1,39 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import event, update
 from controllers.status_controller import StatusController
-from models.order import Order
+from database.db import db
+from models.cache_version import CacheVersion
+from models.order import Order, OrderItem
+
+
+def _order_plans(call):
+    """
+    Runs ``call`` and returns the SQLite plan of each query it sent that
+    reads the orders table through a range or scan (not a lookup by id).
+    """
+    sent = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    plans = []
+    for statement, parameters in sent:
+        if "FROM orders" not in statement or "orders.id IN" in statement:
+            continue
+        rows = (
+            db.session.connection()
+            .exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            .all()
+        )
+        plans.append([row[-1] for row in rows])
+    return plans
 
 
 class TestStatusController:
@@ -82,6 +116,66 @@ class TestStatusController:
 
             assert success is False
 
+    def test_update_order_status_single_conditional_update(
+        self, app, pending_order, count_queries
+    ):
+        """Test a valid transition is one conditional UPDATE of orders."""
+        with count_queries() as statements:
+            success, _, change = StatusController.update_order_status(
+                pending_order, "Preparing"
+            )
+
+        assert success is True
+        assert change == (pending_order, "Pending", "Preparing")
+        # The compare-and-swap itself, then the append to the status event log;
+        # no shared counter row is locked.
+        assert len(statements) == 2
+        assert statements[0].startswith("UPDATE orders")
+        assert "orders.status = ?" in statements[0]
+        assert statements[1].startswith("INSERT INTO order_status_events")
+
+    def test_update_order_status_second_click_conflicts(self, app, pending_order):
+        """Test two staff applying the same transition: only one wins."""
+        first = StatusController.update_order_status(pending_order, "Preparing")
+        second = StatusController.update_order_status(pending_order, "Preparing")
+
+        assert first[0] is True
+        assert second == (
+            False,
+            "Order is already Preparing.",
+            StatusController.CONFLICT,
+        )
+
+    def test_update_order_status_no_op_is_invalid(self, app, pending_order):
+        """Test Pending -> Pending is an invalid transition, not a conflict."""
+        assert StatusController.update_order_status(pending_order, "Pending") == (
+            False,
+            "Invalid status transition from Pending to Pending.",
+            StatusController.INVALID,
+        )
+
+    def test_update_order_status_stale_update_does_not_overwrite(
+        self, app, pending_order
+    ):
+        """Test a swap against a status that moved on leaves the row alone."""
+        StatusController.update_order_status(pending_order, "Preparing")
+        StatusController.update_order_status(pending_order, "Ready for Pickup")
+
+        success, _, reason = StatusController.update_order_status(
+            pending_order, "Preparing"
+        )
+
+        assert success is False
+        assert reason == StatusController.INVALID
+        assert db.session.get(Order, pending_order).status == "Ready for Pickup"
+
+    def test_update_order_status_not_found_reason(self, app):
+        """Test a missing order reports NOT_FOUND."""
+        _, msg, reason = StatusController.update_order_status(99999, "Preparing")
+
+        assert msg == "Order not found."
+        assert reason == StatusController.NOT_FOUND
+
     # ==================== CANCEL ORDER TESTS ====================
 
     def test_cancel_pending_order(self, app, test_customer_user, pending_order):
@@ -151,6 +245,53 @@ class TestStatusController:
             assert success is False
             assert "not found" in msg.lower() or "access denied" in msg.lower()
 
+    def _move_after_read(self, monkeypatch, order_id, status):
+        """Makes the kitchen move the order right after cancel_order reads it."""
+        owned_status = StatusController._owned_status
+        moved = []
+
+        def read_then_move(order_id_, user_id):
+            current = owned_status(order_id_, user_id)
+            if not moved:
+                moved.append(status)
+                db.session.execute(
+                    update(Order).where(Order.id == order_id).values(status=status)
+                )
+                db.session.commit()
+            return current
+
+        monkeypatch.setattr(
+            StatusController, "_owned_status", staticmethod(read_then_move)
+        )
+
+    def test_cancel_never_overwrites_concurrent_delivery(
+        self, app, test_customer_user, ready_order, monkeypatch
+    ):
+        """Test an order delivered between the read and the UPDATE stays so."""
+        self._move_after_read(monkeypatch, ready_order, "Delivered")
+
+        success, msg, _ = StatusController.cancel_order(ready_order, test_customer_user)
+
+        assert success is False
+        assert "delivered" in msg.lower()
+        db.session.expire_all()
+        assert db.session.get(Order, ready_order).status == "Delivered"
+
+    def test_cancel_logs_the_status_it_replaced(
+        self, app, test_customer_user, pending_order, monkeypatch
+    ):
+        """Test a cancel racing a kitchen update records the real transition."""
+        self._move_after_read(monkeypatch, pending_order, "Preparing")
+
+        success, _, change = StatusController.cancel_order(
+            pending_order, test_customer_user
+        )
+
+        assert success is True
+        assert change.previous_status == "Preparing"
+        db.session.expire_all()
+        assert db.session.get(Order, pending_order).status == "Cancelled"
+
     def test_cancel_nonexistent_order(self, app, test_customer_user):
         """Test cancelling nonexistent order."""
         with app.app_context():
@@ -223,6 +364,162 @@ class TestStatusController:
             assert success is True
             assert len(orders) == 0
 
+    # ==================== STAFF ORDER PAGE TESTS ====================
+
+    def test_staff_orders_page_defaults_to_active_queue(
+        self, app, multiple_orders_various_statuses
+    ):
+        """Test the default page only contains active orders."""
+        with app.app_context():
+            success, msg, page = StatusController.get_staff_orders_page()
+
+            assert success is True
+            statuses = {o.status for o in page["orders"]}
+            assert statuses == {"Pending", "Preparing", "Ready for Pickup"}
+            assert page["next_cursor"] is None
+
+    def test_staff_orders_page_status_filter(
+        self, app, multiple_orders_various_statuses
+    ):
+        """Test filtering the page by an explicit status list."""
+        with app.app_context():
+            success, msg, page = StatusController.get_staff_orders_page(
+                statuses=["Delivered"]
+            )
+
+            assert success is True
+            assert [o.status for o in page["orders"]] == ["Delivered"]
+
+    def test_staff_orders_page_cursor_walk(
+        self, app, test_customer_user, sample_menu_items
+    ):
+        """Test walking pages with cursors visits every order once, in order."""
+        with app.app_context():
+            same_time = datetime(2025, 1, 1, 12, 0)
+            for i in range(7):
+                db.session.add(
+                    Order(
+                        user_id=test_customer_user,
+                        total_price=Decimal("1.00"),
+                        status="Pending",
+                        # Several rows share a timestamp to exercise the id tiebreak
+                        ordered_at=same_time - timedelta(minutes=i // 3),
+                    )
+                )
+            db.session.commit()
+
+            seen = []
+            cursor = None
+            while True:
+                success, msg, page = StatusController.get_staff_orders_page(
+                    statuses=[], cursor=cursor, limit=3
+                )
+                assert success is True
+                seen.extend(page["orders"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+
+            assert len(seen) == 7
+            assert len({o.id for o in seen}) == 7
+            keys = [(o.ordered_at, o.id) for o in seen]
+            assert keys == sorted(keys, reverse=True)
+
+    def test_staff_orders_page_date_range(
+        self, app, test_customer_user, sample_menu_items
+    ):
+        """Test since is inclusive and until is exclusive."""
+        with app.app_context():
+            for day in (1, 2, 3):
+                db.session.add(
+                    Order(
+                        user_id=test_customer_user,
+                        total_price=Decimal("1.00"),
+                        status="Delivered",
+                        ordered_at=datetime(2025, 3, day, 9, 0),
+                    )
+                )
+            db.session.commit()
+
+            success, msg, page = StatusController.get_staff_orders_page(
+                statuses=[],
+                since=datetime(2025, 3, 2),
+                until=datetime(2025, 3, 3),
+            )
+
+            assert success is True
+            assert [o.ordered_at.day for o in page["orders"]] == [2]
+
+    def test_staff_orders_page_plans_never_sort(
+        self, app, multiple_orders_various_statuses
+    ):
+        """Test every board filter reads an index in order instead of sorting."""
+        _, _, first = StatusController.get_staff_orders_page(statuses=[], limit=1)
+        cursor = first["next_cursor"]
+        shapes = [
+            dict(statuses=[]),
+            dict(statuses=[], cursor=cursor),
+            dict(statuses=[], since=datetime(2020, 1, 1), until=datetime(2100, 1, 1)),
+            dict(statuses=["Delivered"]),
+            dict(statuses=["Delivered", "Cancelled"], cursor=cursor),
+            dict(),  # the active queue: three statuses
+        ]
+
+        for shape in shapes:
+            plans = _order_plans(
+                lambda: StatusController.get_staff_orders_page(**shape)
+            )
+            assert plans, shape
+            for plan in plans:
+                text = " ".join(plan)
+                assert "TEMP B-TREE" not in text, (shape, plan)
+                assert "ix_orders_" in text, (shape, plan)
+
+    def test_staff_orders_page_multi_status_merge(
+        self, app, test_customer_user, sample_menu_items
+    ):
+        """Test per-status ranges merge into one newest-first page walk."""
+        start = datetime(2025, 5, 1, 8, 0)
+        for i in range(9):
+            db.session.add(
+                Order(
+                    user_id=test_customer_user,
+                    total_price=Decimal("1.00"),
+                    status=("Delivered", "Cancelled", "Pending")[i % 3],
+                    ordered_at=start + timedelta(minutes=i // 2),
+                )
+            )
+        db.session.commit()
+
+        seen, cursor = [], None
+        while True:
+            _, _, page = StatusController.get_staff_orders_page(
+                statuses=["Delivered", "Cancelled"], cursor=cursor, limit=2
+            )
+            seen.extend(page["orders"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = (
+            Order.query.filter(Order.status.in_(["Delivered", "Cancelled"]))
+            .order_by(Order.ordered_at.desc(), Order.id.desc())
+            .all()
+        )
+        assert [o.id for o in seen] == [o.id for o in expected]
+        assert len(seen) == 6
+
+    def test_staff_orders_page_invalid_cursor(self, app):
+        """Test a malformed cursor is rejected."""
+        with app.app_context():
+            success, msg, page = StatusController.get_staff_orders_page(
+                cursor="not-a-cursor"
+            )
+
+            assert success is False
+            assert "cursor" in msg.lower()
+            assert page is None
+
     # ==================== IS STAFF TESTS ====================
 
     def test_is_staff_true_for_staff(self, app, test_staff_user):
@@ -285,3 +582,259 @@ class TestStatusController:
             flow = StatusController.get_status_flow()
 
             assert len(flow["Delivered"]["nextStatuses"]) == 0
+
+    # ==================== STAFF ORDER LOADING TESTS ====================
+
+    def test_get_all_orders_for_staff_with_items_query_count_is_flat(
+        self, app, test_customer_user, sample_menu_items, count_queries
+    ):
+        """Test staff board loads items in a constant number of queries."""
+
+        def add_orders(count):
+            for _ in range(count):
+                order = Order(
+                    user_id=test_customer_user,
+                    total_price=Decimal("5.50"),
+                    status="Pending",
+                )
+                db.session.add(order)
+                db.session.flush()
+                db.session.add(
+                    OrderItem(
+                        order_id=order.id,
+                        menu_item_id=sample_menu_items[0],
+                        name="Burger",
+                        price=Decimal("5.50"),
+                        quantity=1,
+                    )
+                )
+            db.session.commit()
+
+        def load_board():
+            db.session.expire_all()
+            _, _, orders = StatusController.get_all_orders_for_staff(with_items=True)
+            for order in orders:
+                [item.name for item in order.line_items]
+
+        with app.app_context():
+            add_orders(3)
+            with count_queries() as small:
+                load_board()
+            add_orders(25)
+            with count_queries() as large:
+                load_board()
+
+            assert len(small) == len(large)
+
+
+class TestBulkStatusUpdate:
+    """Test set-based bulk status transitions."""
+
+    def _add_orders(self, user_id, status, count):
+        orders = [
+            Order(user_id=user_id, total_price=Decimal("1.00"), status=status)
+            for _ in range(count)
+        ]
+        db.session.add_all(orders)
+        db.session.commit()
+        return [order.id for order in orders]
+
+    def test_bulk_advance_twenty_orders_set_based(
+        self, app, test_customer_user, count_queries
+    ):
+        """Test one locked read and one orders UPDATE move every order."""
+        ids = self._add_orders(test_customer_user, "Preparing", 20)
+        with count_queries() as statements:
+            success, msg, outcomes = StatusController.bulk_update_status(
+                ids, "advance", expected_status="Preparing"
+            )
+
+        assert success is True
+        assert msg == "Updated 20 of 20 orders."
+        # Locked read, one set-based UPDATE and one executemany append to the
+        # event log.
+        assert len(statements) == 3
+        assert statements[1].startswith("UPDATE orders")
+        assert statements[2].startswith("INSERT INTO order_status_events")
+        assert all(o["status"] == "Ready for Pickup" for o in outcomes)
+        assert {status for (status,) in db.session.query(Order.status).distinct()} == {
+            "Ready for Pickup"
+        }
+
+    def test_bulk_advance_follows_status_flow_per_order(
+        self, app, pending_order, preparing_order, delivered_order
+    ):
+        """Test each order moves one step and terminal orders are refused."""
+        success, _, outcomes = StatusController.bulk_update_status(
+            [pending_order, preparing_order, delivered_order, 99999], "advance"
+        )
+
+        assert success is True
+        by_id = {o["id"]: o for o in outcomes}
+        assert by_id[pending_order]["status"] == "Preparing"
+        assert by_id[preparing_order]["status"] == "Ready for Pickup"
+        assert by_id[delivered_order]["reason"] == StatusController.INVALID
+        assert by_id[99999]["reason"] == StatusController.NOT_FOUND
+        assert db.session.get(Order, delivered_order).status == "Delivered"
+
+    def test_bulk_expected_status_reports_conflicts(
+        self, app, pending_order, preparing_order
+    ):
+        """Test orders no longer in the expected status are left alone."""
+        success, msg, outcomes = StatusController.bulk_update_status(
+            [pending_order, preparing_order], "advance", expected_status="Preparing"
+        )
+
+        assert msg == "Updated 1 of 2 orders."
+        assert outcomes[0]["reason"] == StatusController.CONFLICT
+        assert db.session.get(Order, pending_order).status == "Pending"
+
+    def test_bulk_concurrent_change_fails_only_that_order(
+        self, app, pending_order, preparing_order, monkeypatch
+    ):
+        """Test an order moved between the read and the UPDATE is skipped."""
+        bulk_target = StatusController._bulk_target
+
+        def cancel_pending_meanwhile(action, status):
+            # Another request cancels the order right after it was read.
+            db.session.execute(
+                update(Order)
+                .where(Order.id == pending_order)
+                .values(status="Cancelled")
+            )
+            return bulk_target(action, status)
+
+        monkeypatch.setattr(
+            StatusController, "_bulk_target", staticmethod(cancel_pending_meanwhile)
+        )
+
+        success, msg, outcomes = StatusController.bulk_update_status(
+            [pending_order, preparing_order], "advance"
+        )
+
+        assert success is True
+        assert msg == "Updated 1 of 2 orders."
+        assert outcomes[0]["reason"] == StatusController.CONFLICT
+        assert outcomes[0]["status"] == "Cancelled"
+        assert outcomes[1]["status"] == "Ready for Pickup"
+        db.session.expire_all()
+        assert db.session.get(Order, pending_order).status == "Cancelled"
+        assert db.session.get(Order, preparing_order).status == "Ready for Pickup"
+
+    def test_bulk_cancel(self, app, pending_order, ready_order, cancelled_order):
+        """Test cancelling active orders and refusing finished ones."""
+        success, _, outcomes = StatusController.bulk_update_status(
+            [pending_order, ready_order, cancelled_order], "cancel"
+        )
+
+        assert [o["success"] for o in outcomes] == [True, True, False]
+        assert db.session.get(Order, ready_order).status == "Cancelled"
+
+    def test_bulk_rejects_bad_input(self, app):
+        """Test unknown actions, empty and oversized id lists."""
+        assert StatusController.bulk_update_status([1], "explode")[0] is False
+        assert StatusController.bulk_update_status([], "advance")[0] is False
+        assert StatusController.bulk_update_status(["x"], "advance")[0] is False
+        too_many = list(range(StatusController.MAX_BULK_ORDERS + 1))
+        assert StatusController.bulk_update_status(too_many, "advance")[0] is False
+
+
+class TestOrderChanges:
+    """Test the changed_at delta sync."""
+
+    def test_changes_follow_change_order(self, app, test_customer_user):
+        """Test creation and every status change advance the cursor."""
+        from controllers.order_controller import OrderController
+
+        app.config["ORDER_CHANGES_OVERLAP"] = 0
+        _, _, head = StatusController.get_order_changes()
+        _, _, first = OrderController.create_new_order(
+            test_customer_user, [(None, "1.00", 1, "Burger")]
+        )
+        _, _, second = OrderController.create_new_order(
+            test_customer_user, [(None, "2.00", 1, "Burger")]
+        )
+
+        _, _, page = StatusController.get_order_changes(since=head["cursor"])
+        assert [o.id for o in page["orders"]] == [first.id, second.id]
+
+        StatusController.update_order_status(first.id, "Preparing")
+        _, _, page = StatusController.get_order_changes(since=page["cursor"])
+        assert [(o.id, o.status) for o in page["orders"]] == [(first.id, "Preparing")]
+
+        _, _, page = StatusController.get_order_changes(since=page["cursor"])
+        assert page["orders"] == []
+
+    def test_changes_pages_with_limit(self, app, test_customer_user, pending_order):
+        """Test a bulk update sharing one timestamp pages without gaps."""
+        app.config["ORDER_CHANGES_OVERLAP"] = 0
+        ids = TestBulkStatusUpdate()._add_orders(test_customer_user, "Pending", 5)
+        _, _, head = StatusController.get_order_changes()
+        StatusController.bulk_update_status(ids, "advance")
+
+        seen, cursor = [], head["cursor"]
+        while True:
+            _, _, page = StatusController.get_order_changes(since=cursor, limit=2)
+            seen.extend(o.id for o in page["orders"])
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+
+        assert seen == ids
+
+    def test_changes_scoped_to_customer(
+        self, app, test_customer_user, test_staff_user, pending_order
+    ):
+        """Test customers only see changes to their own orders."""
+        StatusController.update_order_status(pending_order, "Preparing")
+
+        start = f"{(datetime.utcnow() - timedelta(hours=1)).isoformat()}_0"
+        _, _, own = StatusController.get_order_changes(
+            since=start, user_id=test_customer_user
+        )
+        _, _, other = StatusController.get_order_changes(
+            since=start, user_id=test_staff_user
+        )
+
+        assert [o.id for o in own["orders"]] == [pending_order]
+        assert other["orders"] == []
+
+    def test_late_commit_inside_overlap_is_read_again(
+        self, app, test_customer_user, pending_order, preparing_order
+    ):
+        """Test a change stamped before the cursor but seen late is not lost."""
+        StatusController.update_order_status(preparing_order, "Ready for Pickup")
+        _, _, head = StatusController.get_order_changes()
+        head_at, _ = StatusController.decode_cursor(head["cursor"])
+        # Stamped before the served change, committed only now.
+        db.session.execute(
+            update(Order)
+            .where(Order.id == pending_order)
+            .values(status="Preparing", changed_at=head_at - timedelta(seconds=1))
+        )
+        db.session.commit()
+
+        _, _, page = StatusController.get_order_changes(since=head["cursor"])
+
+        assert [(o.id, o.status) for o in page["orders"]] == [
+            (pending_order, "Preparing"),
+            (preparing_order, "Ready for Pickup"),
+        ]
+        assert page["cursor"] == head["cursor"]
+
+        app.config["ORDER_CHANGES_OVERLAP"] = 0
+        _, _, page = StatusController.get_order_changes(since=head["cursor"])
+        assert page["orders"] == []
+
+    def test_status_change_locks_no_shared_row(self, app, pending_order):
+        """Test writes no longer touch a global counter row."""
+        StatusController.update_order_status(pending_order, "Preparing")
+
+        assert db.session.query(CacheVersion).count() == 0
+
+    def test_changes_invalid_cursor(self, app):
+        """Test a malformed cursor is rejected."""
+        success, msg, _ = StatusController.get_order_changes(since="yesterday")
+
+        assert success is False
+        assert msg == "Invalid change cursor."
@@ -0,0 +1,313 @@
+import json
+import os
+import re
+import time
+from decimal import Decimal
+from controllers.order_controller import OrderController
+from controllers.status_controller import StatusController
+from controllers.status_events import SpoolStatusBroker, StatusBroker, StatusEvents
+from database.db import db
+from models.order import Order
+
+
+def _event(order_id, status="Preparing"):
+    return {"order_id": order_id, "status": status, "previous_status": None}
+
+
+class TestStatusBroker:
+    """Test fan-out of status events to subscribers."""
+
+    def test_subscribers_only_get_their_orders(self):
+        """Test order filters and the all-orders (staff) subscription."""
+        broker = StatusBroker()
+        customer = broker.subscribe(order_ids=[1, 2])
+        staff = broker.subscribe()
+
+        broker.publish(_event(1))
+        broker.publish(_event(3))
+
+        assert customer.get(timeout=0)["order_id"] == 1
+        assert customer.get(timeout=0) is None
+        assert [staff.get(timeout=0)["order_id"] for _ in range(2)] == [1, 3]
+
+    def test_user_subscription_follows_new_orders(self):
+        """Test an order placed after subscribing is picked up by its owner."""
+        broker = StatusBroker()
+        subscription = broker.subscribe(order_ids=[1], user_id=7)
+
+        broker.publish(dict(_event(5, "Pending"), user_id=8))
+        broker.publish(dict(_event(6, "Pending"), user_id=7))
+        broker.publish(_event(6, "Preparing"))
+
+        assert [subscription.get(timeout=0)["status"] for _ in range(2)] == [
+            "Pending",
+            "Preparing",
+        ]
+        assert subscription.get(timeout=0) is None
+        assert subscription.order_ids == {1, 6}
+
+    def test_subscribe_limit(self):
+        """Test a full broker refuses new subscriptions until one closes."""
+        broker = StatusBroker()
+        first = broker.subscribe(limit=2)
+        broker.subscribe(limit=2)
+
+        assert broker.subscribe(limit=2) is None
+        first.close()
+        assert broker.subscribe(limit=2) is not None
+        assert broker.subscriber_count == 2
+
+    def test_slow_subscriber_overflows_instead_of_blocking(self):
+        """Test a full queue marks the subscription for resync."""
+        broker = StatusBroker()
+        subscription = broker.subscribe()
+
+        for order_id in range(subscription.MAX_PENDING + 1):
+            broker.publish(_event(order_id))
+
+        assert subscription.overflowed is True
+
+    def test_thousand_idle_subscribers(self):
+        """Test one publish reaches 1,000 idle subscribers promptly."""
+        broker = StatusBroker()
+        subscriptions = [broker.subscribe(order_ids=[i]) for i in range(999)]
+        subscriptions.append(broker.subscribe())
+
+        started = time.perf_counter()
+        broker.publish(_event(7))
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert subscriptions[7].get(timeout=0)["order_id"] == 7
+        assert subscriptions[-1].get(timeout=0)["order_id"] == 7
+        assert subscriptions[8].get(timeout=0) is None
+        for subscription in subscriptions:
+            subscription.close()
+        assert broker.subscriber_count == 0
+
+    def test_spool_broker_crosses_workers(self, tmp_path):
+        """Test an event published by one worker reaches another's stream."""
+        spool = str(tmp_path / "status.spool")
+        worker_a = SpoolStatusBroker(spool)
+        worker_b = SpoolStatusBroker(spool)
+        subscription = worker_b.subscribe()
+
+        worker_a.publish(_event(42, "Ready for Pickup"))
+        worker_b.poll()
+
+        event = subscription.get(timeout=1)
+        assert event["order_id"] == 42
+        assert event["status"] == "Ready for Pickup"
+
+    def test_spool_rotates_without_losing_events(self, tmp_path):
+        """Test a full spool is rotated and a tailing worker reads across it."""
+        spool = str(tmp_path / "status.spool")
+        worker_a = SpoolStatusBroker(spool)
+        worker_b = SpoolStatusBroker(spool)
+        worker_a.MAX_BYTES = 400
+        subscription = worker_b.subscribe()
+
+        for order_id in range(20):
+            worker_a.publish(_event(order_id))
+            if order_id % 7 == 0:
+                worker_b.poll()
+        worker_b.poll()
+
+        received = []
+        while (event := subscription.get(timeout=0)) is not None:
+            received.append(event["order_id"])
+        assert received == list(range(20))
+        assert os.path.getsize(spool) < 400
+        assert os.path.getsize(spool + ".1") < 400 + 100
+        assert sorted(os.listdir(tmp_path)) == ["status.spool", "status.spool.1"]
+
+
+class TestStatusEventPublishing:
+    """Test controllers announce committed status changes."""
+
+    def test_update_bulk_and_cancel_publish(
+        self,
+        app,
+        test_customer_user,
+        pending_order,
+        preparing_order,
+        ready_order,
+    ):
+        """Test every kind of status change emits one event per order."""
+        subscription = StatusEvents.subscribe()
+
+        StatusController.update_order_status(pending_order, "Preparing")
+        StatusController.update_order_status(pending_order, "Preparing")  # conflict
+        StatusController.bulk_update_status([preparing_order], "advance")
+        StatusController.cancel_order(ready_order, test_customer_user)
+
+        events = []
+        while (event := subscription.get(timeout=0)) is not None:
+            events.append(
+                (event["order_id"], event["previous_status"], event["status"])
+            )
+        assert events == [
+            (pending_order, "Pending", "Preparing"),
+            (preparing_order, "Preparing", "Ready for Pickup"),
+            (ready_order, "Ready for Pickup", "Cancelled"),
+        ]
+
+
+class TestStatusStreamRoute:
+    """Test the /status/stream SSE endpoint."""
+
+    def login(self, client, username, password):
+        return client.post(
+            "/auth/login",
+            data={"username": username, "password": password},
+            follow_redirects=True,
+        )
+
+    def test_customer_stream_receives_own_order(
+        self, client, app, test_customer_user, pending_order
+    ):
+        """Test a customer's stream carries changes to their orders."""
+        self.login(client, "customer1", "password123")
+        app.config["STATUS_STREAM_HEARTBEAT"] = 0.05
+        app.config["STATUS_STREAM_MAX_AGE"] = 0.3
+
+        response = client.get("/status/stream")
+        StatusController.update_order_status(pending_order, "Preparing")
+        body = b"".join(response.response).decode()
+        response.close()
+
+        assert response.mimetype == "text/event-stream"
+        assert body.startswith("retry: 3000")
+        data = body.split("event: status\ndata: ")[1].split("\n\n")[0]
+        assert json.loads(data)["status"] == "Preparing"
+        assert StatusEvents.broker().subscriber_count == 0
+
+    def test_customer_stream_ignores_other_orders(
+        self, client, app, test_staff_user, pending_order
+    ):
+        """Test orders owned by someone else are not streamed."""
+        db.session.add(
+            Order(
+                user_id=test_staff_user, total_price=Decimal("1.00"), status="Pending"
+            )
+        )
+        db.session.commit()
+        self.login(client, "staff1", "staffpass123")
+        app.config["STATUS_STREAM_HEARTBEAT"] = 0.05
+        app.config["STATUS_STREAM_MAX_AGE"] = 0.2
+
+        response = client.get("/status/stream")
+        StatusController.update_order_status(pending_order, "Preparing")
+        body = b"".join(response.response).decode()
+
+        assert "event: status" not in body
+        assert ": keepalive" in body
+
+    def test_customer_stream_follows_order_placed_later(
+        self, client, app, test_customer_user, pending_order
+    ):
+        """Test an order placed while connected streams without reconnecting."""
+        self.login(client, "customer1", "password123")
+        app.config["STATUS_STREAM_HEARTBEAT"] = 0.05
+        app.config["STATUS_STREAM_MAX_AGE"] = 0.3
+
+        response = client.get("/status/stream")
+        _, _, order = OrderController.create_new_order(
+            test_customer_user, [(None, Decimal("2.00"), 1, "Soda")]
+        )
+        StatusController.update_order_status(order.id, "Preparing")
+        body = b"".join(response.response).decode()
+
+        changes = [
+            json.loads(chunk.split("\n")[0])
+            for chunk in body.split("event: status\ndata: ")[1:]
+        ]
+        assert [(c["order_id"], c["status"]) for c in changes] == [
+            (order.id, "Pending"),
+            (order.id, "Preparing"),
+        ]
+
+    def test_no_stream_without_active_orders(self, client, test_customer_user):
+        """Test a customer with nothing in progress is told not to reconnect."""
+        self.login(client, "customer1", "password123")
+
+        response = client.get("/status/stream")
+        page = client.get("/orders/history").data.decode()
+
+        assert response.status_code == 204
+        assert 'data-stream-url=""' in page
+        assert StatusEvents.broker().subscriber_count == 0
+
+    def test_streams_capped_per_worker(
+        self, client, app, test_customer_user, pending_order
+    ):
+        """Test streams beyond the worker's limit get 503 and Retry-After."""
+        self.login(client, "customer1", "password123")
+        app.config["STATUS_STREAM_MAX_PER_WORKER"] = 1
+        held = StatusEvents.subscribe()
+
+        response = client.get("/status/stream")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "30"
+        held.close()
+        app.config["STATUS_STREAM_MAX_AGE"] = 0
+        assert client.get("/status/stream").status_code == 200
+
+    def test_staff_scope_all(
+        self, client, app, test_customer_user, test_staff_user, pending_order
+    ):
+        """Test only staff may subscribe to every order."""
+        self.login(client, "customer1", "password123")
+        assert client.get("/status/stream?scope=all").status_code == 403
+
+        client.get("/auth/logout")
+        self.login(client, "staff1", "staffpass123")
+        app.config["STATUS_STREAM_HEARTBEAT"] = 0.05
+        app.config["STATUS_STREAM_MAX_AGE"] = 0.2
+        response = client.get("/status/stream?scope=all")
+        StatusController.update_order_status(pending_order, "Preparing")
+
+        assert "event: status" in b"".join(response.response).decode()
+
+    def test_history_page_subscribes(self, client, test_customer_user, pending_order):
+        """Test the history page opens the stream instead of reloading."""
+        self.login(client, "customer1", "password123")
+
+        page = client.get("/orders/history").data.decode()
+        script = re.search(r'src="(/assets/js/orders-history\.\w+\.js)"', page)
+        bundle = client.get(script.group(1)).data.decode()
+
+        assert 'data-stream-url="/status/stream"' in page
+        assert "new EventSource(historyConfig.streamUrl)" in bundle
+        assert 'data-changes-url="/status/changes"' in page
+        assert "if (stream.readyState === EventSource.CLOSED) pollChanges();" in bundle
+        assert 'patchOrderRow(orderId, "Cancelled")' in bundle
+        assert 'stream.addEventListener("open", () => catchUp());' in bundle
+
+    def test_history_page_cursor_catches_up(
+        self, client, test_customer_user, pending_order
+    ):
+        """Test changes made after the page rendered are served from its cursor."""
+        self.login(client, "customer1", "password123")
+        page = client.get("/orders/history").data.decode()
+        cursor = re.search(r'data-changes-cursor="([^"]+)"', page).group(1)
+
+        StatusController.update_order_status(pending_order, "Preparing")
+        changes = client.get("/status/changes", query_string={"since": cursor})
+
+        assert [o["status"] for o in changes.get_json()["orders"]] == ["Preparing"]
+
+    def test_manage_page_flags_unknown_pending_orders(
+        self, client, test_staff_user, pending_order
+    ):
+        """Test the board can announce new orders that are not on it yet."""
+        self.login(client, "staff1", "staffpass123")
+
+        page = client.get("/status/manage").data.decode()
+        script = re.search(r'src="(/assets/js/orders-history\.\w+\.js)"', page)
+        bundle = client.get(script.group(1)).data.decode()
+
+        assert 'id="new-orders-banner"' in page
+        assert re.search(r'data-changes-cursor="[^"]+"', page)
+        assert 'status === "Pending") noteNewOrder();' in bundle
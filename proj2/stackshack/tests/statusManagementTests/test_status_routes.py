@@ -72,6 +72,39 @@ class TestStatusRoutes:
 
         assert response.status_code == 200
 
+    def test_manage_orders_hides_delivered_by_default(
+        self, client, app, test_staff_user, delivered_order
+    ):
+        """Test the default manage view shows only the active queue."""
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/manage")
+
+        assert response.status_code == 200
+        assert b"No pending orders right now." in response.data
+
+    def test_manage_orders_status_filter_shows_delivered(
+        self, client, app, test_staff_user, delivered_order
+    ):
+        """Test filtering the manage view by Delivered shows delivered orders."""
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/manage?status=Delivered")
+
+        assert response.status_code == 200
+        assert b"No pending orders right now." not in response.data
+
+    def test_manage_orders_next_page_link(
+        self, client, app, test_staff_user, multiple_orders_various_statuses
+    ):
+        """Test a next-page link is rendered when more orders remain."""
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/manage?status=all&limit=2")
+
+        assert response.status_code == 200
+        assert b"cursor=" in response.data
+
     # ==================== UPDATE STATUS ROUTE TESTS ====================
 
     def test_update_status_requires_login(self, client):
@@ -221,6 +254,118 @@ class TestStatusRoutes:
         data = json.loads(response.data)
         assert data["success"] is False
 
+    def test_update_status_double_click_conflict(
+        self, client, app, test_staff_user, pending_order
+    ):
+        """Test the losing click of a duplicate transition gets 409."""
+        self.login(client, "staff1", "staffpass123")
+        body = json.dumps({"order_id": pending_order, "status": "Preparing"})
+
+        first = client.post(
+            "/status/update", data=body, content_type="application/json"
+        )
+        second = client.post(
+            "/status/update", data=body, content_type="application/json"
+        )
+
+        assert first.status_code == 200
+        assert json.loads(first.data)["order"] == {
+            "id": pending_order,
+            "status": "Preparing",
+        }
+        assert second.status_code == 409
+        assert "already Preparing" in json.loads(second.data)["message"]
+
+    def test_bulk_update_staff(
+        self, client, app, test_staff_user, pending_order, preparing_order
+    ):
+        """Test staff advance several orders in one request."""
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.post(
+            "/status/bulk",
+            data=json.dumps(
+                {"order_ids": [pending_order, preparing_order], "action": "advance"}
+            ),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [r["status"] for r in data["results"]] == [
+            "Preparing",
+            "Ready for Pickup",
+        ]
+
+    def test_bulk_update_customer_forbidden(
+        self, client, test_customer_user, pending_order
+    ):
+        """Test customers cannot use the bulk endpoint."""
+        self.login(client, "customer1", "password123")
+
+        response = client.post(
+            "/status/bulk",
+            data=json.dumps({"order_ids": [pending_order], "action": "cancel"}),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 403
+
+    def test_bulk_update_bad_request(self, client, test_staff_user):
+        """Test malformed bulk requests are rejected."""
+        self.login(client, "staff1", "staffpass123")
+
+        missing = client.post(
+            "/status/bulk", data="{}", content_type="application/json"
+        )
+        bad_action = client.post(
+            "/status/bulk",
+            data=json.dumps({"order_ids": [1], "action": "explode"}),
+            content_type="application/json",
+        )
+
+        assert missing.status_code == 400
+        assert bad_action.status_code == 400
+
+    def test_manage_page_has_bulk_controls(
+        self, client, test_staff_user, pending_order
+    ):
+        """Test the staff board renders row checkboxes and the bulk bar."""
+        self.login(client, "staff1", "staffpass123")
+
+        response = client.get("/status/manage")
+
+        assert b'id="bulk-bar"' in response.data
+        assert f'class="bulk-select" value="{pending_order}"'.encode() in response.data
+
+    def test_order_changes_poll(self, client, app, test_staff_user, pending_order):
+        """Test polling /status/changes returns only what changed."""
+        app.config["ORDER_CHANGES_OVERLAP"] = 0
+        self.login(client, "staff1", "staffpass123")
+        head = json.loads(client.get("/status/changes").data)
+        client.post(
+            "/status/update",
+            data=json.dumps({"order_id": pending_order, "status": "Preparing"}),
+            content_type="application/json",
+        )
+
+        response = client.get(f"/status/changes?since={head['cursor']}")
+        data = json.loads(response.data)
+        again = json.loads(client.get(f"/status/changes?since={data['cursor']}").data)
+
+        assert response.headers["Cache-Control"] == "no-store"
+        assert [(o["id"], o["status"]) for o in data["orders"]] == [
+            (pending_order, "Preparing")
+        ]
+        assert data["orders"][0]["items"]
+        assert again["orders"] == []
+
+    def test_order_changes_bad_cursor(self, client, test_staff_user):
+        """Test an invalid cursor is a 400."""
+        self.login(client, "staff1", "staffpass123")
+
+        assert client.get("/status/changes?since=abc").status_code == 400
+
     # ==================== CANCEL ORDER ROUTE TESTS ====================
 
     def test_cancel_order_requires_login(self, client):
@@ -387,3 +532,16 @@ class TestStatusRoutes:
             assert "display" in details
             assert "icon" in details
             assert "nextStatuses" in details
+
+    def test_get_status_flow_conditional_get(self, client):
+        """Test status flow is cacheable and revalidates with 304."""
+        first = client.get("/status/flow")
+
+        assert first.status_code == 200
+        assert "public" in first.headers["Cache-Control"]
+
+        second = client.get(
+            "/status/flow", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+        assert second.status_code == 304
@@ -0,0 +1,160 @@
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from controllers.order_controller import OrderController
+from controllers.prep_time_stats import PrepTimeStats
+from controllers.wait_time import WaitTimeEstimator
+from database.db import db
+from models.order import Order
+from models.order_status_event import OrderStatusEvent
+
+
+def _add_orders(user_id, status, count):
+    db.session.add_all(
+        Order(user_id=user_id, total_price=Decimal("1.00"), status=status)
+        for _ in range(count)
+    )
+    db.session.commit()
+
+
+class TestWaitTimeEstimator:
+    """Test order ETA estimates from queue depth and prep history."""
+
+    def test_empty_kitchen_without_history(self, app):
+        """Test the default prep time is used until there is history."""
+        estimate = WaitTimeEstimator.estimate()
+
+        assert estimate["queue"] == {"Pending": 0, "Preparing": 0}
+        assert estimate["wait_seconds"] == 600
+        assert estimate["from_history"] is False
+
+    def test_queue_depth_adds_batches(self, app, test_customer_user):
+        """Test each full batch ahead adds one prep time."""
+        app.config["KITCHEN_CAPACITY"] = 2
+        _add_orders(test_customer_user, "Pending", 3)
+        _add_orders(test_customer_user, "Preparing", 2)
+        _add_orders(test_customer_user, "Delivered", 4)
+
+        estimate = WaitTimeEstimator.estimate()
+
+        assert estimate["queue"] == {"Pending": 3, "Preparing": 2}
+        assert estimate["wait_seconds"] == (5 // 2) * 600 + 600
+
+    def test_uses_median_prep_time(self, app, test_customer_user):
+        """Test recorded Preparing durations replace the default."""
+        now = datetime.utcnow()
+        order = Order(
+            user_id=test_customer_user,
+            total_price=Decimal("1.00"),
+            status="Ready for Pickup",
+            ordered_at=now - timedelta(minutes=10),
+        )
+        db.session.add(order)
+        db.session.flush()
+        db.session.add_all(
+            [
+                OrderStatusEvent(
+                    order_id=order.id,
+                    from_status="Pending",
+                    to_status="Preparing",
+                    changed_at=now - timedelta(minutes=9),
+                ),
+                OrderStatusEvent(
+                    order_id=order.id,
+                    from_status="Preparing",
+                    to_status="Ready for Pickup",
+                    changed_at=now - timedelta(minutes=4),
+                ),
+            ]
+        )
+        db.session.commit()
+        PrepTimeStats.refresh()
+
+        estimate = WaitTimeEstimator.estimate()
+
+        assert estimate["from_history"] is True
+        # max(median Pending 60s, no batches ahead) + median Preparing 300s
+        assert abs(estimate["wait_seconds"] - 360) <= 4
+
+    def test_cached_estimate_runs_no_queries(
+        self, app, test_customer_user, count_queries
+    ):
+        """Test estimates inside ETA_CHECK_INTERVAL reuse the cached queue."""
+        app.config["ETA_CHECK_INTERVAL"] = 60
+        WaitTimeEstimator.estimate()
+        with count_queries() as statements:
+            WaitTimeEstimator.estimate(placed_order_id=1)
+            estimate = WaitTimeEstimator.estimate()
+
+        assert statements == []
+        assert estimate["queue"]["Pending"] == 1
+
+    def test_cold_stats_are_not_read_on_estimate(
+        self, app, test_customer_user, count_queries
+    ):
+        """Test an unwarmed worker estimates from defaults, not the window."""
+        with count_queries(match=lambda s: "order_status_events" in s) as statements:
+            estimate = WaitTimeEstimator.estimate()
+
+        assert statements == []
+        assert estimate["from_history"] is False
+        assert PrepTimeStats.is_warm() is False
+
+    def test_placed_order_is_not_ahead_of_itself(self, app, test_customer_user):
+        """Test the ETA is the same whether or not the queue was re-read."""
+        app.config["KITCHEN_CAPACITY"] = 1
+        waits = []
+        for interval in (60, 0):
+            app.config["ETA_CHECK_INTERVAL"] = interval
+            for _ in range(2):
+                _, _, order = OrderController.create_new_order(
+                    test_customer_user, [(None, "1.00", 1, "Burger")]
+                )
+                waits.append(
+                    (order.estimated_ready_at - datetime.utcnow()).total_seconds()
+                )
+
+        assert [round(wait / 600) for wait in waits] == [1, 2, 3, 4]
+
+    def test_new_order_carries_estimate(self, app, test_customer_user):
+        """Test create_new_order returns the estimated ready time."""
+        success, _, order = OrderController.create_new_order(
+            test_customer_user, [(None, "1.00", 1, "Burger")]
+        )
+
+        assert success is True
+        wait = (order.estimated_ready_at - datetime.utcnow()).total_seconds()
+        assert 590 <= wait <= 600
+
+
+class TestWaitTimeRoutes:
+    """Test the ETA endpoint and checkout message."""
+
+    def test_eta_endpoint(self, client):
+        """Test the estimate is served uncached as JSON."""
+        response = client.get("/status/eta")
+
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-store"
+        data = json.loads(response.data)
+        assert data["success"] is True
+        assert data["estimate"]["wait_seconds"] == 600
+
+    def test_place_order_flashes_estimate(
+        self, client, test_customer_user, sample_menu_items
+    ):
+        """Test a placed order tells the customer when it should be ready."""
+        client.post(
+            "/auth/login",
+            data={"username": "customer1", "password": "password123"},
+            follow_redirects=True,
+        )
+
+        response = client.post(
+            "/orders/place",
+            data={f"quantity_{sample_menu_items[0]}": "1"},
+            follow_redirects=True,
+        )
+
+        assert b"placed successfully" in response.data
+        assert b"Estimated ready in about 10 min." in response.data
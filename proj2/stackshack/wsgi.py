@@ -0,0 +1,17 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is built once in the server master with the FLASK_CONFIG profile
+(default "production") and warmed up before the workers are forked, so
+every worker starts with compiled templates and a loaded menu catalog.
+gunicorn.conf.py then opens each worker's connection pool after the fork.
+"""
+
+import os
+
+from app import create_app, warm_up
+
+app = create_app(os.environ.get("FLASK_CONFIG", "production"))
+warm_up(app)